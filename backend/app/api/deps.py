@@ -0,0 +1,116 @@
+"""Shared request dependencies for store-scoped dashboard endpoints."""
+
+from typing import Dict, Set
+from bson import ObjectId
+from fastapi import HTTPException, Request
+
+from app.core.cache import create_cache
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.security import get_current_user
+
+
+# Owner id -> ids of the stores they own. Ownership only changes when a store
+# is created or deleted, which invalidates the owner here; other workers
+# re-check the database on a miss before answering 404.
+owner_stores_cache = create_cache(
+    "owner_store_ids",
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.OWNER_STORES_CACHE_TTL_SECONDS,
+)
+
+# Legacy per-row sheet fingerprints (dropped on the store's next sync) can be
+# large and are never needed by endpoints
+STORE_PROJECTION = {"sheets_config.row_hashes": 0}
+
+
+async def _load_owner_store_ids(db, owner_id) -> Set[str]:
+    store_ids = {
+        str(store["_id"])
+        async for store in db.stores.find({"owner_id": owner_id}, {"_id": 1})
+    }
+    owner_stores_cache.set(str(owner_id), store_ids)
+    return store_ids
+
+
+def invalidate_owner_stores(owner_id) -> None:
+    """Forget an owner's store ids after one of their stores was created or deleted."""
+    owner_stores_cache.invalidate(str(owner_id))
+
+
+async def require_store_owner(store_id: str, request: Request) -> Dict:
+    """
+    Check that the current user owns `store_id`, without loading the store.
+
+    Usable as a FastAPI dependency or awaited directly. Answers from the
+    owner -> store ids cache when warm, so most calls cost no query at all.
+
+    Returns:
+        The current user
+
+    Raises:
+        HTTPException: 401 if not authenticated, 404 if the store is not theirs
+    """
+    user = await get_current_user(request, None)
+
+    if ObjectId.is_valid(store_id):
+        store_ids = owner_stores_cache.get(str(user["_id"]))
+        if store_ids is None or store_id not in store_ids:
+            # Cold cache, or a store created through another worker
+            store_ids = await _load_owner_store_ids(get_database(), user["_id"])
+        if store_id in store_ids:
+            return user
+
+    raise HTTPException(status_code=404, detail="Store not found")
+
+
+async def get_owned_store(store_id: str, request: Request) -> Dict:
+    """
+    Resolve the current user's store once per request.
+
+    Usable as a FastAPI dependency or awaited directly; repeat calls within
+    the same request (e.g. from get_premium_store) reuse the document kept
+    on request.state. Large internal fields are left out (STORE_PROJECTION).
+
+    Raises:
+        HTTPException: 401 if not authenticated, 404 if the store is not theirs
+    """
+    cached = getattr(request.state, "owned_store", None)
+    if cached is not None and str(cached["_id"]) == store_id:
+        return cached
+
+    user = await require_store_owner(store_id, request)
+
+    store = await get_database().stores.find_one(
+        {"_id": ObjectId(store_id), "owner_id": user["_id"]},
+        STORE_PROJECTION,
+    )
+    if not store:
+        invalidate_owner_stores(user["_id"])
+        raise HTTPException(status_code=404, detail="Store not found")
+
+    request.state.owned_store = store
+    return store
+
+
+async def get_premium_store(store_id: str, request: Request, feature: str) -> Dict:
+    """
+    Resolve the current user's store and require a paid plan.
+
+    Args:
+        store_id: Store ID
+        request: Current request
+        feature: Feature name for the 403 message, e.g. "Coupons"
+
+    Raises:
+        HTTPException: 403 if the store is on the starter plan
+    """
+    store = await get_owned_store(store_id, request)
+
+    if store.get("premium", {}).get("plan") == "starter":
+        raise HTTPException(
+            status_code=403,
+            detail=f"{feature} are a premium feature. Please upgrade your plan.",
+        )
+
+    return store
@@ -4,12 +4,18 @@ from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 from google_auth_oauthlib.flow import Flow
 from datetime import datetime
-import httpx
 from bson import ObjectId
 
 from app.core.config import settings
 from app.core.database import get_database
-from app.core.security import create_access_token, get_current_user
+from app.core.http import get_http_client
+from app.core.security import (
+    create_access_token,
+    get_current_user,
+    get_request_token,
+    invalidate_token,
+    invalidate_user,
+)
 from app.schemas.auth import AuthResponse
 from app.schemas.user import UserResponse
 
@@ -51,35 +57,35 @@ async def google_callback(code: str, response: Response):
     try:
         # Exchange code for tokens
         token_url = "https://oauth2.googleapis.com/token"
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                token_url,
-                data={
-                    "code": code,
-                    "client_id": settings.GOOGLE_CLIENT_ID,
-                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                    "grant_type": "authorization_code",
-                },
-            )
+        client = get_http_client()
+        token_response = await client.post(
+            token_url,
+            data={
+                "code": code,
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+                "grant_type": "authorization_code",
+            },
+        )
 
-            if token_response.status_code != 200:
-                raise HTTPException(status_code=400, detail="Failed to exchange code for tokens")
+        if token_response.status_code != 200:
+            raise HTTPException(status_code=400, detail="Failed to exchange code for tokens")
 
-            tokens = token_response.json()
-            access_token = tokens.get("access_token")
-            id_token_str = tokens.get("id_token")
+        tokens = token_response.json()
+        access_token = tokens.get("access_token")
+        id_token_str = tokens.get("id_token")
 
-            # Get user info
-            userinfo_response = await client.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
+        # Get user info
+        userinfo_response = await client.get(
+            "https://www.googleapis.com/oauth2/v2/userinfo",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
 
-            if userinfo_response.status_code != 200:
-                raise HTTPException(status_code=400, detail="Failed to get user info")
+        if userinfo_response.status_code != 200:
+            raise HTTPException(status_code=400, detail="Failed to get user info")
 
-            user_info = userinfo_response.json()
+        user_info = userinfo_response.json()
 
         # Upsert user in database
         db = get_database()
@@ -103,6 +109,7 @@ async def google_callback(code: str, response: Response):
                     }
                 },
             )
+            invalidate_user(existing_user["_id"])
             user_id = str(existing_user["_id"])
         else:
             # Create new user
@@ -169,7 +176,8 @@ async def get_current_user_info(request: Request):
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(request: Request, response: Response):
     """Logout user by clearing the cookie."""
+    invalidate_token(get_request_token(request))
     response.delete_cookie(key="access_token")
     return {"message": "Logged out successfully"}
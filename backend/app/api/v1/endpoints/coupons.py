@@ -4,7 +4,7 @@ from datetime import datetime
 from bson import ObjectId
 
 from app.core.database import get_database
-from app.core.security import get_current_user
+from app.api.deps import get_premium_store, require_store_owner
 from app.schemas.coupon import (
     CouponCreate,
     CouponUpdate,
@@ -17,26 +17,6 @@ from app.models.coupon import CouponStatusEnum
 router = APIRouter()
 
 
-async def check_premium_access(store_id: str, user: dict, db):
-    """Check if store has premium access for coupons."""
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-
-    # Check if plan is starter (not premium)
-    if store.get("premium", {}).get("plan") == "starter":
-        raise HTTPException(
-            status_code=403,
-            detail="Coupons are a premium feature. Please upgrade your plan.",
-        )
-
-    return store
-
-
 def coupon_to_response(coupon: dict) -> CouponResponse:
     """Convert MongoDB coupon document to response schema."""
     return CouponResponse(
@@ -61,12 +41,9 @@ async def create_coupon(
     store_id: str, coupon_data: CouponCreate, request: Request
 ):
     """Create a new coupon (premium only)."""
-    user = await get_current_user(request, None)
+    await get_premium_store(store_id, request, "Coupons")
     db = get_database()
 
-    # Check premium access
-    await check_premium_access(store_id, user, db)
-
     # Check if coupon code already exists for this store
     existing = await db.coupons.find_one({
         "store_id": ObjectId(store_id),
@@ -104,18 +81,9 @@ async def create_coupon(
 @router.get("", response_model=List[CouponResponse])
 async def list_coupons(store_id: str, request: Request):
     """List all coupons for a store."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    # Verify store ownership (but don't check premium for listing)
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-
     coupons = await db.coupons.find({"store_id": ObjectId(store_id)}).to_list(
         length=100
     )
@@ -128,12 +96,9 @@ async def update_coupon(
     store_id: str, coupon_id: str, coupon_data: CouponUpdate, request: Request
 ):
     """Update a coupon."""
-    user = await get_current_user(request, None)
+    await get_premium_store(store_id, request, "Coupons")
     db = get_database()
 
-    # Check premium access
-    await check_premium_access(store_id, user, db)
-
     # Check if coupon exists
     coupon = await db.coupons.find_one({
         "_id": ObjectId(coupon_id),
@@ -174,12 +139,9 @@ async def update_coupon(
 @router.delete("/{coupon_id}")
 async def delete_coupon(store_id: str, coupon_id: str, request: Request):
     """Delete a coupon."""
-    user = await get_current_user(request, None)
+    await get_premium_store(store_id, request, "Coupons")
     db = get_database()
 
-    # Check premium access
-    await check_premium_access(store_id, user, db)
-
     # Check if coupon exists
     coupon = await db.coupons.find_one({
         "_id": ObjectId(coupon_id),
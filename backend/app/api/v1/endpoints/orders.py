@@ -1,16 +1,32 @@
-from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi import APIRouter, HTTPException, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 import uuid
 from urllib.parse import quote
 
+from app.api.deps import get_owned_store, require_store_owner
 from app.core.database import get_database
-from app.core.security import get_current_user
 from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderTrackingResponse
+from app.services.pricing import CartValidationError, price_cart
+from app.services.inventory import InsufficientStockError, reserve_stock, release_stock
+from app.services.sequences import get_next_order_number
+from app.services.analytics import record_order_created, record_order_status_change
+from app.services.export import (
+    EXPORT_MEDIA_TYPES,
+    ORDER_COLUMNS,
+    ORDER_PROJECTION,
+    export_filename,
+    export_stream,
+)
+from app.utils.pagination import decode_cursor, keyset_filter, next_cursor
 
 router = APIRouter()
 
+# Newest first, also used as the cursor key
+ORDER_SORT = [("created_at", -1), ("_id", -1)]
+
 
 def order_to_response(order: dict, whatsapp_url: Optional[str] = None) -> OrderResponse:
     """Convert MongoDB order document to response schema."""
@@ -19,7 +35,10 @@ def order_to_response(order: dict, whatsapp_url: Optional[str] = None) -> OrderR
         store_id=str(order["store_id"]),
         order_number=order["order_number"],
         customer=order["customer"],
-        items=order["items"],
+        items=[
+            {**item, "product_id": str(item["product_id"])}
+            for item in order["items"]
+        ],
         currency=order.get("currency", "INR"),
         subtotal=order["subtotal"],
         shipping_method=order["shipping_method"],
@@ -37,34 +56,6 @@ def order_to_response(order: dict, whatsapp_url: Optional[str] = None) -> OrderR
     )
 
 
-async def verify_store_ownership(store_id: str, user: dict, db) -> dict:
-    """Verify that the user owns the store."""
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-    return store
-
-
-async def get_next_order_number(store_id: str, db) -> str:
-    """Generate the next sequential order number for a store."""
-    last_order = await db.orders.find_one(
-        {"store_id": ObjectId(store_id)},
-        sort=[("created_at", -1)],
-    )
-
-    if last_order:
-        try:
-            last_num = int(last_order["order_number"])
-            return str(last_num + 1)
-        except ValueError:
-            pass
-
-    return "10001"
-
-
 def generate_whatsapp_message(order: dict, store: dict) -> str:
     """Generate WhatsApp order message in store's language."""
     # TODO: Implement full i18n support in Track 1
@@ -122,41 +113,10 @@ async def create_order(store_id: str, order_data: OrderCreate, request: Request)
         raise HTTPException(status_code=404, detail="Store not found")
 
     # Validate products and build order items
-    order_items = []
-    subtotal = 0.0
-
-    for item in order_data.items:
-        product = await db.products.find_one({
-            "_id": ObjectId(item.product_id),
-            "store_id": ObjectId(store_id),
-            "availability": "show",
-        })
-
-        if not product:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Product {item.product_id} not found or unavailable",
-            )
-
-        # Check stock
-        if product["stock"] != -1 and product["stock"] < item.quantity:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient stock for {product['name']}",
-            )
-
-        line_total = product["price"] * item.quantity
-        subtotal += line_total
-
-        order_items.append({
-            "product_id": ObjectId(item.product_id),
-            "name": product["name"],
-            "size": item.size,
-            "color": item.color,
-            "quantity": item.quantity,
-            "unit_price": product["price"],
-            "line_total": line_total,
-        })
+    try:
+        order_items, subtotal = await price_cart(db, store_id, order_data.items)
+    except CartValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Calculate shipping fee
     shipping_fee = 0.0
@@ -171,37 +131,47 @@ async def create_order(store_id: str, order_data: OrderCreate, request: Request)
 
     total = subtotal + shipping_fee - discount_amount
 
-    # Generate order number and track token
-    order_number = await get_next_order_number(store_id, db)
-    track_token = str(uuid.uuid4())
+    # Reserve stock for the whole cart (all-or-nothing)
+    try:
+        await reserve_stock(db, order_items)
+    except InsufficientStockError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Create order document
-    order_doc = {
-        "store_id": ObjectId(store_id),
-        "order_number": order_number,
-        "customer": order_data.customer.model_dump(),
-        "items": order_items,
-        "currency": "INR",
-        "subtotal": subtotal,
-        "shipping_method": order_data.shipping_method.value,
-        "shipping_fee": shipping_fee,
-        "discount_amount": discount_amount,
-        "coupon_code": order_data.coupon_code,
-        "total": total,
-        "payment_method": order_data.payment_method.value,
-        "payment_status": "pending",
-        "status": "initiated",
-        "track_token": track_token,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
-    }
-
-    # Generate WhatsApp message
-    whatsapp_message = generate_whatsapp_message(order_doc, store)
-    order_doc["whatsapp_message"] = whatsapp_message
-
-    # Insert order
-    result = await db.orders.insert_one(order_doc)
+    # Give the reserved stock back if anything fails before the order exists
+    try:
+        # Generate order number and track token
+        order_number = await get_next_order_number(db, store_id)
+        track_token = str(uuid.uuid4())
+
+        # Create order document
+        order_doc = {
+            "store_id": ObjectId(store_id),
+            "order_number": order_number,
+            "customer": order_data.customer.model_dump(),
+            "items": order_items,
+            "currency": "INR",
+            "subtotal": subtotal,
+            "shipping_method": order_data.shipping_method.value,
+            "shipping_fee": shipping_fee,
+            "discount_amount": discount_amount,
+            "coupon_code": order_data.coupon_code,
+            "total": total,
+            "payment_method": order_data.payment_method.value,
+            "payment_status": "pending",
+            "status": "initiated",
+            "track_token": track_token,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+        }
+
+        # Generate WhatsApp message
+        whatsapp_message = generate_whatsapp_message(order_doc, store)
+        order_doc["whatsapp_message"] = whatsapp_message
+
+        result = await db.orders.insert_one(order_doc)
+    except Exception:
+        await release_stock(db, order_items)
+        raise
     order_doc["_id"] = result.inserted_id
 
     # Update order status
@@ -211,12 +181,8 @@ async def create_order(store_id: str, order_data: OrderCreate, request: Request)
     )
     order_doc["status"] = "sent_to_whatsapp"
 
-    # Update stock for each product
-    for item in order_items:
-        await db.products.update_one(
-            {"_id": item["product_id"], "stock": {"$gt": 0}},
-            {"$inc": {"stock": -item["quantity"]}},
-        )
+    # Count the order in the store's daily analytics rollup
+    await record_order_created(db, order_doc)
 
     # Generate WhatsApp URL
     whatsapp_number = store["whatsapp_number"].replace("+", "").replace(" ", "")
@@ -230,36 +196,88 @@ async def create_order(store_id: str, order_data: OrderCreate, request: Request)
 async def list_orders(
     store_id: str,
     request: Request,
+    response: Response,
     status: Optional[str] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
 ):
-    """List orders for a store (merchant only)."""
-    user = await get_current_user(request, None)
-    db = get_database()
+    """List orders for a store (merchant only).
 
-    await verify_store_ownership(store_id, user, db)
+    Pass the X-Next-Cursor response header back as `cursor` to page with an
+    index seek instead of `page`.
+    """
+    await require_store_owner(store_id, request)
+    db = get_database()
 
     # Build query
     query = {"store_id": ObjectId(store_id)}
     if status:
         query["status"] = status
 
-    # Paginate
-    skip = (page - 1) * limit
+    # Paginate by cursor (keyset) or by page number (skip)
+    skip = 0
+    if cursor:
+        try:
+            query.update(keyset_filter(ORDER_SORT, decode_cursor(cursor, ORDER_SORT)))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        skip = (page - 1) * limit
+
+    orders = await db.orders.find(query).sort(ORDER_SORT).skip(skip).limit(limit).to_list(length=limit)
+
+    token = next_cursor(orders, limit, ORDER_SORT)
+    if token:
+        response.headers["X-Next-Cursor"] = token
 
-    orders = await db.orders.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
     return [order_to_response(order) for order in orders]
 
 
+@router.get("/export")
+async def export_orders(
+    store_id: str,
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: Optional[str] = None,
+    start_date: Optional[datetime] = Query(None, description="Orders created at or after"),
+    end_date: Optional[datetime] = Query(None, description="Orders created before"),
+):
+    """Stream all matching orders as CSV or NDJSON (merchant only).
+
+    Rows are streamed straight from the database cursor, newest first, so
+    there is no page size limit and memory use does not grow with the export.
+    """
+    store = await get_owned_store(store_id, request)
+    db = get_database()
+
+    query = {"store_id": ObjectId(store_id)}
+    if status:
+        query["status"] = status
+    if start_date or end_date:
+        query["created_at"] = {}
+        if start_date:
+            query["created_at"]["$gte"] = start_date
+        if end_date:
+            query["created_at"]["$lt"] = end_date
+
+    cursor = db.orders.find(query, ORDER_PROJECTION).sort(ORDER_SORT)
+
+    return StreamingResponse(
+        export_stream(cursor, format, ORDER_COLUMNS),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(store, "orders", format)}"',
+        },
+    )
+
+
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(store_id: str, order_id: str, request: Request):
     """Get a specific order (merchant only)."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    await verify_store_ownership(store_id, user, db)
-
     order = await db.orders.find_one({
         "_id": ObjectId(order_id),
         "store_id": ObjectId(store_id),
@@ -276,11 +294,9 @@ async def update_order(
     store_id: str, order_id: str, order_data: OrderUpdate, request: Request
 ):
     """Update order status (merchant only)."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    await verify_store_ownership(store_id, user, db)
-
     # Check if order exists
     order = await db.orders.find_one({
         "_id": ObjectId(order_id),
@@ -298,7 +314,15 @@ async def update_order(
     if order_data.payment_status:
         update_doc["payment_status"] = order_data.payment_status.value
 
-    await db.orders.update_one({"_id": ObjectId(order_id)}, {"$set": update_doc})
+    # Returns the order as it was before this update
+    previous = await db.orders.find_one_and_update(
+        {"_id": ObjectId(order_id)}, {"$set": update_doc}
+    )
+
+    if previous and "status" in update_doc:
+        await record_order_status_change(
+            db, previous, previous["status"], update_doc["status"]
+        )
 
     # Fetch updated order
     updated_order = await db.orders.find_one({"_id": ObjectId(order_id)})
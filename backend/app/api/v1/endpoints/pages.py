@@ -5,7 +5,7 @@ from bson import ObjectId
 import re
 
 from app.core.database import get_database
-from app.core.security import get_current_user
+from app.api.deps import get_premium_store, require_store_owner
 from app.schemas.custom_page import (
     CustomPageCreate,
     CustomPageUpdate,
@@ -15,26 +15,6 @@ from app.schemas.custom_page import (
 router = APIRouter()
 
 
-async def check_premium_access(store_id: str, user: dict, db):
-    """Check if store has premium access for custom pages."""
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-
-    # Check if plan is starter (not premium)
-    if store.get("premium", {}).get("plan") == "starter":
-        raise HTTPException(
-            status_code=403,
-            detail="Custom pages are a premium feature. Please upgrade your plan.",
-        )
-
-    return store
-
-
 def sanitize_slug(slug: str) -> str:
     """Sanitize slug to be URL-friendly."""
     slug = slug.lower().strip()
@@ -60,12 +40,9 @@ def page_to_response(page: dict) -> CustomPageResponse:
 @router.post("", response_model=CustomPageResponse)
 async def create_page(store_id: str, page_data: CustomPageCreate, request: Request):
     """Create a new custom page (premium only)."""
-    user = await get_current_user(request, None)
+    await get_premium_store(store_id, request, "Custom pages")
     db = get_database()
 
-    # Check premium access
-    await check_premium_access(store_id, user, db)
-
     # Sanitize slug
     slug = sanitize_slug(page_data.slug)
 
@@ -101,18 +78,9 @@ async def create_page(store_id: str, page_data: CustomPageCreate, request: Reque
 @router.get("", response_model=List[CustomPageResponse])
 async def list_pages(store_id: str, request: Request):
     """List all custom pages for a store."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    # Verify store ownership (but don't check premium for listing)
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-
     pages = await db.custom_pages.find({"store_id": ObjectId(store_id)}).to_list(
         length=100
     )
@@ -123,18 +91,9 @@ async def list_pages(store_id: str, request: Request):
 @router.get("/{page_id}", response_model=CustomPageResponse)
 async def get_page(store_id: str, page_id: str, request: Request):
     """Get a specific custom page."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    # Verify store ownership
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-
     page = await db.custom_pages.find_one({
         "_id": ObjectId(page_id),
         "store_id": ObjectId(store_id),
@@ -151,12 +110,9 @@ async def update_page(
     store_id: str, page_id: str, page_data: CustomPageUpdate, request: Request
 ):
     """Update a custom page."""
-    user = await get_current_user(request, None)
+    await get_premium_store(store_id, request, "Custom pages")
     db = get_database()
 
-    # Check premium access
-    await check_premium_access(store_id, user, db)
-
     # Check if page exists
     page = await db.custom_pages.find_one({
         "_id": ObjectId(page_id),
@@ -198,12 +154,9 @@ async def update_page(
 @router.delete("/{page_id}")
 async def delete_page(store_id: str, page_id: str, request: Request):
     """Delete a custom page."""
-    user = await get_current_user(request, None)
+    await get_premium_store(store_id, request, "Custom pages")
     db = get_database()
 
-    # Check premium access
-    await check_premium_access(store_id, user, db)
-
     # Check if page exists
     page = await db.custom_pages.find_one({
         "_id": ObjectId(page_id),
@@ -1,14 +1,44 @@
-from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 
+from app.api.deps import get_owned_store, require_store_owner
 from app.core.database import get_database
-from app.core.security import get_current_user
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, SyncResponse
+from app.core.executors import run_in_thread_pool
+from app.schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductResponse,
+    SyncJobResponse,
+    SyncStatusResponse,
+)
+from app.services.export import (
+    EXPORT_MEDIA_TYPES,
+    PRODUCT_COLUMNS,
+    PRODUCT_PROJECTION,
+    export_filename,
+    export_stream,
+)
+from app.services.image_variants import product_image_variants
+from app.services.product_import import (
+    IMPORT_POOL,
+    IMPORT_POOL_WORKERS,
+    ProductImportError,
+    detect_file_format,
+    remove_spooled_file,
+    spool_upload,
+)
+from app.services.sheets_sync import parse_sheet_url
+from app.services.sync_jobs import SyncJobConflictError, sync_queue
+from app.utils.pagination import decode_cursor, keyset_filter, next_cursor
 
 router = APIRouter()
 
+# Stable listing order, also used as the cursor key
+PRODUCT_SORT = [("_id", 1)]
+
 
 def product_to_response(product: dict) -> ProductResponse:
     """Convert MongoDB product document to response schema."""
@@ -27,31 +57,19 @@ def product_to_response(product: dict) -> ProductResponse:
         availability=product.get("availability", "show"),
         thumbnail_url=product.get("thumbnail_url"),
         image_urls=product.get("image_urls", []),
+        image_variants=product.get("image_variants", {}),
         last_updated_source=product.get("last_updated_source", "dashboard"),
         created_at=product["created_at"],
         updated_at=product["updated_at"],
     )
 
 
-async def verify_store_ownership(store_id: str, user: dict, db) -> dict:
-    """Verify that the user owns the store."""
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-    return store
-
-
 @router.post("", response_model=ProductResponse)
 async def create_product(store_id: str, product_data: ProductCreate, request: Request):
     """Create a new product."""
-    user = await get_current_user(request, None)
+    store = await get_owned_store(store_id, request)
     db = get_database()
 
-    store = await verify_store_ownership(store_id, user, db)
-
     # Check product limit
     product_count = await db.products.count_documents({"store_id": ObjectId(store_id)})
     product_limit = store.get("premium", {}).get("product_limit", 50)
@@ -76,12 +94,15 @@ async def create_product(store_id: str, product_data: ProductCreate, request: Re
         "stock": product_data.stock,
         "availability": product_data.availability.value,
         "thumbnail_url": product_data.thumbnail_url,
-        "image_urls": product_data.image_urls,
+        # Re-adding an image already on the product stores it once
+        "image_urls": list(dict.fromkeys(product_data.image_urls)),
         "last_updated_source": "dashboard",
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
     }
 
+    product_doc["image_variants"] = product_image_variants(product_doc)
+
     result = await db.products.insert_one(product_doc)
     product_doc["_id"] = result.inserted_id
 
@@ -92,16 +113,20 @@ async def create_product(store_id: str, product_data: ProductCreate, request: Re
 async def list_products(
     store_id: str,
     request: Request,
+    response: Response,
     category: Optional[str] = None,
     availability: Optional[str] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
 ):
-    """List products for a store."""
-    user = await get_current_user(request, None)
-    db = get_database()
+    """List products for a store.
 
-    await verify_store_ownership(store_id, user, db)
+    Pass the X-Next-Cursor response header back as `cursor` to page with an
+    index seek instead of `page`.
+    """
+    await require_store_owner(store_id, request)
+    db = get_database()
 
     # Build query
     query = {"store_id": ObjectId(store_id)}
@@ -110,21 +135,64 @@ async def list_products(
     if availability:
         query["availability"] = availability
 
-    # Paginate
-    skip = (page - 1) * limit
+    # Paginate by cursor (keyset) or by page number (skip)
+    skip = 0
+    if cursor:
+        try:
+            query.update(keyset_filter(PRODUCT_SORT, decode_cursor(cursor, PRODUCT_SORT)))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        skip = (page - 1) * limit
+
+    products = await db.products.find(query).sort(PRODUCT_SORT).skip(skip).limit(limit).to_list(length=limit)
+
+    token = next_cursor(products, limit, PRODUCT_SORT)
+    if token:
+        response.headers["X-Next-Cursor"] = token
 
-    products = await db.products.find(query).skip(skip).limit(limit).to_list(length=limit)
     return [product_to_response(product) for product in products]
 
 
+@router.get("/export")
+async def export_products(
+    store_id: str,
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    category: Optional[str] = None,
+    availability: Optional[str] = None,
+):
+    """Stream all matching products as CSV or NDJSON.
+
+    The CSV starts with the product sheet columns (Name, Price, ...), followed
+    by availability, id and last update.
+    """
+    store = await get_owned_store(store_id, request)
+    db = get_database()
+
+    query = {"store_id": ObjectId(store_id)}
+    if category:
+        query["category"] = category
+    if availability:
+        query["availability"] = availability
+
+    cursor = db.products.find(query, PRODUCT_PROJECTION).sort(PRODUCT_SORT)
+
+    return StreamingResponse(
+        export_stream(cursor, format, PRODUCT_COLUMNS),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(store, "products", format)}"',
+        },
+    )
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(store_id: str, product_id: str, request: Request):
     """Get a specific product."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    await verify_store_ownership(store_id, user, db)
-
     product = await db.products.find_one({
         "_id": ObjectId(product_id),
         "store_id": ObjectId(store_id),
@@ -141,11 +209,9 @@ async def update_product(
     store_id: str, product_id: str, product_data: ProductUpdate, request: Request
 ):
     """Update a product."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    await verify_store_ownership(store_id, user, db)
-
     # Check if product exists
     product = await db.products.find_one({
         "_id": ObjectId(product_id),
@@ -165,6 +231,12 @@ async def update_product(
         if value is not None:
             update_doc[field] = value if not hasattr(value, "value") else value.value
 
+    if "image_urls" in update_doc:
+        update_doc["image_urls"] = list(dict.fromkeys(update_doc["image_urls"]))
+
+    if "thumbnail_url" in update_doc or "image_urls" in update_doc:
+        update_doc["image_variants"] = product_image_variants({**product, **update_doc})
+
     await db.products.update_one({"_id": ObjectId(product_id)}, {"$set": update_doc})
 
     # Fetch updated product
@@ -175,43 +247,108 @@ async def update_product(
 @router.delete("/{product_id}")
 async def delete_product(store_id: str, product_id: str, request: Request):
     """Delete a product."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    await verify_store_ownership(store_id, user, db)
-
-    result = await db.products.delete_one({
-        "_id": ObjectId(product_id),
-        "store_id": ObjectId(store_id),
-    })
+    product = await db.products.find_one_and_delete(
+        {"_id": ObjectId(product_id), "store_id": ObjectId(store_id)},
+        projection={"sheet_row_index": 1},
+    )
 
-    if result.deleted_count == 0:
+    if product is None:
         raise HTTPException(status_code=404, detail="Product not found")
 
+    if product.get("sheet_row_index") is not None:
+        # The sheet itself is unchanged; drop its fingerprints so the next
+        # sync re-reads it and re-creates the row's product
+        await db.stores.update_one(
+            {"_id": ObjectId(store_id)},
+            {"$set": {
+                "sheets_config.last_revision": None,
+                "sheets_config.content_hash": None,
+            }},
+        )
+
     return {"message": "Product deleted successfully"}
 
 
-@router.post("/sync", response_model=SyncResponse)
-async def sync_from_sheet(store_id: str, request: Request):
-    """Force sync products from Google Sheet."""
-    user = await get_current_user(request, None)
-    db = get_database()
+@router.post("/sync", response_model=SyncJobResponse, status_code=202)
+async def sync_from_sheet(
+    store_id: str,
+    request: Request,
+    force: bool = Query(False, description="Re-sync every row, ignoring fingerprints"),
+):
+    """Queue a background sync of products from the store's Google Sheet.
 
-    store = await verify_store_ownership(store_id, user, db)
+    Returns immediately with a job id; poll GET /sync/status for progress.
+    Repeated requests while a sync is queued reuse the same job.
+    """
+    store = await get_owned_store(store_id, request)
+    db = get_database()
 
-    sheet_id = store.get("sheets_config", {}).get("sheet_id")
+    sheets_config = store.get("sheets_config") or {}
+    sheet_id = sheets_config.get("sheet_id") or parse_sheet_url(sheets_config.get("sheet_url") or "")
     if not sheet_id:
         raise HTTPException(
             status_code=400,
             detail="No Google Sheet configured. Please add a sheet URL first.",
         )
 
-    # TODO: Implement Google Sheets sync logic
-    # This will be fully implemented in Track 1 (Backend Core)
+    if not sync_queue.running:
+        raise HTTPException(status_code=503, detail="Sync queue is not running")
+
+    job, created = await sync_queue.enqueue(store_id, sheet_id, force=force)
+
+    return SyncJobResponse(job_id=job.id, status=job.status, coalesced=not created)
+
+
+@router.post("/import", response_model=SyncJobResponse, status_code=202)
+async def import_from_file(
+    store_id: str,
+    request: Request,
+    file: UploadFile = File(..., description="CSV or XLSX file with a header row"),
+):
+    """Queue a background import of products from an uploaded CSV/XLSX file.
+
+    The file is copied to disk in blocks and processed in chunks, so any size
+    up to PRODUCT_IMPORT_MAX_BYTES is fine. Poll GET /sync/status for progress.
+    """
+    await require_store_owner(store_id, request)
+    db = get_database()
+
+    if not sync_queue.running:
+        raise HTTPException(status_code=503, detail="Sync queue is not running")
+
+    try:
+        file_format = detect_file_format(file.filename)
+        file_path = await run_in_thread_pool(
+            IMPORT_POOL, IMPORT_POOL_WORKERS, spool_upload, file.file, f".{file_format}"
+        )
+    except ProductImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await file.close()
+
+    try:
+        job = await sync_queue.enqueue_import(store_id, file_path, file_format)
+    except SyncJobConflictError as e:
+        remove_spooled_file(file_path)
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return SyncJobResponse(job_id=job.id, status=job.status)
+
+
+@router.get("/sync/status", response_model=SyncStatusResponse)
+async def get_sync_status(store_id: str, request: Request):
+    """Get the sheet sync status and progress of the latest sync job."""
+    store = await get_owned_store(store_id, request)
+    db = get_database()
+
+    sheets_config = store.get("sheets_config") or {}
 
-    return SyncResponse(
-        success=True,
-        products_synced=0,
-        products_skipped=0,
-        errors=["Google Sheets sync not yet implemented"],
+    return SyncStatusResponse(
+        sync_status=sheets_config.get("sync_status", "idle"),
+        sync_error=sheets_config.get("sync_error"),
+        last_synced_at=sheets_config.get("last_synced_at"),
+        job=sheets_config.get("sync_job"),
     )
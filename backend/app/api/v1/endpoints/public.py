@@ -6,6 +6,9 @@ from app.core.database import get_database
 from app.schemas.store import StoreResponse
 from app.schemas.product import ProductResponse
 from app.schemas.order import OrderTrackingResponse
+from app.services.store_cache import get_store_by_slug
+from app.services.catalog import CATALOG_SORT, list_public_products
+from app.utils.pagination import decode_cursor
 
 router = APIRouter()
 
@@ -15,7 +18,7 @@ async def get_public_store(slug: str):
     """Get public store information by slug."""
     db = get_database()
 
-    store = await db.stores.find_one({"slug": slug})
+    store = await get_store_by_slug(db, slug)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
@@ -46,31 +49,34 @@ async def get_public_products(
     category: Optional[str] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    include_meta: bool = Query(True, description="Include categories and total"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ):
     """Get public products for a store."""
     db = get_database()
 
-    # Find store by slug
-    store = await db.stores.find_one({"slug": slug})
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, CATALOG_SORT)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Find store by slug (cached)
+    store = await get_store_by_slug(db, slug)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
-    # Build query - only show visible products
-    query = {
-        "store_id": store["_id"],
-        "availability": "show",
-    }
-    if category:
-        query["category"] = category
-
-    # Paginate
-    skip = (page - 1) * limit
-
-    products = await db.products.find(query).skip(skip).limit(limit).to_list(length=limit)
-
-    # Get unique categories
-    categories = await db.products.distinct("category", {"store_id": store["_id"], "availability": "show"})
-    categories = [c for c in categories if c]  # Remove None values
+    # Page, categories and total in a single round trip
+    listing = await list_public_products(
+        db,
+        store["_id"],
+        category=category,
+        skip=(page - 1) * limit,
+        limit=limit,
+        include_meta=include_meta,
+        after=after,
+    )
 
     return {
         "products": [
@@ -86,11 +92,14 @@ async def get_public_products(
                 "stock": p.get("stock", -1),
                 "thumbnail_url": p.get("thumbnail_url"),
                 "image_urls": p.get("image_urls", []),
+                "image_variants": p.get("image_variants", {}),
             }
-            for p in products
+            for p in listing["products"]
         ],
-        "categories": categories,
-        "total": await db.products.count_documents(query),
+        "categories": listing["categories"],
+        "category_counts": listing["category_counts"],
+        "total": listing["total"],
+        "next_cursor": listing["next_cursor"],
     }
 
 
@@ -99,8 +108,8 @@ async def get_public_product(slug: str, product_id: str):
     """Get a specific public product."""
     db = get_database()
 
-    # Find store by slug
-    store = await db.stores.find_one({"slug": slug})
+    # Find store by slug (cached)
+    store = await get_store_by_slug(db, slug)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
@@ -127,6 +136,7 @@ async def get_public_product(slug: str, product_id: str):
         "stock": product.get("stock", -1),
         "thumbnail_url": product.get("thumbnail_url"),
         "image_urls": product.get("image_urls", []),
+        "image_variants": product.get("image_variants", {}),
     }
 
 
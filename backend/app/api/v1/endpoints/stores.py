@@ -5,9 +5,17 @@ from bson import ObjectId
 import re
 import uuid
 
+from app.api.deps import (
+    STORE_PROJECTION,
+    get_owned_store,
+    invalidate_owner_stores,
+    require_store_owner,
+)
 from app.core.database import get_database
 from app.core.security import get_current_user
 from app.schemas.store import StoreCreate, StoreUpdate, StoreResponse, StoreStats
+from app.services.store_cache import invalidate_store
+from app.services.analytics import TIMEFRAME_DAYS, get_order_stats
 
 router = APIRouter()
 
@@ -114,6 +122,7 @@ async def create_store(store_data: StoreCreate, request: Request):
 
     result = await db.stores.insert_one(store_doc)
     store_doc["_id"] = result.inserted_id
+    invalidate_owner_stores(user["_id"])
 
     return store_to_response(store_doc)
 
@@ -131,34 +140,16 @@ async def list_stores(request: Request):
 @router.get("/{store_id}", response_model=StoreResponse)
 async def get_store(store_id: str, request: Request):
     """Get a specific store."""
-    user = await get_current_user(request, None)
-    db = get_database()
-
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-
+    store = await get_owned_store(store_id, request)
     return store_to_response(store)
 
 
 @router.patch("/{store_id}", response_model=StoreResponse)
 async def update_store(store_id: str, store_data: StoreUpdate, request: Request):
     """Update a store."""
-    user = await get_current_user(request, None)
     db = get_database()
 
-    # Check ownership
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
+    store = await get_owned_store(store_id, request)
 
     # Build update document
     update_doc = {"updated_at": datetime.utcnow()}
@@ -166,40 +157,37 @@ async def update_store(store_id: str, store_data: StoreUpdate, request: Request)
     for field, value in store_data.model_dump(exclude_unset=True).items():
         if value is not None:
             if isinstance(value, dict):
-                # For nested objects, merge with existing
-                existing = store.get(field, {})
-                existing.update(value)
-                update_doc[field] = existing
+                # For nested objects, merge with existing (dotted paths leave
+                # fields this endpoint never loads, like sync fingerprints, in place)
+                for key, nested_value in value.items():
+                    update_doc[f"{field}.{key}"] = nested_value
             else:
                 update_doc[field] = value if not hasattr(value, "value") else value.value
 
     await db.stores.update_one({"_id": ObjectId(store_id)}, {"$set": update_doc})
+    invalidate_store(store)
 
     # Fetch updated store
-    updated_store = await db.stores.find_one({"_id": ObjectId(store_id)})
+    updated_store = await db.stores.find_one({"_id": ObjectId(store_id)}, STORE_PROJECTION)
     return store_to_response(updated_store)
 
 
 @router.delete("/{store_id}")
 async def delete_store(store_id: str, request: Request):
     """Delete a store and all its data."""
-    user = await get_current_user(request, None)
     db = get_database()
 
-    # Check ownership
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
+    store = await get_owned_store(store_id, request)
 
     # Delete store and related data
     await db.products.delete_many({"store_id": ObjectId(store_id)})
     await db.orders.delete_many({"store_id": ObjectId(store_id)})
     await db.coupons.delete_many({"store_id": ObjectId(store_id)})
+    await db.uploaded_images.delete_many({"store_id": ObjectId(store_id)})
+    await db.mirrored_images.delete_many({"store_id": ObjectId(store_id)})
     await db.stores.delete_one({"_id": ObjectId(store_id)})
+    invalidate_store(store)
+    invalidate_owner_stores(store["owner_id"])
 
     return {"message": "Store deleted successfully"}
 
@@ -207,62 +195,17 @@ async def delete_store(store_id: str, request: Request):
 @router.get("/{store_id}/stats", response_model=StoreStats)
 async def get_store_stats(store_id: str, timeframe: str = "7d", request: Request = None):
     """Get store statistics."""
-    user = await get_current_user(request, None)
+    await require_store_owner(store_id, request)
     db = get_database()
 
-    # Check ownership
-    store = await db.stores.find_one({
-        "_id": ObjectId(store_id),
-        "owner_id": user["_id"],
-    })
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-
-    # Parse timeframe
-    from datetime import timedelta
-
-    days = 7
-    if timeframe == "1d":
-        days = 1
-    elif timeframe == "30d":
-        days = 30
-    elif timeframe == "90d":
-        days = 90
-
-    start_date = datetime.utcnow() - timedelta(days=days)
-
-    # Aggregate orders
-    pipeline = [
-        {
-            "$match": {
-                "store_id": ObjectId(store_id),
-                "created_at": {"$gte": start_date},
-            }
-        },
-        {
-            "$group": {
-                "_id": None,
-                "orders_count": {"$sum": 1},
-                "sales_total": {"$sum": "$total"},
-            }
-        },
-    ]
-
-    result = await db.orders.aggregate(pipeline).to_list(length=1)
+    # Unknown timeframes fall back to 7 days
+    window = timeframe if timeframe in TIMEFRAME_DAYS else "7d"
 
-    if result:
-        stats = result[0]
-        return StoreStats(
-            orders_count=stats["orders_count"],
-            sales_total=stats["sales_total"],
-            visits=0,  # TODO: Implement visit tracking
-            timeframe=timeframe,
-        )
+    stats = (await get_order_stats(db, store_id, [window]))[window]
 
     return StoreStats(
-        orders_count=0,
-        sales_total=0.0,
-        visits=0,
+        orders_count=stats["orders_count"],
+        sales_total=stats["sales_total"],
+        visits=0,  # TODO: Implement visit tracking
         timeframe=timeframe,
     )
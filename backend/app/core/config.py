@@ -16,11 +16,28 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URI: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "mywabiz"
+    MONGODB_USE_TRANSACTIONS: bool = False  # Requires a replica set
+
+    # Caching
+    STORE_CACHE_TTL_SECONDS: int = 60
+    STORE_CACHE_MAX_SIZE: int = 10000
+
+    # Analytics
+    ANALYTICS_SOURCE: str = "orders"  # orders, or rollups once backfilled
+    VISIT_FLUSH_INTERVAL_SECONDS: float = 5.0
+    VISIT_BUFFER_MAX_KEYS: int = 10000
+    VISIT_BUFFER_MAX_LOGS: int = 50000
+
+    # Orders
+    ORDER_NUMBER_BLOCK_SIZE: int = 1  # >1 pre-allocates numbers per worker
 
     # JWT
     JWT_SECRET: str = "your-super-secret-key-change-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 168  # 7 days
+    AUTH_CACHE_TTL_SECONDS: int = 60  # Verified tokens and user documents
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    OWNER_STORES_CACHE_TTL_SECONDS: int = 300  # Owner -> store ids for ownership checks
 
     # Google OAuth
     GOOGLE_CLIENT_ID: str = ""
@@ -29,6 +46,28 @@ class Settings(BaseSettings):
 
     # Google Sheets (Service Account JSON as string)
     GOOGLE_SERVICE_ACCOUNT_JSON: Optional[str] = None
+    SHEETS_MAX_WORKERS: int = 4  # Threads for blocking Sheets API calls
+    SHEETS_SYNC_CONCURRENCY: int = 2  # Background sheet syncs running at once per worker
+    SHEETS_SYNC_BATCH_SIZE: int = 500  # Rows per bulk write (progress is reported per batch)
+    SHEETS_API_RATE_PER_MINUTE: int = 240  # Sheets/Drive API calls across all workers (quota is 300/min/project)
+    SHEETS_API_BURST: int = 10
+    SHEETS_SCHEDULED_SYNC_ENABLED: bool = False
+    SHEETS_SYNC_INTERVAL_MINUTES: int = 60
+    SHEETS_SYNC_JITTER_SECONDS: int = 300  # Random spread added to each store's next sync
+    SHEETS_SCHEDULER_TICK_SECONDS: float = 30.0
+    SHEETS_SCHEDULER_MAX_IN_FLIGHT: int = 2  # Scheduled jobs queued or running at once per worker
+
+    # CSV/XLSX product import
+    PRODUCT_IMPORT_CHUNK_ROWS: int = 2000  # Rows parsed and bulk-written at a time
+    PRODUCT_IMPORT_MAX_BYTES: int = 200 * 1024 * 1024
+
+    # Shared outbound HTTP client (OAuth, PayPal, webhooks)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP2_ENABLED: bool = True
 
     # PayPal
     PAYPAL_CLIENT_ID: str = ""
@@ -39,6 +78,26 @@ class Settings(BaseSettings):
     CLOUDINARY_CLOUD_NAME: str = ""
     CLOUDINARY_API_KEY: str = ""
     CLOUDINARY_API_SECRET: str = ""
+    CLOUDINARY_MAX_WORKERS: int = 8  # Threads for blocking Cloudinary SDK calls
+    CLOUDINARY_UPLOAD_CONCURRENCY: int = 4  # Parallel uploads per multi-image batch
+
+    # Image pre-processing before upload (needs Pillow)
+    IMAGE_PREPROCESS_ENABLED: bool = True
+    IMAGE_MAX_DIMENSION: int = 2048  # Longest side in pixels
+    IMAGE_QUALITY: int = 82
+    IMAGE_OUTPUT_FORMAT: str = "webp"  # webp or jpeg
+    IMAGE_PROCESS_WORKERS: int = 2  # Processes for resizing/encoding
+    # Serve sheet images hosted elsewhere through Cloudinary fetch URLs.
+    # Only enable once the account allows fetched URLs: restricted accounts
+    # answer 401 and the storefront has no fallback for a broken variant.
+    IMAGE_VARIANTS_FETCH_REMOTE: bool = False
+
+    # Copy external sheet thumbnails to Cloudinary in the background
+    IMAGE_MIRROR_ENABLED: bool = True
+    IMAGE_MIRROR_CONCURRENCY: int = 4  # URLs fetched at once per worker
+    IMAGE_MIRROR_MAX_ATTEMPTS: int = 5
+    IMAGE_MIRROR_RETRY_BASE_SECONDS: int = 60  # Doubles after every failed attempt
+    IMAGE_MIRROR_MAX_BYTES: int = 20 * 1024 * 1024
 
     # CORS
     CORS_ORIGINS: list[str] = [
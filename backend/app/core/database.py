@@ -1,5 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional
+from typing import Any, Dict, Optional
 from app.core.config import settings
 
 # Global database client
@@ -40,26 +40,117 @@ async def create_indexes():
     # Stores indexes
     await db.stores.create_index("owner_id")
     await db.stores.create_index("slug", unique=True)
+    await db.stores.create_index("sheets_config.next_sync_at", sparse=True)
 
     # Products indexes
     await db.products.create_index([("store_id", 1), ("category", 1)])
     await db.products.create_index([("store_id", 1), ("availability", 1)])
+    await db.products.create_index([("store_id", 1), ("_id", 1)])
+    await db.products.create_index([("store_id", 1), ("availability", 1), ("_id", 1)])
+    await db.products.create_index([("store_id", 1), ("sheet_row_index", 1)])
+    await db.products.create_index([("store_id", 1), ("sku", 1)])
+    await db.products.create_index([("store_id", 1), ("name", 1)])
 
     # Orders indexes
     await db.orders.create_index([("store_id", 1), ("created_at", -1)])
+    await db.orders.create_index([("store_id", 1), ("created_at", -1), ("_id", -1)])
     await db.orders.create_index([("store_id", 1), ("status", 1)])
     await db.orders.create_index("track_token", unique=True)
 
+    # Uploaded images (content-hash dedup index). Dedup used to be per store
+    # only; that unique index would reject the same bytes in two folders
+    if "store_id_1_content_hash_1" in await db.uploaded_images.index_information():
+        await db.uploaded_images.drop_index("store_id_1_content_hash_1")
+    await db.uploaded_images.create_index(
+        [("store_id", 1), ("folder", 1), ("kind", 1), ("content_hash", 1)], unique=True
+    )
+    await db.uploaded_images.create_index("public_id")
+
+    # Mirrored sheet images (source URL -> CDN map and work queue)
+    await db.mirrored_images.create_index(
+        [("store_id", 1), ("source_url", 1)], unique=True
+    )
+    await db.mirrored_images.create_index(
+        [("status", 1), ("next_attempt_at", 1)]
+    )
+
     # Coupons indexes
     await db.coupons.create_index([("store_id", 1), ("code", 1)], unique=True)
     await db.coupons.create_index([("store_id", 1), ("status", 1)])
 
+    # Shared rate limit windows (see app.core.ratelimit.SharedRateLimit)
+    await db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+
     # Analytics indexes
-    await db.analytics_snapshots.create_index([("store_id", 1), ("date", -1)])
+    # One snapshot per store and day; concurrent rollup upserts rely on it.
+    # Older deployments used a non-unique index and may hold duplicate days,
+    # which have to be merged before the unique index can be built.
+    snapshot_indexes = await db.analytics_snapshots.index_information()
+    if "store_id_1_date_1" not in snapshot_indexes:
+        merged = await _merge_duplicate_snapshots(db)
+        if merged:
+            print(f"Merged {merged} duplicate analytics snapshots")
+    await db.analytics_snapshots.create_index([("store_id", 1), ("date", 1)], unique=True)
+    if "store_id_1_date_-1" in snapshot_indexes:
+        await db.analytics_snapshots.drop_index("store_id_1_date_-1")
 
     print("Database indexes created")
 
 
+def _snapshot_counters(value: Any, path: str, counters: Dict[str, float]) -> None:
+    """Collect the numeric leaves of a snapshot's visits/orders as dotted paths."""
+    if isinstance(value, dict):
+        for key, nested in value.items():
+            _snapshot_counters(nested, f"{path}.{key}", counters)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        counters[path] = counters.get(path, 0) + value
+
+
+async def _merge_duplicate_snapshots(db) -> int:
+    """
+    Fold duplicate (store_id, date) analytics snapshots into the oldest one.
+
+    Visit and order counters of the duplicates are added to the kept
+    snapshot, then the duplicates are deleted.
+
+    Returns:
+        Number of duplicate snapshots removed
+    """
+    groups = db.analytics_snapshots.aggregate(
+        [
+            {"$group": {
+                "_id": {"store_id": "$store_id", "date": "$date"},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1},
+            }},
+            {"$match": {"count": {"$gt": 1}}},
+        ],
+        allowDiskUse=True,
+    )
+
+    removed = 0
+    async for group in groups:
+        snapshots = await db.analytics_snapshots.find(
+            {"_id": {"$in": group["ids"]}}
+        ).sort([("created_at", 1), ("_id", 1)]).to_list(length=None)
+        kept, duplicates = snapshots[0], snapshots[1:]
+
+        counters: Dict[str, float] = {}
+        for snapshot in duplicates:
+            for field in ("visits", "orders"):
+                if field in snapshot:
+                    _snapshot_counters(snapshot[field], field, counters)
+
+        if counters:
+            await db.analytics_snapshots.update_one({"_id": kept["_id"]}, {"$inc": counters})
+        await db.analytics_snapshots.delete_many(
+            {"_id": {"$in": [snapshot["_id"] for snapshot in duplicates]}}
+        )
+        removed += len(duplicates)
+
+    return removed
+
+
 def get_database() -> AsyncIOMotorDatabase:
     """Get database instance."""
     if db is None:
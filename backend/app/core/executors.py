@@ -0,0 +1,138 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict
+
+
+# Named, bounded thread pools for blocking SDK calls (Sheets, Cloudinary, ...)
+_thread_pools: Dict[str, ThreadPoolExecutor] = {}
+_pool_sizes: Dict[str, int] = {}
+_lock = threading.Lock()
+
+# Named process pools for CPU-bound work that would hold the GIL (image
+# encoding, ...). Functions and arguments sent to them must be picklable.
+_process_pools: Dict[str, ProcessPoolExecutor] = {}
+_process_pool_sizes: Dict[str, int] = {}
+_process_pool_restarts: Dict[str, int] = {}
+
+
+def get_thread_pool(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """Get or lazily create the named thread pool."""
+    pool = _thread_pools.get(name)
+    if pool is None:
+        with _lock:
+            pool = _thread_pools.get(name)
+            if pool is None:
+                pool = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix=f"{name}-worker",
+                )
+                _thread_pools[name] = pool
+                _pool_sizes[name] = max_workers
+    return pool
+
+
+async def run_in_thread_pool(
+    name: str,
+    max_workers: int,
+    func: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run a blocking function on a named thread pool without blocking the loop.
+
+    Callers beyond the pool size queue up instead of spawning more threads,
+    so one slow dependency cannot exhaust the default executor.
+    """
+    pool = get_thread_pool(name, max_workers)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+
+
+def _is_broken(pool: ProcessPoolExecutor) -> bool:
+    # Set once a worker died abruptly; every later submit fails
+    return bool(getattr(pool, "_broken", False))
+
+
+def _discard_process_pool(name: str, pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call creates a fresh one."""
+    with _lock:
+        if _process_pools.get(name) is not pool:
+            return  # Already replaced by another caller
+        del _process_pools[name]
+        _process_pool_restarts[name] = _process_pool_restarts.get(name, 0) + 1
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_process_pool(name: str, max_workers: int) -> ProcessPoolExecutor:
+    """Get or lazily create the named process pool, replacing a broken one."""
+    pool = _process_pools.get(name)
+    if pool is not None and _is_broken(pool):
+        _discard_process_pool(name, pool)
+        pool = None
+    if pool is None:
+        with _lock:
+            pool = _process_pools.get(name)
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=max_workers)
+                _process_pools[name] = pool
+                _process_pool_sizes[name] = max_workers
+    return pool
+
+
+async def run_in_process_pool(
+    name: str,
+    max_workers: int,
+    func: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run a CPU-bound function on a named process pool without blocking the loop.
+
+    `func` must be a module-level function; it and its arguments are pickled
+    to the worker process. If a worker dies (crash, OOM kill) the call raises
+    BrokenProcessPool and the pool is replaced for the next call.
+    """
+    pool = get_process_pool(name, max_workers)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+    except BrokenProcessPool:
+        _discard_process_pool(name, pool)
+        raise
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down every named pool (called from the app lifespan)."""
+    with _lock:
+        pools = list(_thread_pools.values()) + list(_process_pools.values())
+        _thread_pools.clear()
+        _pool_sizes.clear()
+        _process_pools.clear()
+        _process_pool_sizes.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def get_executor_stats() -> Dict[str, Dict[str, int]]:
+    """Size and queue depth of each named pool for monitoring."""
+    stats = {
+        name: {
+            "max_workers": _pool_sizes[name],
+            "threads": len(pool._threads),
+            "queued": pool._work_queue.qsize(),
+        }
+        for name, pool in list(_thread_pools.items())
+    }
+    for name, pool in list(_process_pools.items()):
+        stats[name] = {
+            "max_workers": _process_pool_sizes[name],
+            "processes": len(pool._processes or {}),
+            "queued": len(pool._pending_work_items),
+            "restarts": _process_pool_restarts.get(name, 0),
+        }
+    return stats
@@ -0,0 +1,105 @@
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx only speaks HTTP/2 when h2 is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# App-lifetime client for outbound calls (OAuth, payments, webhooks, ...).
+# Reusing it keeps TLS connections alive between requests instead of paying
+# a new handshake per call.
+_client: Optional[httpx.AsyncClient] = None
+_counters = {"requests": 0, "responses": 0, "server_errors": 0}
+
+
+async def _on_request(request: httpx.Request) -> None:
+    _counters["requests"] += 1
+
+
+async def _on_response(response: httpx.Response) -> None:
+    _counters["responses"] += 1
+    if response.status_code >= 500:
+        _counters["server_errors"] += 1
+
+
+def _create_client() -> httpx.AsyncClient:
+    http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+    if settings.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+        logger.info("h2 is not installed; shared HTTP client will use HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+    )
+
+
+def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called from the app lifespan)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared outbound HTTP client.
+
+    Callers must not close it or use it as a context manager. Created lazily
+    when used outside the app lifespan (scripts, background tasks).
+    """
+    if _client is None or _client.is_closed:
+        return start_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close pooled connections (called from the app lifespan)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    """Request counters and connection pool usage for monitoring."""
+    stats: Dict[str, Any] = {
+        "started": _client is not None and not _client.is_closed,
+        "http2": settings.HTTP2_ENABLED and HTTP2_AVAILABLE,
+        "max_connections": settings.HTTP_MAX_CONNECTIONS,
+        **_counters,
+    }
+
+    # httpcore's pool is not public API; report what it exposes if present
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", None) or [])
+    stats["connections"] = len(connections)
+    stats["idle_connections"] = sum(1 for conn in connections if conn.is_idle())
+    stats["http2_connections"] = sum(
+        1 for conn in connections if "HTTP/2" in conn.info()
+    )
+    pending = list(getattr(pool, "_requests", None) or [])
+    stats["in_flight"] = len(pending)
+    # Requests not yet assigned a connection are waiting on the pool limit
+    stats["waiting_for_connection"] = sum(
+        1 for request in pending if getattr(request, "connection", None) is None
+    )
+    return stats
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Union
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from app.core import database
+
+
+class TokenBucket:
+    """
+    Async token bucket for pacing calls against an external API quota.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; callers
+    that find the bucket empty sleep until their token is due instead of
+    failing. Like TTLCache it is per process, so the configured rate applies
+    to each uvicorn worker separately.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Take tokens from the bucket, waiting for a refill if needed."""
+        if self.rate <= 0:
+            return
+
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                delay = (tokens - self._tokens) / self.rate
+                self.waits += 1
+                self.wait_seconds += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= tokens
+            self.acquired += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Usage counters for monitoring."""
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "acquired": self.acquired,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+class SharedRateLimit:
+    """
+    Rate limit shared by every uvicorn worker, counted in MongoDB.
+
+    Each call atomically increments the counter document of the current
+    fixed window (`rate_limits` collection, one document per name and
+    window, expired by a TTL index). Callers over `limit` sleep until the
+    next window starts and try again. A local TokenBucket still spreads each
+    worker's calls out so a window's allowance is not spent in one burst.
+    If MongoDB cannot be reached the call goes ahead, paced only locally.
+    """
+
+    def __init__(self, name: str, limit: int, window_seconds: float, burst: float):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.local = TokenBucket(name, rate=limit / window_seconds, capacity=burst)
+        self.window_waits = 0
+        self.errors = 0
+
+    async def _claim(self, window: int) -> int:
+        """Increment the counter for `window` and return its new value."""
+        collection = database.get_database().rate_limits
+        started_at = datetime.utcfromtimestamp(window * self.window_seconds)
+        update = {
+            "$inc": {"count": 1},
+            "$setOnInsert": {
+                "expires_at": started_at + timedelta(seconds=self.window_seconds * 2),
+            },
+        }
+        key = {"_id": f"{self.name}:{window}"}
+        try:
+            doc = await collection.find_one_and_update(
+                key, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Another worker inserted the window document first
+            doc = await collection.find_one_and_update(
+                key, update, return_document=ReturnDocument.AFTER
+            )
+        return doc["count"]
+
+    async def acquire(self) -> None:
+        """Take one call from the shared allowance, waiting for the next window if needed."""
+        if self.limit <= 0:
+            return
+
+        await self.local.acquire()
+        while True:
+            now = time.time()
+            window = int(now // self.window_seconds)
+            try:
+                if await self._claim(window) <= self.limit:
+                    return
+            except (PyMongoError, RuntimeError) as e:
+                self.errors += 1
+                print(f"Error checking shared rate limit {self.name}: {str(e)}")
+                return
+            self.window_waits += 1
+            await asyncio.sleep((window + 1) * self.window_seconds - now)
+
+    def stats(self) -> Dict[str, Any]:
+        """Usage counters for monitoring."""
+        return {
+            **self.local.stats(),
+            "limit": self.limit,
+            "window_seconds": self.window_seconds,
+            "window_waits": self.window_waits,
+            "errors": self.errors,
+        }
+
+
+# Registry of named limiters exposed through the /metrics endpoint
+_buckets: Dict[str, Union[TokenBucket, SharedRateLimit]] = {}
+
+
+def create_token_bucket(name: str, rate: float, capacity: float) -> TokenBucket:
+    """Create a named token bucket and register it for monitoring."""
+    bucket = TokenBucket(name, rate=rate, capacity=capacity)
+    _buckets[name] = bucket
+    return bucket
+
+
+def create_shared_rate_limit(
+    name: str, limit: int, window_seconds: float, burst: float
+) -> SharedRateLimit:
+    """Create a named cross-worker rate limit and register it for monitoring."""
+    limiter = SharedRateLimit(name, limit=limit, window_seconds=window_seconds, burst=burst)
+    _buckets[name] = limiter
+    return limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every registered rate limiter."""
+    return {name: bucket.stats() for name, bucket in _buckets.items()}
@@ -1,14 +1,31 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.core.cache import create_cache
 from app.core.config import settings
 from app.core.database import get_database
 from bson import ObjectId
 
 security = HTTPBearer(auto_error=False)
 
+# Verified token -> user id (never outlives the token's exp), and
+# user id -> user document. Per process, so other workers see user updates
+# after at most AUTH_CACHE_TTL_SECONDS.
+principal_cache = create_cache(
+    "auth_principals",
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+user_cache = create_cache(
+    "auth_users",
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -39,20 +56,66 @@ def decode_access_token(token: str) -> dict:
         )
 
 
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_request_token(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = None,
+) -> Optional[str]:
+    """Get the bearer token from the Authorization header or the cookie."""
+    if credentials and credentials.credentials:
+        return credentials.credentials
+    return request.cookies.get("access_token")
+
+
+def _resolve_user_id(token: str) -> str:
+    """Verify a token and return its subject, caching the result until exp."""
+    key = _token_key(token)
+    user_id = principal_cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    payload = decode_access_token(token)
+    user_id = payload.get("sub")
+
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+        )
+
+    # A cached principal must never outlive the token itself
+    expires_in = payload.get("exp", 0) - time.time()
+    principal_cache.set(key, user_id, ttl=min(principal_cache.ttl, expires_in))
+    return user_id
+
+
+def invalidate_token(token: Optional[str]) -> None:
+    """Forget a cached principal (called on logout)."""
+    if token:
+        principal_cache.invalidate(_token_key(token))
+
+
+def invalidate_user(user_id) -> None:
+    """Drop a cached user document after the user was updated or deleted."""
+    user_cache.invalidate(str(user_id))
+
+
 async def get_current_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-):
-    """Get the current authenticated user from JWT token."""
-    token = None
-
-    # Try to get token from Authorization header
-    if credentials:
-        token = credentials.credentials
+) -> Dict:
+    """
+    Get the current authenticated user from JWT token.
 
-    # Fallback to cookie
-    if not token:
-        token = request.cookies.get("access_token")
+    Both the verified token and the user document are cached in process, so
+    repeat requests need neither a JWT decode nor a users round trip. The
+    returned document is shared between requests and must be treated as
+    read-only.
+    """
+    token = get_request_token(request, credentials)
 
     if not token:
         raise HTTPException(
@@ -61,14 +124,11 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = decode_access_token(token)
-    user_id = payload.get("sub")
+    user_id = _resolve_user_id(token)
 
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
 
     db = get_database()
     user = await db.users.find_one({"_id": ObjectId(user_id)})
@@ -79,6 +139,7 @@ async def get_current_user(
             detail="User not found",
         )
 
+    user_cache.set(user_id, user)
     return user
 
 
@@ -3,8 +3,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.database import connect_to_mongo, close_mongo_connection, get_database
+from app.core.cache import get_cache_stats
+from app.core.http import close_http_client, get_http_client_stats, start_http_client
+from app.core.executors import get_executor_stats, shutdown_executors
+from app.core.ratelimit import get_rate_limit_stats
 from app.api.v1.router import api_router
+from app.services.image_mirror import image_mirror, is_image_mirroring_enabled
+from app.services.image_processing import get_image_processing_stats
+from app.services.upload import get_upload_stats
+from app.services.visit_buffer import visit_buffer
+from app.services.sync_jobs import sync_queue
+from app.services.sync_scheduler import sync_scheduler
 
 
 @asynccontextmanager
@@ -12,8 +22,21 @@ async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Startup
     await connect_to_mongo()
+    start_http_client()
+    visit_buffer.start(get_database())
+    sync_queue.start(get_database())
+    if settings.SHEETS_SCHEDULED_SYNC_ENABLED:
+        sync_scheduler.start(get_database())
+    if is_image_mirroring_enabled():
+        image_mirror.start(get_database())
     yield
     # Shutdown
+    await sync_scheduler.stop()
+    await image_mirror.stop()
+    await sync_queue.stop()
+    await visit_buffer.stop()
+    shutdown_executors()
+    await close_http_client()
     await close_mongo_connection()
 
 
@@ -31,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include API router
@@ -51,3 +75,20 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """In-process runtime metrics for monitoring."""
+    return {
+        "caches": get_cache_stats(),
+        "visit_buffer": visit_buffer.stats(),
+        "sync_queue": sync_queue.stats(),
+        "sync_scheduler": sync_scheduler.stats(),
+        "rate_limits": get_rate_limit_stats(),
+        "executors": get_executor_stats(),
+        "http_client": get_http_client_stats(),
+        "image_processing": get_image_processing_stats(),
+        "uploads": get_upload_stats(),
+        "image_mirror": image_mirror.stats(),
+    }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 from bson import ObjectId
@@ -28,6 +28,7 @@ class AvailabilityEnum(str, Enum):
 
 class UpdateSourceEnum(str, Enum):
     SHEET = "sheet"
+    IMPORT = "import"
     DASHBOARD = "dashboard"
 
 
@@ -46,6 +47,7 @@ class ProductModel(BaseModel):
     colors: List[str] = []
     tags: List[str] = []
     brand: Optional[str] = None
+    sku: Optional[str] = None  # Merchant product code; import match key
 
     # Stock
     stock: int = -1  # -1 means unlimited
@@ -54,9 +56,15 @@ class ProductModel(BaseModel):
     # Images
     thumbnail_url: Optional[str] = None
     image_urls: List[str] = []
+    # Responsive URLs for the primary image: variant -> format -> url
+    image_variants: Dict[str, Dict[str, str]] = {}
 
     # Sync tracking
     sheet_row_index: Optional[int] = None
+    sheet_hash: Optional[str] = None  # Content hash of the synced sheet row
+    sheet_row_hash: Optional[str] = None  # Raw row fingerprint for incremental sync
+    import_row_index: Optional[int] = None  # Informational; imports match on sku/name
+    import_hash: Optional[str] = None  # Content hash of the imported file row
     last_updated_source: UpdateSourceEnum = UpdateSourceEnum.DASHBOARD
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
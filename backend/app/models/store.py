@@ -53,6 +53,7 @@ class PlanEnum(str, Enum):
 
 class SyncStatusEnum(str, Enum):
     IDLE = "idle"
+    QUEUED = "queued"
     SYNCING = "syncing"
     ERROR = "error"
 
@@ -79,12 +80,33 @@ class StorePremium(BaseModel):
     product_limit: int = 50
 
 
+class SyncJobInfo(BaseModel):
+    id: str
+    status: str  # queued, running, completed, failed
+    source: str = "manual"  # manual, scheduled or import
+    processed: int = 0
+    total: Optional[int] = None
+    products_synced: Optional[int] = None
+    products_skipped: Optional[int] = None
+    products_unchanged: Optional[int] = None
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+
+
 class SheetsConfig(BaseModel):
     sheet_id: Optional[str] = None
     sheet_url: Optional[str] = None
     last_synced_at: Optional[datetime] = None
     sync_status: SyncStatusEnum = SyncStatusEnum.IDLE
     sync_error: Optional[str] = None
+    sync_job: Optional[SyncJobInfo] = None  # Latest background sync job
+    next_sync_at: Optional[datetime] = None  # Next scheduled sync
+
+    # Incremental sync fingerprints (internal, never serialized to clients)
+    last_revision: Optional[str] = Field(default=None, exclude=True)
+    content_hash: Optional[str] = Field(default=None, exclude=True)
 
 
 class ShippingConfig(BaseModel):
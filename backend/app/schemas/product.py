@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from app.models.product import AvailabilityEnum, UpdateSourceEnum
+from app.models.store import SyncJobInfo, SyncStatusEnum
 
 
 class ProductCreate(BaseModel):
@@ -49,6 +50,7 @@ class ProductResponse(BaseModel):
     availability: AvailabilityEnum
     thumbnail_url: Optional[str]
     image_urls: List[str]
+    image_variants: Dict[str, Dict[str, str]] = {}
     last_updated_source: UpdateSourceEnum
     created_at: datetime
     updated_at: datetime
@@ -61,4 +63,18 @@ class SyncResponse(BaseModel):
     success: bool
     products_synced: int
     products_skipped: int
+    products_unchanged: int = 0
     errors: List[str] = []
+
+
+class SyncJobResponse(BaseModel):
+    job_id: str
+    status: str
+    coalesced: bool = False  # True if an already queued job was reused
+
+
+class SyncStatusResponse(BaseModel):
+    sync_status: SyncStatusEnum
+    sync_error: Optional[str] = None
+    last_synced_at: Optional[datetime] = None
+    job: Optional[SyncJobInfo] = None
@@ -4,6 +4,11 @@ from app.services.sheets_sync import (
     sync_products_from_sheet,
     fetch_sheet_data,
 )
+from app.services.product_rows import (
+    build_column_map,
+    parse_product_rows,
+    format_row_problems,
+)
 from app.services.whatsapp import (
     generate_whatsapp_message,
     generate_whatsapp_url,
@@ -11,7 +16,12 @@ from app.services.whatsapp import (
 )
 from app.services.analytics import (
     aggregate_orders_by_timeframe,
+    aggregate_orders_multi_timeframe,
+    get_order_stats,
     get_store_analytics,
+    record_order_created,
+    record_order_status_change,
+    rebuild_order_rollups,
     track_page_visit,
     get_analytics_snapshots,
     get_top_products,
@@ -22,22 +32,56 @@ from app.services.upload import (
     upload_logo,
     upload_banner,
     upload_product_image,
+    upload_product_images,
     delete_image,
+    get_upload_stats,
     is_cloudinary_configured,
 )
+from app.services.image_processing import preprocess_image
+from app.services.image_variants import (
+    build_image_variants,
+    product_image_variants,
+)
+from app.services.pricing import (
+    CartValidationError,
+    price_cart,
+)
+from app.services.inventory import (
+    InsufficientStockError,
+    reserve_stock,
+    release_stock,
+)
+from app.services.store_cache import (
+    get_store_by_slug,
+    invalidate_store,
+)
+from app.services.catalog import list_public_products
+from app.services.sequences import (
+    allocate_sequence,
+    get_next_order_number,
+)
 
 __all__ = [
     # Sheets sync
     "parse_sheet_url",
     "sync_products_from_sheet",
     "fetch_sheet_data",
+    # Product rows
+    "build_column_map",
+    "parse_product_rows",
+    "format_row_problems",
     # WhatsApp
     "generate_whatsapp_message",
     "generate_whatsapp_url",
     "generate_order_whatsapp",
     # Analytics
     "aggregate_orders_by_timeframe",
+    "aggregate_orders_multi_timeframe",
+    "get_order_stats",
     "get_store_analytics",
+    "record_order_created",
+    "record_order_status_change",
+    "rebuild_order_rollups",
     "track_page_visit",
     "get_analytics_snapshots",
     "get_top_products",
@@ -47,6 +91,28 @@ __all__ = [
     "upload_logo",
     "upload_banner",
     "upload_product_image",
+    "upload_product_images",
     "delete_image",
+    "get_upload_stats",
     "is_cloudinary_configured",
+    # Image processing
+    "preprocess_image",
+    # Image variants
+    "build_image_variants",
+    "product_image_variants",
+    # Pricing
+    "CartValidationError",
+    "price_cart",
+    # Inventory
+    "InsufficientStockError",
+    "reserve_stock",
+    "release_stock",
+    # Store cache
+    "get_store_by_slug",
+    "invalidate_store",
+    # Catalog
+    "list_public_products",
+    # Sequences
+    "allocate_sequence",
+    "get_next_order_number",
 ]
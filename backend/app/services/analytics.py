@@ -3,6 +3,10 @@
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.services.visit_buffer import visit_buffer
 
 
 TIMEFRAME_DAYS = {
@@ -13,6 +17,84 @@ TIMEFRAME_DAYS = {
 }
 
 
+async def aggregate_orders_multi_timeframe(
+    db,
+    store_id: str,
+    timeframes: Optional[list] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate orders for several timeframes in a single pipeline.
+
+    Scans the longest window once, grouped by status, and sums each shorter
+    window with conditional buckets, instead of a count + aggregation per
+    timeframe.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+        timeframes: Timeframes to compute (default: ["1d", "7d", "30d", "90d"])
+
+    Returns:
+        Dictionary keyed by timeframe, each with:
+        - orders_count: Number of orders in timeframe
+        - sales_total: Total sales amount in timeframe
+        - items_sold: Total item quantity in timeframe
+        - status_counts: Number of orders per status in timeframe
+        - timeframe: Timeframe used
+        - start_date: Start date of the period
+        - end_date: End date of the period
+    """
+    if timeframes is None:
+        timeframes = ["1d", "7d", "30d", "90d"]
+
+    end_date = datetime.utcnow()
+    start_dates = {
+        timeframe: end_date - timedelta(days=TIMEFRAME_DAYS.get(timeframe, 30))
+        for timeframe in timeframes
+    }
+
+    group: Dict[str, Any] = {"_id": "$status"}
+    for i, timeframe in enumerate(timeframes):
+        in_window = {"$gte": ["$created_at", start_dates[timeframe]]}
+        group[f"count_{i}"] = {"$sum": {"$cond": [in_window, 1, 0]}}
+        group[f"sales_{i}"] = {"$sum": {"$cond": [in_window, "$total", 0]}}
+        group[f"items_{i}"] = {"$sum": {"$cond": [in_window, {"$sum": "$items.quantity"}, 0]}}
+
+    pipeline = [
+        {
+            "$match": {
+                "store_id": ObjectId(store_id),
+                "created_at": {
+                    "$gte": min(start_dates.values()),
+                    "$lte": end_date,
+                },
+            }
+        },
+        {"$group": group},
+    ]
+
+    by_status = await db.orders.aggregate(pipeline).to_list(length=None)
+
+    analytics = {}
+    for i, timeframe in enumerate(timeframes):
+        status_counts = {
+            bucket["_id"]: bucket[f"count_{i}"]
+            for bucket in by_status
+            if bucket[f"count_{i}"]
+        }
+        analytics[timeframe] = {
+            "orders_count": sum(status_counts.values()),
+            "sales_total": sum(bucket[f"sales_{i}"] for bucket in by_status) or 0.0,
+            "items_sold": sum(bucket[f"items_{i}"] for bucket in by_status),
+            "status_counts": status_counts,
+            "timeframe": timeframe,
+            "start_date": start_dates[timeframe],
+            "end_date": end_date,
+        }
+
+    return analytics
+
+
 async def aggregate_orders_by_timeframe(
     db,
     store_id: str,
@@ -30,56 +112,259 @@ async def aggregate_orders_by_timeframe(
         Dictionary with:
         - orders_count: Number of orders in timeframe
         - sales_total: Total sales amount in timeframe
+        - items_sold: Total item quantity in timeframe
+        - status_counts: Number of orders per status in timeframe
         - timeframe: Timeframe used
         - start_date: Start date of the period
         - end_date: End date of the period
     """
-    # Get number of days for timeframe
-    days = TIMEFRAME_DAYS.get(timeframe, 30)
+    results = await aggregate_orders_multi_timeframe(db, store_id, [timeframe])
+    return results[timeframe]
 
-    # Calculate date range
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
 
-    # Query orders in timeframe
-    query = {
-        "store_id": ObjectId(store_id),
-        "created_at": {
-            "$gte": start_date,
-            "$lte": end_date,
-        },
-    }
+def _day_start(moment: datetime) -> datetime:
+    """Truncate a timestamp to the start of its UTC day."""
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+async def record_order_created(db, order: Dict[str, Any]) -> bool:
+    """
+    Add a new order to its store's daily rollup in analytics_snapshots.
 
-    # Count orders
-    orders_count = await db.orders.count_documents(query)
+    Args:
+        db: Database instance
+        order: Order document as inserted
+
+    Returns:
+        True if the rollup was updated
+    """
+    try:
+        day = _day_start(order["created_at"])
+        items_sold = sum(item["quantity"] for item in order.get("items", []))
 
-    # Calculate total sales using aggregation pipeline
+        await db.analytics_snapshots.update_one(
+            {"store_id": order["store_id"], "date": day},
+            {
+                "$inc": {
+                    "orders.count": 1,
+                    "orders.revenue": order.get("total", 0),
+                    "orders.items_sold": items_sold,
+                    f"orders.status_counts.{order['status']}": 1,
+                },
+                "$setOnInsert": {
+                    "store_id": order["store_id"],
+                    "date": day,
+                    "created_at": datetime.utcnow(),
+                },
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+            upsert=True,
+        )
+        return True
+
+    except Exception as e:
+        # Log error but don't fail the order
+        print(f"Error updating order rollup: {str(e)}")
+        return False
+
+
+async def record_order_status_change(
+    db,
+    order: Dict[str, Any],
+    old_status: str,
+    new_status: str,
+) -> bool:
+    """
+    Move an order between status buckets in its daily rollup.
+
+    The order stays attributed to the day it was created on.
+
+    Args:
+        db: Database instance
+        order: Order document (store_id and created_at are used)
+        old_status: Previous order status
+        new_status: New order status
+
+    Returns:
+        True if the rollup was updated
+    """
+    if old_status == new_status:
+        return True
+
+    try:
+        await db.analytics_snapshots.update_one(
+            {"store_id": order["store_id"], "date": _day_start(order["created_at"])},
+            {
+                "$inc": {
+                    f"orders.status_counts.{old_status}": -1,
+                    f"orders.status_counts.{new_status}": 1,
+                },
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+        )
+        return True
+
+    except Exception as e:
+        print(f"Error updating order rollup: {str(e)}")
+        return False
+
+
+async def rebuild_order_rollups(db, store_id: str) -> int:
+    """
+    Recompute a store's daily order rollups from its raw orders.
+
+    Used to backfill stores whose orders predate the rollups.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+
+    Returns:
+        Number of daily rollups written
+    """
     pipeline = [
-        {"$match": query},
+        {"$match": {"store_id": ObjectId(store_id)}},
         {
             "$group": {
-                "_id": None,
-                "total_sales": {"$sum": "$total"},
+                "_id": {
+                    "date": {
+                        "$dateFromParts": {
+                            "year": {"$year": "$created_at"},
+                            "month": {"$month": "$created_at"},
+                            "day": {"$dayOfMonth": "$created_at"},
+                        }
+                    },
+                    "status": "$status",
+                },
+                "count": {"$sum": 1},
+                "revenue": {"$sum": "$total"},
+                "items_sold": {"$sum": {"$sum": "$items.quantity"}},
             }
         },
     ]
 
-    result = await db.orders.aggregate(pipeline).to_list(length=1)
-    sales_total = result[0]["total_sales"] if result else 0.0
+    days: Dict[datetime, Dict[str, Any]] = {}
+    async for bucket in db.orders.aggregate(pipeline):
+        day = days.setdefault(bucket["_id"]["date"], {
+            "count": 0,
+            "revenue": 0.0,
+            "items_sold": 0,
+            "status_counts": {},
+        })
+        day["count"] += bucket["count"]
+        day["revenue"] += bucket["revenue"]
+        day["items_sold"] += bucket["items_sold"]
+        day["status_counts"][bucket["_id"]["status"]] = bucket["count"]
+
+    if not days:
+        return 0
+
+    operations = [
+        UpdateOne(
+            {"store_id": ObjectId(store_id), "date": date},
+            {
+                "$set": {"orders": rollup, "updated_at": datetime.utcnow()},
+                "$setOnInsert": {
+                    "store_id": ObjectId(store_id),
+                    "date": date,
+                    "created_at": datetime.utcnow(),
+                },
+            },
+            upsert=True,
+        )
+        for date, rollup in days.items()
+    ]
+    await db.analytics_snapshots.bulk_write(operations, ordered=False)
+
+    return len(days)
 
-    return {
-        "orders_count": orders_count,
-        "sales_total": sales_total,
-        "timeframe": timeframe,
-        "start_date": start_date,
-        "end_date": end_date,
-    }
+
+async def _analytics_from_rollups(
+    db,
+    store_id: str,
+    timeframes: list,
+) -> Dict[str, Dict[str, Any]]:
+    """Sum daily order rollups for each timeframe (whole UTC days)."""
+    end_date = datetime.utcnow()
+    today = _day_start(end_date)
+    max_days = max(TIMEFRAME_DAYS.get(timeframe, 30) for timeframe in timeframes)
+
+    rollups = await db.analytics_snapshots.find(
+        {
+            "store_id": ObjectId(store_id),
+            "date": {"$gt": today - timedelta(days=max_days)},
+        },
+        {"date": 1, "orders": 1},
+    ).to_list(length=max_days)
+
+    analytics = {}
+
+    for timeframe in timeframes:
+        days = TIMEFRAME_DAYS.get(timeframe, 30)
+        start_date = today - timedelta(days=days - 1)
+
+        orders_count = 0
+        sales_total = 0.0
+        items_sold = 0
+        status_counts: Dict[str, int] = {}
+
+        for rollup in rollups:
+            if rollup["date"] < start_date:
+                continue
+            orders = rollup.get("orders", {})
+            orders_count += orders.get("count", 0)
+            sales_total += orders.get("revenue", 0)
+            items_sold += orders.get("items_sold", 0)
+            for status, count in orders.get("status_counts", {}).items():
+                status_counts[status] = status_counts.get(status, 0) + count
+
+        analytics[timeframe] = {
+            "orders_count": orders_count,
+            "sales_total": sales_total,
+            "items_sold": items_sold,
+            "status_counts": status_counts,
+            "timeframe": timeframe,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+
+    return analytics
+
+
+async def get_order_stats(
+    db,
+    store_id: str,
+    timeframes: list,
+    source: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get order totals per timeframe from the configured analytics source.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+        timeframes: Timeframes to compute
+        source: "rollups" to sum the daily rollups in analytics_snapshots
+            (whole UTC days, including today), or "orders" to compute exact
+            rolling windows with one pipeline over raw orders (default:
+            ANALYTICS_SOURCE setting)
+
+    Returns:
+        Dictionary keyed by timeframe (see aggregate_orders_multi_timeframe)
+    """
+    if source is None:
+        source = settings.ANALYTICS_SOURCE
+
+    if source == "rollups":
+        return await _analytics_from_rollups(db, store_id, timeframes)
+    return await aggregate_orders_multi_timeframe(db, store_id, timeframes)
 
 
 async def get_store_analytics(
     db,
     store_id: str,
     timeframes: Optional[list] = None,
+    source: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Get comprehensive analytics for a store across multiple timeframes.
@@ -88,6 +373,7 @@ async def get_store_analytics(
         db: Database instance
         store_id: Store ID
         timeframes: List of timeframes to calculate (default: ["1d", "7d", "30d", "90d"])
+        source: "rollups" or "orders" (see get_order_stats)
 
     Returns:
         Dictionary with analytics for each timeframe
@@ -95,12 +381,7 @@ async def get_store_analytics(
     if timeframes is None:
         timeframes = ["1d", "7d", "30d", "90d"]
 
-    analytics = {}
-
-    for timeframe in timeframes:
-        analytics[timeframe] = await aggregate_orders_by_timeframe(
-            db, store_id, timeframe
-        )
+    analytics = await get_order_stats(db, store_id, timeframes, source)
 
     # Add total product count
     total_products = await db.products.count_documents({
@@ -129,6 +410,10 @@ async def track_page_visit(
     """
     Track a page visit by incrementing counter.
 
+    While the app is running visits go through the in-memory visit buffer,
+    which flushes coalesced counters and visitor logs in bulk. Outside the
+    app (scripts) the snapshot is updated directly.
+
     Args:
         db: Database instance
         store_id: Store ID
@@ -138,6 +423,9 @@ async def track_page_visit(
     Returns:
         True if tracking successful
     """
+    if visit_buffer.running:
+        return visit_buffer.add(store_id, page_type, visitor_info)
+
     try:
         # Get current date (for daily tracking)
         today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -0,0 +1,133 @@
+"""Catalog Service for storefront product listings."""
+
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+
+from app.utils.pagination import keyset_filter, next_cursor
+
+
+# Product fields exposed on public listings
+PUBLIC_PRODUCT_PROJECTION = {
+    "name": 1,
+    "category": 1,
+    "price": 1,
+    "description": 1,
+    "sizes": 1,
+    "colors": 1,
+    "brand": 1,
+    "stock": 1,
+    "thumbnail_url": 1,
+    "image_urls": 1,
+    "image_variants": 1,
+}
+
+# Stable listing order, also used as the cursor key
+CATALOG_SORT = [("_id", 1)]
+
+
+async def list_public_products(
+    db,
+    store_id: ObjectId,
+    category: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 50,
+    include_meta: bool = True,
+    after: Optional[List[Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Get a page of visible products plus listing metadata in one round trip.
+
+    Runs a single $facet aggregation that returns the page, the store's
+    categories with product counts and the total for the current filter.
+    Cursor pages (`after`) are read with an index seek; $facet sub-pipelines
+    cannot use indexes, so metadata for them is a separate facet query.
+
+    Args:
+        db: Database instance
+        store_id: Store ObjectId
+        category: Optional category filter for the page and total
+        skip: Number of products to skip
+        limit: Page size
+        include_meta: Also compute categories and total (clients can turn
+            this off for pages after the first)
+        after: Sort key values decoded from a cursor; replaces skip
+
+    Returns:
+        Dictionary with:
+        - products: List of product documents for the page
+        - categories: Sorted list of category names (None if skipped)
+        - category_counts: Mapping of category -> visible product count
+          (None if skipped)
+        - total: Number of products matching the filter (None if skipped)
+        - next_cursor: Cursor for the following page, None on the last page
+    """
+    base_query = {
+        "store_id": store_id,
+        "availability": "show",
+    }
+    category_match = [{"$match": {"category": category}}] if category else []
+
+    meta_facets = {
+        "categories": [
+            {"$match": {"category": {"$nin": [None, ""]}}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ],
+        "total": category_match + [{"$count": "count"}],
+    }
+
+    if after is None and include_meta:
+        # First page: everything in one aggregation
+        pipeline = [
+            {"$match": base_query},
+            {"$sort": dict(CATALOG_SORT)},
+            {
+                "$facet": {
+                    "products": category_match + [
+                        {"$skip": skip},
+                        {"$limit": limit},
+                        {"$project": PUBLIC_PRODUCT_PROJECTION},
+                    ],
+                    **meta_facets,
+                }
+            },
+        ]
+        result = await db.products.aggregate(pipeline).to_list(length=1)
+        facets = result[0] if result else {"products": [], "categories": [], "total": []}
+        products = facets["products"]
+    else:
+        query = {**base_query, **({"category": category} if category else {})}
+        if after is not None:
+            query.update(keyset_filter(CATALOG_SORT, after))
+            skip = 0
+
+        products = await db.products.find(
+            query, PUBLIC_PRODUCT_PROJECTION
+        ).sort(CATALOG_SORT).skip(skip).limit(limit).to_list(length=limit)
+
+        facets = None
+        if include_meta:
+            result = await db.products.aggregate([
+                {"$match": base_query},
+                {"$facet": meta_facets},
+            ]).to_list(length=1)
+            facets = result[0] if result else {"categories": [], "total": []}
+
+    if facets is None:
+        return {
+            "products": products,
+            "categories": None,
+            "category_counts": None,
+            "total": None,
+            "next_cursor": next_cursor(products, limit, CATALOG_SORT),
+        }
+
+    category_counts = {c["_id"]: c["count"] for c in facets["categories"]}
+
+    return {
+        "products": products,
+        "categories": list(category_counts),
+        "category_counts": category_counts,
+        "total": facets["total"][0]["count"] if facets["total"] else 0,
+        "next_cursor": next_cursor(products, limit, CATALOG_SORT),
+    }
@@ -0,0 +1,177 @@
+"""Export Service for streaming orders and products as CSV or NDJSON."""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Sequence, Tuple
+from datetime import datetime
+from bson import ObjectId
+
+
+# Rows buffered into one response chunk
+EXPORT_CHUNK_ROWS = 500
+
+# Documents fetched per getMore
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# (CSV header, value getter) pair
+Column = Tuple[str, Callable[[Dict], Any]]
+
+
+def _join(values) -> str:
+    return ", ".join(str(value) for value in values or [])
+
+
+def _items_summary(items: List[Dict]) -> str:
+    parts = []
+    for item in items or []:
+        variant = "/".join(filter(None, [item.get("size"), item.get("color")]))
+        label = f"{item.get('name')} ({variant})" if variant else str(item.get("name"))
+        parts.append(f"{label} x{item.get('quantity', 0)}")
+    return "; ".join(parts)
+
+
+# The first ten columns use the product sheet layout
+PRODUCT_COLUMNS: Sequence[Column] = (
+    ("Name", lambda p: p.get("name")),
+    ("Price", lambda p: p.get("price")),
+    ("Category", lambda p: p.get("category")),
+    ("Description", lambda p: p.get("description")),
+    ("Sizes", lambda p: _join(p.get("sizes"))),
+    ("Colors", lambda p: _join(p.get("colors"))),
+    ("Tags", lambda p: _join(p.get("tags"))),
+    ("Brand", lambda p: p.get("brand")),
+    ("Stock", lambda p: p.get("stock", -1)),
+    ("Thumbnail URL", lambda p: p.get("thumbnail_url")),
+    ("Availability", lambda p: p.get("availability")),
+    ("ID", lambda p: p["_id"]),
+    ("Updated At", lambda p: p.get("updated_at")),
+)
+
+PRODUCT_PROJECTION = {
+    "name": 1, "price": 1, "category": 1, "description": 1, "sizes": 1,
+    "colors": 1, "tags": 1, "brand": 1, "stock": 1, "thumbnail_url": 1,
+    "image_urls": 1, "availability": 1, "last_updated_source": 1,
+    "created_at": 1, "updated_at": 1,
+}
+
+ORDER_COLUMNS: Sequence[Column] = (
+    ("Order Number", lambda o: o.get("order_number")),
+    ("Date", lambda o: o.get("created_at")),
+    ("Status", lambda o: o.get("status")),
+    ("Customer Name", lambda o: (o.get("customer") or {}).get("name")),
+    ("Phone", lambda o: (o.get("customer") or {}).get("phone")),
+    ("Email", lambda o: (o.get("customer") or {}).get("email")),
+    ("Address", lambda o: (o.get("customer") or {}).get("address")),
+    ("Items", lambda o: _items_summary(o.get("items"))),
+    ("Item Count", lambda o: sum(item.get("quantity", 0) for item in o.get("items") or [])),
+    ("Currency", lambda o: o.get("currency", "INR")),
+    ("Subtotal", lambda o: o.get("subtotal")),
+    ("Shipping Method", lambda o: o.get("shipping_method")),
+    ("Shipping Fee", lambda o: o.get("shipping_fee", 0)),
+    ("Discount", lambda o: o.get("discount_amount", 0)),
+    ("Coupon", lambda o: o.get("coupon_code")),
+    ("Total", lambda o: o.get("total")),
+    ("Payment Method", lambda o: o.get("payment_method")),
+    ("Payment Status", lambda o: o.get("payment_status")),
+    ("ID", lambda o: o["_id"]),
+)
+
+ORDER_PROJECTION = {
+    "order_number": 1, "customer": 1, "items": 1, "currency": 1, "subtotal": 1,
+    "shipping_method": 1, "shipping_fee": 1, "discount_amount": 1,
+    "coupon_code": 1, "total": 1, "payment_method": 1, "payment_status": 1,
+    "status": 1, "created_at": 1, "updated_at": 1,
+}
+
+
+# Spreadsheet apps run text cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Customer and product text is untrusted; quote it so it stays text
+        return "'" + value
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def stream_csv(cursor, columns: Sequence[Column]) -> AsyncIterator[str]:
+    """
+    Stream a cursor as CSV, EXPORT_CHUNK_ROWS rows per chunk.
+
+    Only one chunk is held in memory at a time, whatever the cursor size.
+
+    Args:
+        cursor: Motor cursor (already filtered, projected and sorted)
+        columns: (header, getter) pairs
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in columns])
+    rows = 0
+
+    async for document in cursor:
+        writer.writerow([_cell(getter(document)) for _, getter in columns])
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+async def stream_ndjson(cursor) -> AsyncIterator[str]:
+    """
+    Stream a cursor as newline-delimited JSON, EXPORT_CHUNK_ROWS documents per chunk.
+
+    ObjectIds become strings and datetimes ISO 8601 strings.
+
+    Args:
+        cursor: Motor cursor (already filtered, projected and sorted)
+    """
+    lines = []
+
+    async for document in cursor:
+        document["id"] = str(document.pop("_id"))
+        lines.append(json.dumps(document, default=_json_default))
+        if len(lines) == EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def export_stream(cursor, export_format: str, columns: Sequence[Column]) -> AsyncIterator[str]:
+    """Pick the CSV or NDJSON stream for a cursor."""
+    cursor = cursor.batch_size(EXPORT_BATCH_SIZE)
+    if export_format == "ndjson":
+        return stream_ndjson(cursor)
+    return stream_csv(cursor, columns)
+
+
+def export_filename(store: Dict, kind: str, export_format: str) -> str:
+    """File name for the Content-Disposition header, e.g. acme-orders-20240101.csv."""
+    stamp = datetime.utcnow().strftime("%Y%m%d")
+    return f"{store.get('slug', 'store')}-{kind}-{stamp}.{export_format}"
@@ -0,0 +1,471 @@
+"""Image Mirror Service for copying external sheet images to our CDN."""
+
+import asyncio
+import io
+import ipaddress
+import socket
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime, timedelta
+from urllib.parse import urljoin, urlparse
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+import httpx
+
+from app.core.config import settings
+from app.core.http import get_http_client
+from app.services.image_variants import product_image_variants
+from app.services.upload import is_cloudinary_configured, upload_image
+
+
+# A claimed URL that is not finished within this long is retried elsewhere
+CLAIM_LEASE_SECONDS = 300
+
+MAX_RETRY_DELAY_SECONDS = 6 * 3600
+
+MAX_REDIRECTS = 5
+
+
+class ImageMirrorError(Exception):
+    """Raised when an external image cannot be mirrored."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def is_image_mirroring_enabled() -> bool:
+    """True if external sheet images should be copied to Cloudinary."""
+    return settings.IMAGE_MIRROR_ENABLED and is_cloudinary_configured()
+
+
+def is_external_image_url(url: Optional[str]) -> bool:
+    """True for http(s) URLs that are not already on our Cloudinary account."""
+    if not url:
+        return False
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return False
+    return not (
+        parsed.netloc == "res.cloudinary.com"
+        and parsed.path.startswith(f"/{settings.CLOUDINARY_CLOUD_NAME}/")
+    )
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])  # Drop any IPv6 zone
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def check_public_url(url: str) -> None:
+    """
+    Refuse URLs that resolve to internal addresses.
+
+    Sheet URLs are merchant input; without this a sheet could make the
+    server fetch from localhost, the private network or the cloud metadata
+    endpoint. Every address the host resolves to must be public (not
+    private, loopback, link-local, reserved, multicast or unspecified).
+
+    Raises:
+        ImageMirrorError: If the URL is not http(s) or not public
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ImageMirrorError("Not an http(s) URL", retryable=False)
+
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        addresses = await asyncio.get_running_loop().getaddrinfo(
+            parsed.hostname, port, type=socket.SOCK_STREAM
+        )
+    except ValueError:
+        raise ImageMirrorError("Invalid port", retryable=False)
+    except socket.gaierror as e:
+        raise ImageMirrorError(f"Cannot resolve {parsed.hostname}: {e}")
+
+    if not addresses or not all(_is_public_address(info[4][0]) for info in addresses):
+        raise ImageMirrorError(
+            f"{parsed.hostname} resolves to a non-public address", retryable=False
+        )
+
+
+def check_public_peer(response: httpx.Response) -> None:
+    """
+    Refuse a response unless its connection went to a public address.
+
+    The HTTP client resolves the host again when it connects, so a host
+    whose DNS answer changes after check_public_url (DNS rebinding) could
+    still reach an internal address; this checks the address the socket is
+    actually connected to, before anything is read from the response.
+
+    Raises:
+        ImageMirrorError: If the peer address is unknown or not public
+    """
+    stream = response.extensions.get("network_stream")
+    server_addr = stream.get_extra_info("server_addr") if stream is not None else None
+    if not server_addr or not _is_public_address(server_addr[0]):
+        raise ImageMirrorError("Connected to a non-public address", retryable=False)
+
+
+def product_image_sources(product: Dict) -> List[str]:
+    """External image URLs on a product (thumbnail first), without repeats."""
+    urls = [product.get("thumbnail_url")] + list(product.get("image_urls") or [])
+    return list(dict.fromkeys(url for url in urls if is_external_image_url(url)))
+
+
+def apply_mirrored_urls(product: Dict, mirrored: Dict[str, str]) -> Dict:
+    """
+    Swap external image URLs for their CDN copies.
+
+    Args:
+        product: Product fields (thumbnail_url, image_urls)
+        mirrored: source URL -> CDN URL
+
+    Returns:
+        The changed image fields only; empty if nothing was mirrored yet
+    """
+    changes = {}
+    thumbnail_url = product.get("thumbnail_url")
+    if thumbnail_url in mirrored:
+        changes["thumbnail_url"] = mirrored[thumbnail_url]
+
+    image_urls = product.get("image_urls") or []
+    if any(url in mirrored for url in image_urls):
+        changes["image_urls"] = [mirrored.get(url, url) for url in image_urls]
+
+    return changes
+
+
+class ImageMirror:
+    """
+    Copies external product images found by sheet sync to Cloudinary.
+
+    The mirrored_images collection is both the source URL -> CDN URL map and
+    the work queue: one entry per (store, source URL), created pending the
+    first time a sync sees the URL and never fetched again once it is done
+    or has permanently failed. Workers claim entries atomically with a
+    lease, so several uvicorn workers share the queue and a crashed claim
+    is retried. Each fetch goes through the shared HTTP client, following
+    redirects by hand so every hop is checked to be a public address, both
+    when resolved and once connected (see check_public_url and
+    check_public_peer), and then the upload service (pre-processing and
+    content-hash dedup included); at most `concurrency` URLs per worker are
+    in flight. Failures are retried
+    with exponential backoff up to `max_attempts`; 4xx responses and
+    non-image content fail at once.
+
+    Once mirrored, every sheet- or import-sourced product of the store still
+    pointing at the source URL is rewritten to the CDN copy; products written
+    later pick the copy up from the map during sync.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        retry_base: float = 60.0,
+        poll_interval: float = 30.0,
+        max_bytes: int = 20 * 1024 * 1024,
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.poll_interval = poll_interval
+        self.max_bytes = max_bytes
+
+        self._db = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._active = 0
+
+        self.mirrored = 0
+        self.retries = 0
+        self.failed = 0
+        self.bytes_fetched = 0
+        self.products_rewritten = 0
+        self.worker_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def wake(self) -> None:
+        """Tell idle workers new URLs were queued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _claim(self) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return await self._db.mirrored_images.find_one_and_update(
+            {
+                "status": {"$in": ["pending", "fetching"]},
+                "next_attempt_at": {"$lte": now},
+            },
+            {
+                "$set": {
+                    "status": "fetching",
+                    "next_attempt_at": now + timedelta(seconds=CLAIM_LEASE_SECONDS),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _fetch(self, url: str) -> bytes:
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                await check_public_url(url)
+                async with get_http_client().stream("GET", url, follow_redirects=False) as response:
+                    check_public_peer(response)
+                    if response.is_redirect:
+                        url = urljoin(url, response.headers["location"])
+                        continue
+                    return await self._read_image(response)
+
+            raise ImageMirrorError(f"More than {MAX_REDIRECTS} redirects", retryable=False)
+
+        except httpx.HTTPError as e:
+            raise ImageMirrorError(f"Fetch failed: {e}")
+
+    async def _read_image(self, response: httpx.Response) -> bytes:
+        if response.status_code >= 400:
+            raise ImageMirrorError(
+                f"HTTP {response.status_code}",
+                retryable=response.status_code >= 500 or response.status_code == 429,
+            )
+
+        content_type = response.headers.get("content-type", "")
+        if not content_type.startswith("image/"):
+            raise ImageMirrorError(
+                f"Not an image ({content_type or 'no content type'})",
+                retryable=False,
+            )
+
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise ImageMirrorError(
+                    f"Image is larger than {self.max_bytes // (1024 * 1024)} MB",
+                    retryable=False,
+                )
+            chunks.append(chunk)
+
+        self.bytes_fetched += size
+        return b"".join(chunks)
+
+    async def _rewrite_products(self, store_id: ObjectId, source_url: str, cdn_url: str) -> int:
+        """
+        Point sheet- or import-sourced products still using source_url at the CDN copy.
+
+        image_variants are rebuilt from the rewritten images, whether the
+        URL was the thumbnail or only in image_urls (the primary image can
+        come from either). Each update only applies if the product's images
+        are still the ones read, so a concurrent sync is not overwritten.
+        """
+        mirrored = {source_url: cdn_url}
+        operations = []
+
+        async for product in self._db.products.find(
+            {
+                "store_id": store_id,
+                "last_updated_source": {"$in": ["sheet", "import"]},
+                "$or": [{"thumbnail_url": source_url}, {"image_urls": source_url}],
+            },
+            {"thumbnail_url": 1, "image_urls": 1},
+        ):
+            changes = apply_mirrored_urls(product, mirrored)
+            operations.append(UpdateOne(
+                {
+                    "_id": product["_id"],
+                    "thumbnail_url": product.get("thumbnail_url"),
+                    "image_urls": product.get("image_urls"),
+                },
+                {"$set": {
+                    **changes,
+                    "image_variants": product_image_variants({**product, **changes}),
+                }},
+            ))
+
+        if not operations:
+            return 0
+
+        result = await self._db.products.bulk_write(operations, ordered=False)
+        return result.modified_count
+
+    async def mirror(self, entry: Dict) -> bool:
+        """
+        Fetch one claimed URL, upload it and rewrite products.
+
+        Returns:
+            True if the URL was mirrored
+        """
+        store_id = str(entry["store_id"])
+        source_url = entry["source_url"]
+
+        try:
+            data = await self._fetch(source_url)
+            result = await upload_image(
+                io.BytesIO(data),
+                folder=f"mywabiz/stores/{store_id}/products",
+                kind="product",
+                tags=["product", "mirrored", store_id],
+                store_id=store_id,
+            )
+        except Exception as e:
+            retryable = getattr(e, "retryable", True)
+            now = datetime.utcnow()
+            if retryable and entry["attempts"] < self.max_attempts:
+                self.retries += 1
+                delay = min(self.retry_base * 2 ** (entry["attempts"] - 1), MAX_RETRY_DELAY_SECONDS)
+                update = {"status": "pending", "next_attempt_at": now + timedelta(seconds=delay)}
+            else:
+                self.failed += 1
+                update = {"status": "failed", "next_attempt_at": None}
+            await self._db.mirrored_images.update_one(
+                {"_id": entry["_id"]},
+                {"$set": {**update, "last_error": str(e), "updated_at": now}},
+            )
+            return False
+
+        await self._db.mirrored_images.update_one(
+            {"_id": entry["_id"]},
+            {"$set": {
+                "status": "done",
+                "secure_url": result["secure_url"],
+                "public_id": result["public_id"],
+                "next_attempt_at": None,
+                "last_error": None,
+                "updated_at": datetime.utcnow(),
+            }},
+        )
+        self.mirrored += 1
+        self.products_rewritten += await self._rewrite_products(
+            entry["store_id"], source_url, result["secure_url"]
+        )
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                entry = await self._claim()
+                if entry is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
+
+                self._active += 1
+                try:
+                    await self.mirror(entry)
+                finally:
+                    self._active -= 1
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.worker_errors += 1
+                print(f"Error mirroring product images: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self, db) -> None:
+        """Start the mirror workers (called from the app lifespan)."""
+        self._db = db
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Stop the workers; interrupted URLs are retried once their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Mirror counters for monitoring."""
+        return {
+            "enabled": self.running,
+            "workers": len(self._tasks),
+            "active": self._active,
+            "mirrored": self.mirrored,
+            "retries": self.retries,
+            "failed": self.failed,
+            "bytes_fetched": self.bytes_fetched,
+            "products_rewritten": self.products_rewritten,
+            "worker_errors": self.worker_errors,
+        }
+
+
+async def lookup_mirrored_urls(db, store_id: str, urls: Iterable[str]) -> Dict[str, str]:
+    """
+    Resolve external image URLs against the store's mirror map.
+
+    URLs seen for the first time are queued for the mirror workers; each
+    URL is only ever fetched once per store.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+        urls: External image URLs (see is_external_image_url)
+
+    Returns:
+        Mapping of source URL -> CDN URL for the URLs already mirrored
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+
+    store_oid = ObjectId(store_id)
+    known = {
+        entry["source_url"]: entry
+        async for entry in db.mirrored_images.find(
+            {"store_id": store_oid, "source_url": {"$in": urls}},
+            {"source_url": 1, "status": 1, "secure_url": 1},
+        )
+    }
+
+    new_urls = [url for url in urls if url not in known]
+    if new_urls:
+        now = datetime.utcnow()
+        try:
+            await db.mirrored_images.bulk_write(
+                [
+                    UpdateOne(
+                        {"store_id": store_oid, "source_url": url},
+                        {"$setOnInsert": {
+                            "status": "pending",
+                            "attempts": 0,
+                            "next_attempt_at": now,
+                            "created_at": now,
+                            "updated_at": now,
+                        }},
+                        upsert=True,
+                    )
+                    for url in new_urls
+                ],
+                ordered=False,
+            )
+        except BulkWriteError:
+            pass  # Queued concurrently by another sync; the entry exists either way
+        image_mirror.wake()
+
+    return {
+        url: entry["secure_url"]
+        for url, entry in known.items()
+        if entry.get("status") == "done"
+    }
+
+
+image_mirror = ImageMirror(
+    concurrency=settings.IMAGE_MIRROR_CONCURRENCY,
+    max_attempts=settings.IMAGE_MIRROR_MAX_ATTEMPTS,
+    retry_base=settings.IMAGE_MIRROR_RETRY_BASE_SECONDS,
+    max_bytes=settings.IMAGE_MIRROR_MAX_BYTES,
+)
@@ -0,0 +1,193 @@
+"""Image Processing Service for shrinking merchant photos before upload."""
+
+import io
+import logging
+import time
+from typing import Dict, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pre-processing is skipped without Pillow
+    Image = None
+
+from app.core.config import settings
+from app.core.executors import run_in_process_pool
+
+
+logger = logging.getLogger(__name__)
+
+IMAGE_POOL = "images"
+
+# Pillow format names and file extensions per IMAGE_OUTPUT_FORMAT
+OUTPUT_FORMATS = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+_stats = {
+    "images": 0,
+    "skipped": 0,
+    "failed": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "seconds": 0.0,
+}
+
+
+class ImageProcessingError(ValueError):
+    """Raised when an uploaded file is not a readable image."""
+
+
+def is_image_processing_available() -> bool:
+    """True if pre-processing is enabled and Pillow is installed."""
+    return settings.IMAGE_PREPROCESS_ENABLED and Image is not None
+
+
+def process_image_bytes(
+    data: bytes,
+    max_dimension: int,
+    quality: int,
+    output_format: str = "webp",
+) -> Tuple[bytes, Dict]:
+    """
+    Downscale, strip metadata from and re-encode one image.
+
+    CPU-bound and picklable; runs on the images process pool. The EXIF
+    orientation is applied to the pixels first, then all metadata (EXIF,
+    GPS, XMP) is dropped because nothing is passed through to the encoder.
+    Animated images are returned unchanged.
+
+    Args:
+        data: Original file bytes
+        max_dimension: Longest side of the output, in pixels
+        quality: Encoder quality, 1-100
+        output_format: webp or jpeg
+
+    Returns:
+        (encoded bytes, info dict with format, width, height, processed, resized)
+
+    Raises:
+        ImageProcessingError: If the bytes are not a readable image
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        longest = max(image.size)
+        if image.format == "JPEG" and longest > max_dimension:
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale when that still
+            # leaves at least max_dimension pixels; much cheaper than a full decode
+            scale = max_dimension / longest
+            image.draft("RGB", (int(image.width * scale), int(image.height * scale)))
+        image.load()
+    except Exception as e:
+        raise ImageProcessingError(f"Unreadable image: {e}")
+
+    if getattr(image, "is_animated", False):
+        return data, {
+            "format": (image.format or "").lower(),
+            "width": image.width,
+            "height": image.height,
+            "processed": False,
+            "resized": False,
+        }
+
+    image = ImageOps.exif_transpose(image)
+
+    resized = max(image.size) > max_dimension
+    if resized:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+    pil_format, extension = OUTPUT_FORMATS[output_format]
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+
+    if pil_format == "JPEG" and has_alpha:
+        # JPEG has no alpha channel; flatten transparent logos onto white
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    output = io.BytesIO()
+    if pil_format == "JPEG":
+        image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(output, "WEBP", quality=quality, method=4)
+
+    return output.getvalue(), {
+        "format": extension,
+        "width": image.width,
+        "height": image.height,
+        "processed": True,
+        "resized": resized,
+    }
+
+
+async def preprocess_image(data: bytes) -> Tuple[bytes, Dict]:
+    """
+    Shrink an image before it is uploaded.
+
+    Downscales to IMAGE_MAX_DIMENSION, strips EXIF and re-encodes to
+    IMAGE_OUTPUT_FORMAT at IMAGE_QUALITY on a process pool, so large phone
+    photos neither block the event loop nor hold the GIL. Files that are not
+    readable images (or when Pillow is missing) are passed through unchanged
+    for Cloudinary to accept or reject, and so are images the pool fails on
+    (a crashed or broken worker, a pickling error, ...): pre-processing
+    never fails an upload.
+
+    Args:
+        data: Original file bytes
+
+    Returns:
+        (bytes to upload, info dict; empty when passed through)
+    """
+    if not is_image_processing_available():
+        return data, {}
+
+    started = time.perf_counter()
+
+    try:
+        processed, info = await run_in_process_pool(
+            IMAGE_POOL,
+            settings.IMAGE_PROCESS_WORKERS,
+            process_image_bytes,
+            data,
+            settings.IMAGE_MAX_DIMENSION,
+            settings.IMAGE_QUALITY,
+            settings.IMAGE_OUTPUT_FORMAT,
+        )
+    except ImageProcessingError as e:
+        logger.info("Uploading image unprocessed: %s", e)
+        _stats["failed"] += 1
+        return data, {}
+    except Exception as e:
+        logger.warning("Image pre-processing failed, uploading original: %r", e)
+        _stats["failed"] += 1
+        return data, {}
+
+    if not info["processed"]:
+        _stats["skipped"] += 1
+        return data, {}
+
+    _stats["images"] += 1
+    _stats["bytes_in"] += len(data)
+    _stats["bytes_out"] += len(processed)
+    _stats["seconds"] += time.perf_counter() - started
+
+    info["bytes_in"] = len(data)
+    info["bytes_out"] = len(processed)
+    return processed, info
+
+
+def get_image_processing_stats() -> Dict:
+    """Counters for monitoring: images processed and bytes saved."""
+    images = _stats["images"]
+    return {
+        "available": is_image_processing_available(),
+        **_stats,
+        "seconds": round(_stats["seconds"], 3),
+        "bytes_saved": _stats["bytes_in"] - _stats["bytes_out"],
+        "avg_ms": round(_stats["seconds"] * 1000 / images, 1) if images else 0.0,
+    }
@@ -0,0 +1,146 @@
+"""Image Variants Service for precomputed responsive product image URLs."""
+
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import cloudinary.utils
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.core.config import settings
+
+
+# Fixed responsive sizes; the storefront picks one per slot
+IMAGE_VARIANTS: Dict[str, Dict] = {
+    "thumbnail": {"width": 200, "height": 200, "crop": "fill", "gravity": "auto"},
+    "card": {"width": 480, "height": 480, "crop": "fill", "gravity": "auto"},
+    "full": {"width": 1600, "height": 1600, "crop": "limit"},
+}
+
+IMAGE_VARIANT_FORMATS = ("webp", "avif")
+
+# Cloudinary transformation parameter keys (c_fill, w_200, q_auto, ...)
+_TRANSFORMATION_KEYS = (
+    "a|ac|af|ar|b|bo|br|c|co|cs|d|dl|dn|dpr|du|e|eo|f|fl|fn|fps|g|h|if|ki|"
+    "l|o|p|pg|q|r|so|sp|t|u|vc|vs|w|x|y|z"
+)
+
+# Path segments before the public id in a delivery URL: transformations
+# (c_fill,w_200) and the version (v1712345678). Folder names such as
+# ab_shop or my_folder are not transformation keys and are kept.
+_TRANSFORMATION_SEGMENT = re.compile(
+    rf"^(v\d+|(?:{_TRANSFORMATION_KEYS})_[^,/]+(?:,(?:{_TRANSFORMATION_KEYS})_[^,/]+)*)$"
+)
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def primary_image_url(product: Dict) -> Optional[str]:
+    """The image shown on product cards: the thumbnail, else the first image."""
+    return product.get("thumbnail_url") or next(iter(product.get("image_urls") or []), None)
+
+
+def _cloudinary_source(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Get the (public_id, delivery type) to build variants from.
+
+    Images already in our Cloudinary account are transformed by public id;
+    any other http(s) URL is delivered through Cloudinary's fetch type when
+    IMAGE_VARIANTS_FETCH_REMOTE is on, and gets no variants otherwise.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+
+    prefix = f"/{settings.CLOUDINARY_CLOUD_NAME}/image/upload/"
+    if parsed.netloc == "res.cloudinary.com" and parsed.path.startswith(prefix):
+        segments = parsed.path[len(prefix):].split("/")
+        while len(segments) > 1 and _TRANSFORMATION_SEGMENT.match(segments[0]):
+            segments.pop(0)
+        public_id = "/".join(segments).rsplit(".", 1)[0]
+        return (public_id, "upload") if public_id else None
+
+    if settings.IMAGE_VARIANTS_FETCH_REMOTE:
+        return url, "fetch"
+    return None
+
+
+def build_image_variants(url: Optional[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Build the responsive variant URLs for one image.
+
+    Pure URL construction (no API call): Cloudinary renders each variant on
+    first request and serves it from the CDN afterwards.
+
+    Args:
+        url: Original image URL
+
+    Returns:
+        Mapping of variant name -> {format: url}, e.g.
+        {"card": {"webp": "...", "avif": "..."}}; empty when there is no
+        image or Cloudinary is not configured
+    """
+    if not url or not settings.CLOUDINARY_CLOUD_NAME:
+        return {}
+
+    source = _cloudinary_source(url)
+    if source is None:
+        return {}
+    source_id, delivery_type = source
+
+    variants = {}
+    for name, transformation in IMAGE_VARIANTS.items():
+        variants[name] = {
+            image_format: cloudinary.utils.cloudinary_url(
+                source_id,
+                type=delivery_type,
+                cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+                secure=True,
+                quality="auto",
+                fetch_format=image_format,
+                **transformation,
+            )[0]
+            for image_format in IMAGE_VARIANT_FORMATS
+        }
+    return variants
+
+
+def product_image_variants(product: Dict) -> Dict[str, Dict[str, str]]:
+    """Variants for a product's primary image (see primary_image_url)."""
+    return build_image_variants(primary_image_url(product))
+
+
+async def backfill_image_variants(db, store_id: str) -> int:
+    """
+    Recompute image_variants for every product of a store.
+
+    For products written before variants existed, or after IMAGE_VARIANTS
+    changes.
+
+    Returns:
+        Number of products updated
+    """
+    updated = 0
+    operations: List[UpdateOne] = []
+
+    async for product in db.products.find(
+        {"store_id": ObjectId(store_id)},
+        {"thumbnail_url": 1, "image_urls": 1, "image_variants": 1},
+    ):
+        variants = product_image_variants(product)
+        if product.get("image_variants") != variants:
+            operations.append(
+                UpdateOne({"_id": product["_id"]}, {"$set": {"image_variants": variants}})
+            )
+
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            await db.products.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+
+    if operations:
+        await db.products.bulk_write(operations, ordered=False)
+        updated += len(operations)
+
+    return updated
@@ -0,0 +1,191 @@
+"""Inventory Service for reserving product stock at checkout."""
+
+import asyncio
+from typing import Dict, List, Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core import database
+from app.services.pricing import CartValidationError
+
+
+class InsufficientStockError(CartValidationError):
+    """Raised when a cart cannot be reserved because stock ran out."""
+
+
+def _quantities_by_product(order_items: List[Dict]) -> Dict[ObjectId, int]:
+    """Sum requested quantities per product across order lines."""
+    quantities: Dict[ObjectId, int] = {}
+    for item in order_items:
+        product_id = item["product_id"]
+        quantities[product_id] = quantities.get(product_id, 0) + item["quantity"]
+    return quantities
+
+
+def _product_names(order_items: List[Dict]) -> Dict[ObjectId, str]:
+    return {item["product_id"]: item["name"] for item in order_items}
+
+
+def _reserve_filter(product_id: ObjectId, quantity: int) -> Dict:
+    """Match the product only while it can cover the requested quantity."""
+    return {
+        "_id": product_id,
+        "$or": [{"stock": -1}, {"stock": {"$gte": quantity}}],
+    }
+
+
+def _reserve_update(quantity: int) -> List[Dict]:
+    """Decrement stock, leaving unlimited products (stock -1) untouched."""
+    return [
+        {
+            "$set": {
+                "stock": {
+                    "$cond": [
+                        {"$eq": ["$stock", -1]},
+                        -1,
+                        {"$subtract": ["$stock", quantity]},
+                    ]
+                }
+            }
+        }
+    ]
+
+
+def _release_operation(product_id: ObjectId, quantity: int) -> UpdateOne:
+    """Build the compensating increment for a reservation."""
+    return UpdateOne(
+        {"_id": product_id, "stock": {"$ne": -1}},
+        {"$inc": {"stock": quantity}},
+    )
+
+
+async def _find_short_product(
+    db,
+    quantities: Dict[ObjectId, int],
+    names: Dict[ObjectId, str],
+    session=None,
+) -> str:
+    """Name the first product that cannot cover its requested quantity."""
+    cursor = db.products.find(
+        {"_id": {"$in": list(quantities)}},
+        {"stock": 1},
+        session=session,
+    )
+    async for product in cursor:
+        stock = product.get("stock", -1)
+        if stock != -1 and stock < quantities[product["_id"]]:
+            return names[product["_id"]]
+    return "one or more products"
+
+
+async def _reserve_with_transaction(
+    db,
+    quantities: Dict[ObjectId, int],
+    names: Dict[ObjectId, str],
+) -> None:
+    """Reserve every line inside a Mongo transaction (replica sets only)."""
+    operations = [
+        UpdateOne(_reserve_filter(pid, qty), _reserve_update(qty))
+        for pid, qty in quantities.items()
+    ]
+
+    async with await database.client.start_session() as session:
+        async with session.start_transaction():
+            result = await db.products.bulk_write(
+                operations, ordered=False, session=session
+            )
+            if result.matched_count < len(operations):
+                name = await _find_short_product(db, quantities, names, session)
+                # Raising inside the block aborts the transaction
+                raise InsufficientStockError(f"Insufficient stock for {name}")
+
+
+async def _reserve_with_compensation(
+    db,
+    quantities: Dict[ObjectId, int],
+    names: Dict[ObjectId, str],
+) -> None:
+    """Reserve every line with conditional updates, undoing them on failure."""
+    product_ids = list(quantities)
+    results = await asyncio.gather(*[
+        db.products.update_one(
+            _reserve_filter(pid, quantities[pid]),
+            _reserve_update(quantities[pid]),
+        )
+        for pid in product_ids
+    ])
+
+    reserved = [
+        pid for pid, result in zip(product_ids, results) if result.matched_count
+    ]
+    if len(reserved) == len(product_ids):
+        return
+
+    failed = next(
+        pid for pid, result in zip(product_ids, results) if not result.matched_count
+    )
+
+    if reserved:
+        await db.products.bulk_write(
+            [_release_operation(pid, quantities[pid]) for pid in reserved],
+            ordered=False,
+        )
+
+    raise InsufficientStockError(f"Insufficient stock for {names[failed]}")
+
+
+async def reserve_stock(
+    db,
+    order_items: List[Dict],
+    use_transaction: Optional[bool] = None,
+) -> None:
+    """
+    Reserve stock for all order lines, all-or-nothing.
+
+    Each product is decremented with an update that only matches while
+    stock >= requested quantity, so concurrent checkouts can never push stock
+    below zero. If any line cannot be reserved the whole cart is rolled back,
+    either by aborting the transaction or by releasing the lines that did
+    succeed.
+
+    Args:
+        db: Database instance
+        order_items: Priced order items returned by price_cart
+        use_transaction: Run inside a Mongo transaction (default:
+            MONGODB_USE_TRANSACTIONS setting; requires a replica set)
+
+    Raises:
+        InsufficientStockError: If any product cannot cover its quantity
+    """
+    quantities = _quantities_by_product(order_items)
+    if not quantities:
+        return
+
+    names = _product_names(order_items)
+
+    if use_transaction is None:
+        use_transaction = settings.MONGODB_USE_TRANSACTIONS
+
+    if use_transaction:
+        await _reserve_with_transaction(db, quantities, names)
+    else:
+        await _reserve_with_compensation(db, quantities, names)
+
+
+async def release_stock(db, order_items: List[Dict]) -> None:
+    """
+    Return previously reserved stock, e.g. when the order insert fails.
+
+    Args:
+        db: Database instance
+        order_items: Order items that were passed to reserve_stock
+    """
+    quantities = _quantities_by_product(order_items)
+    if not quantities:
+        return
+
+    await db.products.bulk_write(
+        [_release_operation(pid, qty) for pid, qty in quantities.items()],
+        ordered=False,
+    )
@@ -0,0 +1,93 @@
+"""Pricing Service for resolving cart lines into priced order items."""
+
+from typing import Dict, List, Tuple
+from bson import ObjectId
+
+
+# Fields needed to price a cart line and check its stock
+PRICING_PROJECTION = {
+    "_id": 1,
+    "name": 1,
+    "price": 1,
+    "stock": 1,
+}
+
+
+class CartValidationError(ValueError):
+    """Raised when a cart line cannot be priced or fulfilled."""
+
+
+async def price_cart(
+    db,
+    store_id: str,
+    items: List,
+) -> Tuple[List[Dict], float]:
+    """
+    Resolve every cart line with a single query and price the order.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+        items: List of OrderItemCreate entries from the checkout payload
+
+    Returns:
+        Tuple of (order_items, subtotal) where order_items are ready to be
+        embedded in the order document
+
+    Raises:
+        CartValidationError: If a product is missing, hidden or out of stock
+    """
+    product_ids = []
+    for item in items:
+        if not ObjectId.is_valid(item.product_id):
+            raise CartValidationError(
+                f"Product {item.product_id} not found or unavailable"
+            )
+        product_ids.append(ObjectId(item.product_id))
+
+    # One round trip for the whole cart
+    cursor = db.products.find(
+        {
+            "_id": {"$in": list(set(product_ids))},
+            "store_id": ObjectId(store_id),
+            "availability": "show",
+        },
+        PRICING_PROJECTION,
+    )
+    products = {product["_id"]: product async for product in cursor}
+
+    # Total quantity requested per product (the same product can appear on
+    # several lines with different sizes/colors)
+    requested: Dict[ObjectId, int] = {}
+    for product_id, item in zip(product_ids, items):
+        requested[product_id] = requested.get(product_id, 0) + item.quantity
+
+    order_items = []
+    subtotal = 0.0
+
+    for product_id, item in zip(product_ids, items):
+        product = products.get(product_id)
+
+        if not product:
+            raise CartValidationError(
+                f"Product {item.product_id} not found or unavailable"
+            )
+
+        # Check stock
+        if product["stock"] != -1 and product["stock"] < requested[product_id]:
+            raise CartValidationError(f"Insufficient stock for {product['name']}")
+
+        line_total = product["price"] * item.quantity
+        subtotal += line_total
+
+        order_items.append({
+            "product_id": product_id,
+            "name": product["name"],
+            "size": item.size,
+            "color": item.color,
+            "quantity": item.quantity,
+            "unit_price": product["price"],
+            "line_total": line_total,
+        })
+
+    return order_items, subtotal
@@ -0,0 +1,265 @@
+"""Product Import Service for bulk-loading products from CSV/XLSX files."""
+
+import csv
+import io
+import os
+import tempfile
+from itertools import islice
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, Iterator, List, Optional
+from bson import ObjectId
+
+try:
+    import openpyxl
+except ImportError:  # XLSX support is optional
+    openpyxl = None
+
+from app.core.config import settings
+from app.core.executors import run_in_thread_pool
+from app.services.product_rows import (
+    build_column_map,
+    format_row_problems,
+    parse_product_rows,
+)
+from app.services.sheets_sync import _bulk_upsert_products
+
+
+IMPORT_POOL = "imports"
+IMPORT_POOL_WORKERS = 2
+
+# Error lines kept for the store's sync_error; the rest are only counted
+MAX_IMPORT_ERRORS = 50
+
+
+class ProductImportError(ValueError):
+    """Raised when an uploaded product file cannot be imported."""
+
+
+def detect_file_format(filename: Optional[str]) -> str:
+    """
+    Get the import format from an uploaded file name.
+
+    Raises:
+        ProductImportError: If the extension is not supported
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension == ".xlsx":
+        if openpyxl is None:
+            raise ProductImportError("XLSX import is not available; upload a CSV file instead")
+        return "xlsx"
+    raise ProductImportError("Unsupported file type; upload a .csv or .xlsx file")
+
+
+def spool_upload(source: BinaryIO, suffix: str) -> str:
+    """
+    Copy an uploaded file to a private temp file in fixed-size blocks.
+
+    Blocking; run it on the imports thread pool. The upload is gone once the
+    request ends, so the background job reads from this copy (and deletes it).
+
+    Returns:
+        Path of the temp file
+
+    Raises:
+        ProductImportError: If the file is larger than PRODUCT_IMPORT_MAX_BYTES
+    """
+    fd, path = tempfile.mkstemp(prefix="product-import-", suffix=suffix)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as target:
+            while True:
+                block = source.read(1024 * 1024)
+                if not block:
+                    break
+                written += len(block)
+                if written > settings.PRODUCT_IMPORT_MAX_BYTES:
+                    raise ProductImportError(
+                        f"File is larger than {settings.PRODUCT_IMPORT_MAX_BYTES // (1024 * 1024)} MB"
+                    )
+                target.write(block)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def _iter_csv_rows(handle: BinaryIO) -> Iterator[List[str]]:
+    text = io.TextIOWrapper(handle, encoding="utf-8-sig", errors="replace", newline="")
+    yield from csv.reader(text)
+
+
+def _xlsx_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores every number as a float; keep "10" parseable as stock
+        return str(int(value))
+    return str(value)
+
+
+def _iter_xlsx_rows(handle: BinaryIO) -> Iterator[List[str]]:
+    # read_only streams the sheet XML instead of building the whole workbook
+    workbook = openpyxl.load_workbook(handle, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield [_xlsx_cell(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def _next_chunk(rows: Iterator[List[str]], size: int) -> List[List[str]]:
+    """Blocking read of the next chunk of rows; runs on the imports pool."""
+    return list(islice(rows, size))
+
+
+async def import_products_from_file(
+    db,
+    store_id: str,
+    file_path: str,
+    file_format: str,
+    progress: Optional[Callable[[int, Optional[int]], Awaitable[None]]] = None,
+) -> Dict:
+    """
+    Import products from a CSV or XLSX file in fixed-size chunks.
+
+    The file is read PRODUCT_IMPORT_CHUNK_ROWS rows at a time on a thread
+    pool, each chunk goes through the same header-mapped validation as a
+    sheet sync and is written with one bulk_write, so memory stays flat
+    regardless of file size. Rows are matched to previously imported
+    products by their SKU column when the file has one, otherwise by product
+    name within the store; sheet-synced products and products edited from
+    the dashboard are left alone. New products stop being created once the
+    store's product_limit is reached.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+        file_path: Path of the spooled upload
+        file_format: csv or xlsx
+        progress: Optional async callback called with (rows_processed, None)
+            after each chunk
+
+    Returns:
+        Dictionary with import results, shaped like sync_products_from_sheet
+    """
+    await db.stores.update_one(
+        {"_id": ObjectId(store_id)},
+        {
+            "$set": {
+                "sheets_config.sync_status": "syncing",
+                "sheets_config.sync_error": None,
+            }
+        },
+    )
+
+    handle = open(file_path, "rb")
+    rows = None
+    try:
+        rows = _iter_xlsx_rows(handle) if file_format == "xlsx" else _iter_csv_rows(handle)
+        chunk_size = settings.PRODUCT_IMPORT_CHUNK_ROWS
+
+        header = await run_in_thread_pool(IMPORT_POOL, IMPORT_POOL_WORKERS, next, rows, None)
+        if not header:
+            raise ProductImportError("File is empty")
+
+        column_map = build_column_map(header)
+
+        store = await db.stores.find_one({"_id": ObjectId(store_id)}, {"premium": 1})
+        product_limit = (store or {}).get("premium", {}).get("product_limit", 50)
+
+        totals = {"synced": 0, "unchanged": 0, "skipped": 0}
+        errors: List[str] = []
+        errors_dropped = 0
+        processed = 0
+        row_number = 2  # Row 1 is the header
+
+        while True:
+            chunk = await run_in_thread_pool(
+                IMPORT_POOL, IMPORT_POOL_WORKERS, _next_chunk, rows, chunk_size
+            )
+            if not chunk:
+                break
+
+            products, problems = parse_product_rows(
+                chunk, range(row_number, row_number + len(chunk)), column_map, source="import"
+            )
+            product_count = await db.products.count_documents({"store_id": ObjectId(store_id)})
+            result = await _bulk_upsert_products(
+                db,
+                store_id,
+                products,
+                source="import",
+                max_new_products=max(product_limit - product_count, 0),
+            )
+
+            for key in totals:
+                totals[key] += result[key]
+            for line in format_row_problems(problems) + result["errors"]:
+                if len(errors) < MAX_IMPORT_ERRORS:
+                    errors.append(line)
+                else:
+                    errors_dropped += 1
+
+            row_number += len(chunk)
+            processed += len(chunk)
+            if progress:
+                await progress(processed, None)
+
+        if not processed:
+            raise ProductImportError("No data rows found in file (only header)")
+
+        if errors_dropped:
+            errors.append(f"... and {errors_dropped} more errors")
+
+        await db.stores.update_one(
+            {"_id": ObjectId(store_id)},
+            {
+                "$set": {
+                    "sheets_config.sync_status": "idle",
+                    "sheets_config.sync_error": "; ".join(errors) if errors else None,
+                }
+            },
+        )
+
+        return {
+            "success": True,
+            "products_synced": totals["synced"],
+            "products_skipped": totals["skipped"],
+            "products_unchanged": totals["unchanged"],
+            "errors": errors,
+        }
+
+    except Exception as e:
+        await db.stores.update_one(
+            {"_id": ObjectId(store_id)},
+            {
+                "$set": {
+                    "sheets_config.sync_status": "error",
+                    "sheets_config.sync_error": str(e),
+                }
+            },
+        )
+
+        return {
+            "success": False,
+            "products_synced": 0,
+            "products_skipped": 0,
+            "products_unchanged": 0,
+            "errors": [str(e)],
+        }
+
+    finally:
+        if rows is not None:
+            rows.close()
+        handle.close()
+
+
+def remove_spooled_file(file_path: Optional[str]) -> None:
+    """Delete a spooled upload, ignoring files that are already gone."""
+    if not file_path:
+        return
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,244 @@
+"""Product Rows Service for parsing tabular product data (sheets, CSV files)."""
+
+import re
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Product field -> accepted header spellings (compared after normalize_header)
+COLUMN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "name": ("name", "product", "product name", "title", "item", "item name"),
+    "price": ("price", "mrp", "selling price", "sale price", "rate"),
+    "category": ("category", "categories", "collection", "type"),
+    "description": ("description", "desc", "details", "product description"),
+    "sizes": ("sizes", "size"),
+    "colors": ("colors", "colours", "color", "colour"),
+    "tags": ("tags", "tag", "keywords"),
+    "brand": ("brand", "make", "manufacturer"),
+    "stock": ("stock", "qty", "quantity", "inventory", "stock quantity"),
+    "thumbnail_url": (
+        "thumbnail url", "thumbnail", "image", "image url", "image link", "photo", "picture",
+    ),
+    "sku": ("sku", "product id", "product code", "item code"),
+}
+
+# Legacy fixed column order, used when the header does not name the required
+# columns
+DEFAULT_COLUMN_MAP: Dict[str, int] = {
+    field: position
+    for position, field in enumerate((
+        "name", "price", "category", "description", "sizes", "colors",
+        "tags", "brand", "stock", "thumbnail_url",
+    ))
+}
+
+REQUIRED_FIELDS = ("name", "price")
+
+# Where each row source tracks its rows on the product:
+# source -> (row number field, content hash field). Sheet and file-import
+# rows are keyed separately so the two never overwrite each other.
+ROW_SOURCE_FIELDS: Dict[str, Tuple[str, str]] = {
+    "sheet": ("sheet_row_index", "sheet_hash"),
+    "import": ("import_row_index", "import_hash"),
+}
+
+# Rows listed per message in a column error report
+MAX_REPORTED_ROWS = 20
+
+_ALIAS_LOOKUP = {
+    alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases
+}
+
+
+def normalize_header(cell: str) -> str:
+    """Lowercase a header cell and collapse punctuation/whitespace to single spaces."""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", str(cell).lower()).split())
+
+
+def build_column_map(header: Sequence[str]) -> Dict[str, int]:
+    """
+    Map product fields to column positions from a header row.
+
+    Matching is case-insensitive and accepts the aliases in COLUMN_ALIASES;
+    when a field appears twice the first column wins. A header that does not
+    name every required column is treated as the legacy fixed layout
+    (Name, Price, Category, Description, Sizes, Colors, Tags, Brand, Stock,
+    Thumbnail URL), so legacy sheets whose headers happen to match a few
+    aliases keep syncing.
+
+    Args:
+        header: Header row cells
+
+    Returns:
+        Dictionary of field name -> column index
+    """
+    column_map: Dict[str, int] = {}
+    for position, cell in enumerate(header or []):
+        field = _ALIAS_LOOKUP.get(normalize_header(cell))
+        if field and field not in column_map:
+            column_map[field] = position
+
+    missing = missing_required_columns(column_map)
+    if missing:
+        if column_map:
+            logger.warning(
+                "Header matches %s but not %s; using the legacy column layout",
+                ", ".join(column_map), ", ".join(missing),
+            )
+        return dict(DEFAULT_COLUMN_MAP)
+
+    return column_map
+
+
+def column_map_fingerprint(column_map: Dict[str, int]) -> str:
+    """Fingerprint a column map, so row hashes change when columns move."""
+    return hashlib.sha1(json.dumps(column_map, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def missing_required_columns(column_map: Dict[str, int]) -> List[str]:
+    """Required fields that have no column in the map."""
+    return [field for field in REQUIRED_FIELDS if field not in column_map]
+
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _to_int(value: str, default: int) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _split_column(values: List[str]) -> List[List[str]]:
+    """Split a column of comma-separated cells, parsing each distinct cell once."""
+    parsed = {value: list(map(str.strip, value.split(","))) for value in set(values) if value}
+    return [parsed[value].copy() if value else [] for value in values]
+
+
+def parse_product_rows(
+    rows: Sequence[Sequence[str]],
+    row_indices: Sequence[int],
+    column_map: Dict[str, int],
+    source: str = "sheet",
+) -> Tuple[List[Dict], Dict[str, List[Tuple[int, str]]]]:
+    """
+    Parse and validate rows column by column.
+
+    The rows are transposed once, price and stock are coerced a column at a
+    time, and products are assembled by zipping the columns back together.
+    Blank rows are skipped silently. Cells must be strings.
+
+    Args:
+        rows: Data rows (lists of cell strings)
+        row_indices: Row number of each row, stored in the source's row
+            number field (see ROW_SOURCE_FIELDS)
+        column_map: Field -> column index, from build_column_map
+        source: "sheet" or "import"; stored as last_updated_source
+
+    Returns:
+        Tuple of (products, problems) where problems maps an error message
+        to the (row_index, cell value) pairs it applies to; each invalid row
+        is reported under its first failing check only
+    """
+    row_field = ROW_SOURCE_FIELDS[source][0]
+
+    # Drop blank rows and pad the rest to a common width, so the sheet can be
+    # transposed into columns in one zip(*) call
+    width = max(column_map.values()) + 1
+    padding = [""] * width
+    indices = []
+    data = []
+    for row_index, row in zip(row_indices, rows):
+        if not row or not "".join(row).strip():
+            continue
+        indices.append(row_index)
+        data.append(row[:width] if len(row) >= width else [*row, *padding[len(row):]])
+
+    transposed = list(zip(*data)) if data else [()] * width
+    blank = [""] * len(data)
+    columns = {
+        field: list(map(str.strip, transposed[column_map[field]]))
+        if field in column_map else blank
+        for field in COLUMN_ALIASES
+    }
+
+    # Batch coercion, one column at a time
+    prices = [_to_float(value) if value else None for value in columns["price"]]
+    stocks = [_to_int(value, -1) if value else -1 for value in columns["stock"]]
+    sizes_lists = _split_column(columns["sizes"])
+    colors_lists = _split_column(columns["colors"])
+    tags_lists = _split_column(columns["tags"])
+
+    problems: Dict[str, List[Tuple[int, str]]] = {}
+    products = []
+
+    for (
+        row_index, name, price_str, price, category, description,
+        sizes, colors, tags, brand, stock, thumbnail_url, sku,
+    ) in zip(
+        indices, columns["name"], columns["price"], prices, columns["category"],
+        columns["description"], sizes_lists, colors_lists, tags_lists,
+        columns["brand"], stocks, columns["thumbnail_url"], columns["sku"],
+    ):
+        if not name:
+            message = "Name is required"
+        elif not price_str:
+            message = "Price is required"
+        elif price is None:
+            message = "Invalid price format"
+        elif price < 0:
+            message = "Price must be non-negative"
+        else:
+            product = {
+                "name": name,
+                "price": price,
+                "category": category or None,
+                "description": description or None,
+                "sizes": sizes,
+                "colors": colors,
+                "tags": tags,
+                "brand": brand or None,
+                "stock": stock,
+                "thumbnail_url": thumbnail_url or None,
+                "image_urls": [thumbnail_url] if thumbnail_url else [],
+                row_field: row_index,
+                "availability": "show",
+                "last_updated_source": source,
+            }
+            if sku:
+                # Only set when present, so rows without one hash as before
+                product["sku"] = sku
+            products.append(product)
+            continue
+        problems.setdefault(message, []).append((row_index, price_str))
+
+    return products, problems
+
+
+def format_row_problems(problems: Dict[str, List[Tuple[int, str]]]) -> List[str]:
+    """
+    Turn parse problems into one error line per message.
+
+    Example: "Invalid price format: rows 4 ('abc'), 9 ('1.2.3')"
+    """
+    errors = []
+    for message, entries in problems.items():
+        show_values = message == "Invalid price format"
+        listed = [
+            f"{row_index} ({value!r})" if show_values else str(row_index)
+            for row_index, value in entries[:MAX_REPORTED_ROWS]
+        ]
+        more = len(entries) - MAX_REPORTED_ROWS
+        suffix = f" and {more} more" if more > 0 else ""
+        label = "row" if len(entries) == 1 else "rows"
+        errors.append(f"{message}: {label} {', '.join(listed)}{suffix}")
+    return errors
@@ -0,0 +1,117 @@
+"""Sequence Service for allocating per-store order numbers."""
+
+import asyncio
+from typing import Dict, Tuple
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+
+
+# First order number handed out to a store with no orders
+ORDER_NUMBER_START = 10001
+
+# Per-worker blocks of pre-allocated numbers: counter key -> (next, last)
+_blocks: Dict[str, Tuple[int, int]] = {}
+_block_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _order_counter_key(store_id: str) -> str:
+    return f"order_number:{store_id}"
+
+
+async def _legacy_last_order_number(db, store_id: str) -> int:
+    """
+    Find the highest order number issued before the counter existed.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+
+    Returns:
+        Last numeric order number, or ORDER_NUMBER_START - 1 if none
+    """
+    last_order = await db.orders.find_one(
+        {"store_id": ObjectId(store_id)},
+        {"order_number": 1},
+        sort=[("created_at", -1)],
+    )
+
+    if last_order:
+        try:
+            return int(last_order["order_number"])
+        except ValueError:
+            pass
+
+    return ORDER_NUMBER_START - 1
+
+
+async def allocate_sequence(db, store_id: str, count: int = 1) -> int:
+    """
+    Atomically reserve a range of order numbers for a store.
+
+    The counter document is seeded from the store's existing orders the first
+    time it is used, so numbering continues where the old scheme stopped.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+        count: How many consecutive numbers to reserve
+
+    Returns:
+        The last number of the reserved range
+    """
+    key = _order_counter_key(store_id)
+
+    while True:
+        counter = await db.counters.find_one_and_update(
+            {"_id": key},
+            {"$inc": {"seq": count}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if counter:
+            return counter["seq"]
+
+        # First allocation for this store: seed the counter once
+        seed = await _legacy_last_order_number(db, store_id)
+        try:
+            await db.counters.insert_one({"_id": key, "seq": seed})
+        except DuplicateKeyError:
+            # Another worker seeded it first
+            pass
+
+
+async def get_next_order_number(db, store_id: str) -> str:
+    """
+    Get the next order number for a store.
+
+    With ORDER_NUMBER_BLOCK_SIZE > 1 each worker reserves a block of numbers
+    and hands them out locally, so a hot store only touches the counter once
+    per block. Numbers stay unique but may have gaps after a restart.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+
+    Returns:
+        Order number as a string
+    """
+    block_size = max(settings.ORDER_NUMBER_BLOCK_SIZE, 1)
+
+    if block_size == 1:
+        return str(await allocate_sequence(db, store_id))
+
+    key = _order_counter_key(store_id)
+    lock = _block_locks.setdefault(key, asyncio.Lock())
+
+    async with lock:
+        next_number, last_number = _blocks.get(key, (1, 0))
+
+        if next_number > last_number:
+            last_number = await allocate_sequence(db, store_id, block_size)
+            next_number = last_number - block_size + 1
+
+        _blocks[key] = (next_number + 1, last_number)
+
+    return str(next_number)
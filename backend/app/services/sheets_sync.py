@@ -2,14 +2,35 @@
 
 import re
 import json
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from app.core.config import settings
+from app.core.executors import run_in_thread_pool
+from app.core.ratelimit import create_shared_rate_limit
+from app.services.image_mirror import (
+    apply_mirrored_urls,
+    is_image_mirroring_enabled,
+    lookup_mirrored_urls,
+    product_image_sources,
+)
+from app.services.image_variants import product_image_variants
+from app.services.product_rows import (
+    DEFAULT_COLUMN_MAP,
+    ROW_SOURCE_FIELDS,
+    build_column_map,
+    column_map_fingerprint,
+    format_row_problems,
+    parse_product_rows,
+)
 
 
 def parse_sheet_url(url: str) -> Optional[str]:
@@ -39,43 +60,165 @@ def parse_sheet_url(url: str) -> Optional[str]:
     return None
 
 
-def get_sheets_service():
+# Service-account credentials are parsed once per process. Discovery clients
+# are not thread-safe (httplib2), so each sheets worker thread keeps its own.
+_credentials = None
+_credentials_lock = threading.Lock()
+_thread_local = threading.local()
+
+SHEETS_POOL = "sheets"
+
+# Paces every Sheets/Drive API call across all workers to stay under quota
+sheets_quota = create_shared_rate_limit(
+    "sheets_api",
+    limit=settings.SHEETS_API_RATE_PER_MINUTE,
+    window_seconds=60,
+    burst=settings.SHEETS_API_BURST,
+)
+
+
+def get_sheets_credentials():
     """
-    Create and return Google Sheets API service.
+    Get the cached service-account credentials.
 
     Returns:
-        Google Sheets API service instance
+        google.oauth2 service account Credentials
 
     Raises:
-        ValueError: If GOOGLE_SERVICE_ACCOUNT_JSON is not configured
+        ValueError: If GOOGLE_SERVICE_ACCOUNT_JSON is missing or invalid
     """
+    global _credentials
+
+    if _credentials is not None:
+        return _credentials
+
     if not settings.GOOGLE_SERVICE_ACCOUNT_JSON:
         raise ValueError("GOOGLE_SERVICE_ACCOUNT_JSON not configured")
 
-    try:
-        # Parse service account JSON
-        service_account_info = json.loads(settings.GOOGLE_SERVICE_ACCOUNT_JSON)
+    with _credentials_lock:
+        if _credentials is None:
+            try:
+                # Parse service account JSON
+                service_account_info = json.loads(settings.GOOGLE_SERVICE_ACCOUNT_JSON)
 
-        # Create credentials
-        credentials = service_account.Credentials.from_service_account_info(
-            service_account_info,
-            scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
-        )
+                # Create credentials
+                _credentials = service_account.Credentials.from_service_account_info(
+                    service_account_info,
+                    scopes=[
+                        'https://www.googleapis.com/auth/spreadsheets.readonly',
+                        'https://www.googleapis.com/auth/drive.metadata.readonly',
+                    ]
+                )
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid GOOGLE_SERVICE_ACCOUNT_JSON format: {str(e)}")
+            except Exception as e:
+                raise ValueError(f"Failed to load Google service account: {str(e)}")
+
+    return _credentials
+
+
+def get_sheets_service():
+    """
+    Get the Google Sheets API service for the current thread.
+
+    The client is built once per thread and reused; credentials are shared.
+
+    Returns:
+        Google Sheets API service instance
 
-        # Build and return service
-        service = build('sheets', 'v4', credentials=credentials)
+    Raises:
+        ValueError: If GOOGLE_SERVICE_ACCOUNT_JSON is not configured
+    """
+    service = getattr(_thread_local, "service", None)
+    if service is not None:
         return service
 
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid GOOGLE_SERVICE_ACCOUNT_JSON format: {str(e)}")
+    credentials = get_sheets_credentials()
+
+    try:
+        service = build('sheets', 'v4', credentials=credentials, cache_discovery=False)
     except Exception as e:
         raise ValueError(f"Failed to create Google Sheets service: {str(e)}")
 
+    _thread_local.service = service
+    return service
+
+
+def get_drive_service():
+    """
+    Get the Google Drive API service for the current thread.
+
+    Only used to read file metadata (the sheet's revision).
+
+    Returns:
+        Google Drive API service instance
+    """
+    service = getattr(_thread_local, "drive_service", None)
+    if service is not None:
+        return service
+
+    service = build('drive', 'v3', credentials=get_sheets_credentials(), cache_discovery=False)
+    _thread_local.drive_service = service
+    return service
+
+
+def _fetch_sheet_version(sheet_id: str) -> Optional[str]:
+    """Blocking Drive API call; runs on the sheets thread pool."""
+    result = get_drive_service().files().get(
+        fileId=sheet_id,
+        fields='version',
+        supportsAllDrives=True,
+    ).execute()
+    return result.get('version')
+
+
+async def fetch_sheet_revision(sheet_id: str) -> Optional[str]:
+    """
+    Get the sheet's current Drive revision without downloading its values.
+
+    Args:
+        sheet_id: Google Sheet ID
+
+    Returns:
+        Revision string that changes on every edit, or None if it cannot be
+        read (e.g. the Drive API is not enabled for the service account)
+    """
+    try:
+        await sheets_quota.acquire()
+        version = await run_in_thread_pool(
+            SHEETS_POOL,
+            settings.SHEETS_MAX_WORKERS,
+            _fetch_sheet_version,
+            sheet_id,
+        )
+    except Exception:
+        return None
+
+    return f"{sheet_id}:{version}" if version else None
+
+
+def _fetch_sheet_values(sheet_id: str, range_name: str) -> List[List[str]]:
+    """Blocking Sheets API call; runs on the sheets thread pool."""
+    service = get_sheets_service()
+
+    # Call the Sheets API
+    sheet = service.spreadsheets()
+    result = sheet.values().get(
+        spreadsheetId=sheet_id,
+        range=range_name
+    ).execute()
+
+    return result.get('values', [])
+
 
 async def fetch_sheet_data(sheet_id: str, range_name: str = "Sheet1") -> List[List[str]]:
     """
     Fetch data from Google Sheet using Sheets API v4.
 
+    The blocking API call runs on a bounded thread pool (SHEETS_MAX_WORKERS)
+    so the event loop keeps serving other requests meanwhile, and is paced
+    by the shared sheets_api rate limit (SHEETS_API_RATE_PER_MINUTE).
+
     Args:
         sheet_id: Google Sheet ID
         range_name: Sheet range to fetch (default: Sheet1)
@@ -88,16 +231,14 @@ async def fetch_sheet_data(sheet_id: str, range_name: str = "Sheet1") -> List[Li
         ValueError: If sheet is empty or invalid
     """
     try:
-        service = get_sheets_service()
-
-        # Call the Sheets API
-        sheet = service.spreadsheets()
-        result = sheet.values().get(
-            spreadsheetId=sheet_id,
-            range=range_name
-        ).execute()
-
-        values = result.get('values', [])
+        await sheets_quota.acquire()
+        values = await run_in_thread_pool(
+            SHEETS_POOL,
+            settings.SHEETS_MAX_WORKERS,
+            _fetch_sheet_values,
+            sheet_id,
+            range_name,
+        )
 
         if not values:
             raise ValueError("Sheet is empty")
@@ -109,11 +250,16 @@ async def fetch_sheet_data(sheet_id: str, range_name: str = "Sheet1") -> List[Li
         raise HttpError(e.resp, e.content, uri=e.uri) from e
 
 
-def validate_product_row(row: List[str], row_index: int) -> Tuple[bool, Optional[str], Optional[Dict]]:
+def validate_product_row(
+    row: List[str],
+    row_index: int,
+    column_map: Optional[Dict[str, int]] = None,
+) -> Tuple[bool, Optional[str], Optional[Dict]]:
     """
-    Validate a product row from the sheet.
+    Validate a single product row from the sheet.
 
-    Expected columns (case-insensitive headers):
+    Columns are located through `column_map` (see build_column_map); without
+    one the legacy fixed order is assumed:
     - Name (required)
     - Price (required)
     - Category (optional)
@@ -125,80 +271,260 @@ def validate_product_row(row: List[str], row_index: int) -> Tuple[bool, Optional
     - Stock (optional, -1 for unlimited)
     - Thumbnail URL (optional)
 
+    Whole sheets should go through parse_product_rows instead, which does
+    the same checks column by column.
+
     Args:
         row: List of cell values from the sheet
         row_index: Row index (for tracking)
+        column_map: Optional field -> column index map
 
     Returns:
         Tuple of (is_valid, error_message, product_data)
     """
     # Skip if row is completely empty
-    if not row or all(cell.strip() == "" for cell in row):
+    if not row or all(str(cell).strip() == "" for cell in row):
         return False, "Empty row", None
 
-    # Ensure we have at least 2 columns (Name and Price)
-    if len(row) < 2:
-        return False, "Row must have at least Name and Price columns", None
+    products, problems = parse_product_rows(
+        [row], [row_index], column_map or DEFAULT_COLUMN_MAP
+    )
+    if products:
+        return True, None, products[0]
 
-    # Extract and validate required fields
-    name = row[0].strip() if len(row) > 0 else ""
-    price_str = row[1].strip() if len(row) > 1 else ""
+    message, [(_, value)] = next(iter(problems.items()))
+    if message == "Invalid price format":
+        message = f"{message}: {value}"
+    return False, message, None
 
-    if not name:
-        return False, "Name is required", None
 
-    if not price_str:
-        return False, "Price is required", None
+def product_content_hash(product_data: Dict) -> str:
+    """
+    Fingerprint the sheet-sourced content of a product.
 
-    # Parse price
-    try:
-        price = float(price_str)
-        if price < 0:
-            return False, "Price must be non-negative", None
-    except ValueError:
-        return False, f"Invalid price format: {price_str}", None
-
-    # Extract optional fields
-    category = row[2].strip() if len(row) > 2 and row[2].strip() else None
-    description = row[3].strip() if len(row) > 3 and row[3].strip() else None
-
-    # Parse comma-separated lists
-    sizes = [s.strip() for s in row[4].split(",")] if len(row) > 4 and row[4].strip() else []
-    colors = [c.strip() for c in row[5].split(",")] if len(row) > 5 and row[5].strip() else []
-    tags = [t.strip() for t in row[6].split(",")] if len(row) > 6 and row[6].strip() else []
-
-    brand = row[7].strip() if len(row) > 7 and row[7].strip() else None
-
-    # Parse stock
-    stock = -1  # Default to unlimited
-    if len(row) > 8 and row[8].strip():
+    Args:
+        product_data: Product data as returned by validate_product_row
+
+    Returns:
+        Hex digest that changes whenever any synced field changes
+    """
+    payload = json.dumps(product_data, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _import_key(product_data: Dict) -> Tuple[str, str]:
+    """Match key of an imported row: its SKU, else its name within the store."""
+    if product_data.get("sku"):
+        return ("sku", product_data["sku"])
+    return ("name", product_data["name"])
+
+
+async def _find_existing_products(
+    db,
+    store_oid: ObjectId,
+    products_data: List[Dict],
+    source: str,
+    projection: Dict[str, int],
+) -> Dict[Any, Dict]:
+    """
+    Load the existing products for a batch of rows, in one round trip.
+
+    Sheet rows are keyed by their row number. File rows have no stable
+    position (the next file may be unrelated), so they are keyed by SKU,
+    falling back to the product name.
+    """
+    if source != "import":
+        row_field = ROW_SOURCE_FIELDS[source][0]
+        return {
+            product[row_field]: product
+            async for product in db.products.find(
+                {
+                    "store_id": store_oid,
+                    row_field: {"$in": [p.get(row_field) for p in products_data]},
+                },
+                projection,
+            )
+        }
+
+    keys = [_import_key(product_data) for product_data in products_data]
+    existing: Dict[Any, Dict] = {}
+    async for product in db.products.find(
+        {
+            "store_id": store_oid,
+            "$or": [
+                {"sku": {"$in": [value for field, value in keys if field == "sku"]}},
+                {"name": {"$in": [value for field, value in keys if field == "name"]}},
+            ],
+        },
+        {**projection, "sku": 1, "name": 1},
+    ):
+        if product.get("sku"):
+            existing.setdefault(("sku", product["sku"]), product)
+        existing.setdefault(("name", product["name"]), product)
+    return existing
+
+
+async def _bulk_upsert_products(
+    db,
+    store_id: str,
+    products_data: List[Dict],
+    source: str = "sheet",
+    row_hashes: Optional[Dict[int, str]] = None,
+    max_new_products: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Diff rows against existing products and write the changes in one bulk_write.
+
+    Sheet rows are matched on their row number, imported rows on SKU or
+    name (see _find_existing_products), and only products last written by
+    that same source are updated.
+
+    Args:
+        db: Database instance
+        store_id: Store ID
+        products_data: Parsed rows, from parse_product_rows
+        source: "sheet" or "import"
+        row_hashes: Optional raw row fingerprints by row number (see
+            row_content_hash), stored as sheet_row_hash on every product
+            whose row was processed, written or not
+        max_new_products: Optional number of new products that may still be
+            created (the store's product limit); further new rows are skipped
+
+    Returns:
+        Dictionary with synced (rows written), unchanged (rows whose content
+        hash matched), skipped (manual edits and failed writes) and errors
+    """
+    products_synced = 0
+    products_unchanged = 0
+    products_skipped = 0
+    errors = []
+
+    if not products_data:
+        return {
+            "synced": 0,
+            "unchanged": 0,
+            "skipped": 0,
+            "errors": errors,
+        }
+
+    store_oid = ObjectId(store_id)
+    row_field, hash_field = ROW_SOURCE_FIELDS[source]
+
+    existing_products = await _find_existing_products(
+        db,
+        store_oid,
+        products_data,
+        source,
+        {"_id": 1, row_field: 1, "last_updated_source": 1, hash_field: 1, "sheet_row_hash": 1},
+    )
+
+    # CDN copies of external sheet images; unseen URLs are queued for mirroring
+    mirrored = {}
+    if is_image_mirroring_enabled():
+        mirrored = await lookup_mirrored_urls(
+            db,
+            store_id,
+            (url for product in products_data for url in product_image_sources(product)),
+        )
+
+    now = datetime.utcnow()
+    operations = []
+    operation_rows = []
+    # Products kept as they are whose row fingerprint is new (e.g. columns
+    # moved); written after the product operations and not counted as synced
+    fingerprint_operations = []
+    seen_rows: Dict[Any, int] = {}
+    over_limit = 0
+
+    for product_data in products_data:
+        row_index = product_data.get(row_field)
+        key = _import_key(product_data) if source == "import" else row_index
+        if key in seen_rows:
+            products_skipped += 1
+            errors.append(f"Row {row_index}: same product as row {seen_rows[key]}")
+            continue
+        seen_rows[key] = row_index
+
+        content_hash = product_content_hash(product_data)
+        existing_product = existing_products.get(key)
+        # Hash the sheet's URLs, store the mirrored ones
+        document = {**product_data, **apply_mirrored_urls(product_data, mirrored)}
+        fingerprint = {"sheet_row_hash": row_hashes[row_index]} if row_hashes else {}
+
+        if existing_product:
+            if existing_product.get("last_updated_source") != source:
+                # Only update rows this source wrote last (don't override manual changes)
+                products_skipped += 1
+            elif existing_product.get(hash_field) == content_hash:
+                # Unchanged since the last sync
+                products_unchanged += 1
+            else:
+                operations.append(UpdateOne(
+                    {"_id": existing_product["_id"]},
+                    {"$set": {
+                        **document,
+                        "image_variants": product_image_variants(document),
+                        hash_field: content_hash,
+                        **fingerprint,
+                        "updated_at": now,
+                    }},
+                ))
+                operation_rows.append(row_index)
+                continue
+
+            # Kept as it is; still remember the row so the next sync skips it
+            if fingerprint and existing_product.get("sheet_row_hash") != fingerprint["sheet_row_hash"]:
+                fingerprint_operations.append(
+                    UpdateOne({"_id": existing_product["_id"]}, {"$set": fingerprint})
+                )
+            continue
+
+        if max_new_products is not None and max_new_products <= 0:
+            over_limit += 1
+            continue
+        if max_new_products is not None:
+            max_new_products -= 1
+
+        operations.append(InsertOne({
+            "store_id": store_oid,
+            **document,
+            "image_variants": product_image_variants(document),
+            hash_field: content_hash,
+            **fingerprint,
+            "created_at": now,
+            "updated_at": now,
+        }))
+        operation_rows.append(row_index)
+
+    if over_limit:
+        products_skipped += over_limit
+        errors.append(f"Product limit reached: {over_limit} new product(s) not created")
+
+    if operations or fingerprint_operations:
         try:
-            stock = int(row[8].strip())
-        except ValueError:
-            stock = -1
-
-    thumbnail_url = row[9].strip() if len(row) > 9 and row[9].strip() else None
-
-    # Build product data
-    product_data = {
-        "name": name,
-        "price": price,
-        "category": category,
-        "description": description,
-        "sizes": sizes,
-        "colors": colors,
-        "tags": tags,
-        "brand": brand,
-        "stock": stock,
-        "thumbnail_url": thumbnail_url,
-        "image_urls": [thumbnail_url] if thumbnail_url else [],
-        "sheet_row_index": row_index,
-        "availability": "show",
-        "last_updated_source": "sheet",
+            await db.products.bulk_write(operations + fingerprint_operations, ordered=False)
+            products_synced += len(operations)
+
+        except BulkWriteError as e:
+            # A failed fingerprint write only means the row is re-checked
+            # next sync; failed product writes are reported
+            failed = [
+                write_error for write_error in e.details.get("writeErrors", [])
+                if write_error["index"] < len(operations)
+            ]
+            for write_error in failed:
+                row = operation_rows[write_error["index"]]
+                errors.append(f"Row {row}: {write_error.get('errmsg', 'write failed')}")
+            products_synced += len(operations) - len(failed)
+            products_skipped += len(failed)
+
+    return {
+        "synced": products_synced,
+        "unchanged": products_unchanged,
+        "skipped": products_skipped,
+        "errors": errors,
     }
 
-    return True, None, product_data
-
 
 async def upsert_products(
     db,
@@ -208,6 +534,10 @@ async def upsert_products(
     """
     Upsert products into the database (match by sheet_row_index).
 
+    Loads the existing products for these rows in one query, diffs them in
+    memory by content hash and writes only new or changed rows in a single
+    bulk_write. Rows whose hash is unchanged count as synced without a write.
+
     Args:
         db: Database instance
         store_id: Store ID
@@ -216,55 +546,50 @@ async def upsert_products(
     Returns:
         Tuple of (products_synced, products_skipped, errors)
     """
-    products_synced = 0
-    products_skipped = 0
-    errors = []
+    result = await _bulk_upsert_products(db, store_id, products_data)
+    return (
+        result["synced"] + result["unchanged"],
+        result["skipped"],
+        result["errors"],
+    )
 
-    for product_data in products_data:
-        try:
-            sheet_row_index = product_data.get("sheet_row_index")
-
-            # Check if product exists with this sheet_row_index
-            existing_product = await db.products.find_one({
-                "store_id": ObjectId(store_id),
-                "sheet_row_index": sheet_row_index,
-            })
-
-            if existing_product:
-                # Update existing product
-                # Only update if last_updated_source is 'sheet' (don't override manual changes)
-                if existing_product.get("last_updated_source") == "sheet":
-                    update_data = {
-                        **product_data,
-                        "updated_at": datetime.utcnow(),
-                    }
-
-                    await db.products.update_one(
-                        {"_id": existing_product["_id"]},
-                        {"$set": update_data}
-                    )
-                    products_synced += 1
-                else:
-                    # Skip products that were manually edited
-                    products_skipped += 1
-            else:
-                # Create new product
-                product_doc = {
-                    "store_id": ObjectId(store_id),
-                    **product_data,
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow(),
-                }
 
-                await db.products.insert_one(product_doc)
-                products_synced += 1
+def row_content_hash(row: List[str], salt: str = "") -> str:
+    """
+    Fingerprint a raw sheet row (before validation).
 
-        except Exception as e:
-            error_msg = f"Row {product_data.get('sheet_row_index', '?')}: {str(e)}"
-            errors.append(error_msg)
-            products_skipped += 1
+    Pass the column map fingerprint as `salt` so that moving or renaming
+    columns changes every row hash.
+    """
+    return hashlib.sha1(json.dumps([salt, row]).encode("utf-8")).hexdigest()
 
-    return products_synced, products_skipped, errors
+
+async def _finish_unchanged_sync(
+    db,
+    store_id: str,
+    revision: Optional[str],
+) -> Dict:
+    """Record a sync that found nothing to do."""
+    products_unchanged = await db.products.count_documents(
+        {"store_id": ObjectId(store_id), "sheet_row_index": {"$ne": None}}
+    )
+
+    update = {
+        "sheets_config.sync_status": "idle",
+        "sheets_config.last_synced_at": datetime.utcnow(),
+    }
+    if revision:
+        update["sheets_config.last_revision"] = revision
+
+    await db.stores.update_one({"_id": ObjectId(store_id)}, {"$set": update})
+
+    return {
+        "success": True,
+        "products_synced": 0,
+        "products_skipped": 0,
+        "products_unchanged": products_unchanged,
+        "errors": [],
+    }
 
 
 async def sync_products_from_sheet(
@@ -272,63 +597,132 @@ async def sync_products_from_sheet(
     store_id: str,
     sheet_id: str,
     range_name: str = "Sheet1",
+    force: bool = False,
+    progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
 ) -> Dict:
     """
     Main function to sync products from Google Sheet.
 
+    Syncs are incremental: if the sheet's Drive revision (or, failing that,
+    the hash of its values) matches the last sync, nothing is parsed or
+    written; otherwise only rows whose raw content hash changed are
+    validated and upserted. Sheet-level fingerprints live in the store's
+    sheets_config; row fingerprints live on the products (sheet_row_hash),
+    so a row whose product was deleted is re-created.
+    Columns are located by their header names (see build_column_map).
+
     Args:
         db: Database instance
         store_id: Store ID
         sheet_id: Google Sheet ID
         range_name: Sheet range to sync (default: Sheet1)
+        force: Ignore fingerprints and re-sync every row
+        progress: Optional async callback called with (rows_processed,
+            rows_total) after each written batch
 
     Returns:
         Dictionary with sync results: {
             "success": bool,
             "products_synced": int,
             "products_skipped": int,
+            "products_unchanged": int,
             "errors": List[str]
         }
     """
     # Update sync status to 'syncing'
-    await db.stores.update_one(
+    store = await db.stores.find_one_and_update(
         {"_id": ObjectId(store_id)},
         {
             "$set": {
                 "sheets_config.sync_status": "syncing",
                 "sheets_config.sync_error": None,
             }
-        }
+        },
+        {
+            "sheets_config.last_revision": 1,
+            "sheets_config.content_hash": 1,
+        },
     )
+    sheets_config = {} if force else ((store or {}).get("sheets_config") or {})
 
     try:
+        # Cheap revision check before downloading the values
+        revision = await fetch_sheet_revision(sheet_id)
+        if revision and revision == sheets_config.get("last_revision"):
+            return await _finish_unchanged_sync(db, store_id, revision)
+
         # Fetch sheet data
         rows = await fetch_sheet_data(sheet_id, range_name)
 
-        # Skip header row (row 0)
+        content_hash = hashlib.sha1(
+            json.dumps([sheet_id, rows]).encode("utf-8")
+        ).hexdigest()
+        if content_hash == sheets_config.get("content_hash"):
+            return await _finish_unchanged_sync(db, store_id, revision)
+
+        # Row 0 is the header; it decides which column holds which field
+        column_map = build_column_map(rows[0])
+        header_salt = column_map_fingerprint(column_map)
+
         data_rows = rows[1:] if len(rows) > 1 else []
 
         if not data_rows:
             raise ValueError("No data rows found in sheet (only header)")
 
-        # Validate and parse products
-        valid_products = []
-        errors = []
+        # Fingerprints of rows whose products still exist
+        previous_hashes = {}
+        if not force:
+            previous_hashes = {
+                product["sheet_row_index"]: product.get("sheet_row_hash")
+                async for product in db.products.find(
+                    {"store_id": ObjectId(store_id), "sheet_row_index": {"$ne": None}},
+                    {"_id": 0, "sheet_row_index": 1, "sheet_row_hash": 1},
+                )
+            }
+        rows_unchanged = 0
+
+        changed_rows = []
+        changed_indices = []
+        changed_hashes = {}
 
         for idx, row in enumerate(data_rows, start=2):  # Start from row 2 (after header)
-            is_valid, error_msg, product_data = validate_product_row(row, idx)
+            row_hash = row_content_hash(row, header_salt)
+            if previous_hashes.get(idx) == row_hash:
+                # Row is exactly as it was at the last successful sync
+                rows_unchanged += 1
+                continue
+
+            changed_rows.append(row)
+            changed_indices.append(idx)
+            changed_hashes[idx] = row_hash
+
+        # Validate and parse the changed rows in one columnar pass
+        valid_products, problems = parse_product_rows(
+            changed_rows, changed_indices, column_map
+        )
+        errors = format_row_problems(problems)
 
-            if is_valid and product_data:
-                valid_products.append(product_data)
-            elif error_msg and error_msg != "Empty row":
-                errors.append(f"Row {idx}: {error_msg}")
+        # Upsert changed products in batches so progress can be reported
+        result = {"synced": 0, "unchanged": 0, "skipped": 0}
+        batch_size = settings.SHEETS_SYNC_BATCH_SIZE
+        rows_done = len(data_rows) - len(valid_products)
 
-        # Upsert products
-        products_synced, products_skipped, upsert_errors = await upsert_products(
-            db, store_id, valid_products
-        )
+        if progress:
+            await progress(rows_done, len(data_rows))
+
+        for start in range(0, len(valid_products), batch_size):
+            batch = valid_products[start:start + batch_size]
+            batch_result = await _bulk_upsert_products(
+                db, store_id, batch, row_hashes=changed_hashes
+            )
 
-        errors.extend(upsert_errors)
+            for key in ("synced", "unchanged", "skipped"):
+                result[key] += batch_result[key]
+            errors.extend(batch_result["errors"])
+
+            rows_done += len(batch)
+            if progress:
+                await progress(rows_done, len(data_rows))
 
         # Update sync status
         await db.stores.update_one(
@@ -338,14 +732,21 @@ async def sync_products_from_sheet(
                     "sheets_config.sync_status": "idle",
                     "sheets_config.last_synced_at": datetime.utcnow(),
                     "sheets_config.sync_error": "; ".join(errors) if errors else None,
-                }
+                    # Only trust sheet-level fingerprints when every row is
+                    # stored, so invalid rows are re-checked and re-reported
+                    "sheets_config.last_revision": None if errors else revision,
+                    "sheets_config.content_hash": None if errors else content_hash,
+                },
+                # Row fingerprints used to live here; they are on the products now
+                "$unset": {"sheets_config.row_hashes": ""},
             }
         )
 
         return {
             "success": True,
-            "products_synced": products_synced,
-            "products_skipped": products_skipped,
+            "products_synced": result["synced"],
+            "products_skipped": result["skipped"],
+            "products_unchanged": rows_unchanged + result["unchanged"],
             "errors": errors,
         }
 
@@ -366,5 +767,6 @@ async def sync_products_from_sheet(
             "success": False,
             "products_synced": 0,
             "products_skipped": 0,
+            "products_unchanged": 0,
             "errors": [error_msg],
         }
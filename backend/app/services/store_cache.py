@@ -0,0 +1,50 @@
+"""Store Cache Service for fast storefront store-by-slug lookups."""
+
+from typing import Dict, Optional
+
+from app.core.cache import create_cache
+from app.core.config import settings
+
+
+store_cache = create_cache(
+    "stores_by_slug",
+    maxsize=settings.STORE_CACHE_MAX_SIZE,
+    ttl=settings.STORE_CACHE_TTL_SECONDS,
+)
+
+
+async def get_store_by_slug(db, slug: str) -> Optional[Dict]:
+    """
+    Get a store by slug, serving repeat lookups from the in-process cache.
+
+    The returned document is shared with other requests and must be treated
+    as read-only.
+
+    Args:
+        db: Database instance
+        slug: Store slug
+
+    Returns:
+        Store document, or None if no store has this slug
+    """
+    store = store_cache.get(slug)
+    if store is not None:
+        return store
+
+    # Legacy per-row sheet fingerprints can be large and are never needed here
+    store = await db.stores.find_one({"slug": slug}, {"sheets_config.row_hashes": 0})
+    if store:
+        store_cache.set(slug, store)
+
+    return store
+
+
+def invalidate_store(store: Dict) -> None:
+    """
+    Drop a store from the cache after it was updated or deleted.
+
+    Args:
+        store: Store document (only the slug is used)
+    """
+    if store and store.get("slug"):
+        store_cache.invalidate(store["slug"])
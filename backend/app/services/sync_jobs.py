@@ -0,0 +1,320 @@
+"""Sync Jobs Service for running sheet syncs and file imports in the background."""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from datetime import datetime
+from bson import ObjectId
+
+from app.core.config import settings
+from app.services.product_import import import_products_from_file, remove_spooled_file
+from app.services.sheets_sync import sync_products_from_sheet
+
+
+class SyncJobConflictError(ValueError):
+    """Raised when a job cannot be queued because a conflicting one exists."""
+
+
+class SyncJob:
+    """A queued or running sheet sync or file import for one store."""
+
+    def __init__(
+        self,
+        store_id: str,
+        sheet_id: Optional[str] = None,
+        force: bool = False,
+        source: str = "manual",
+        file_path: Optional[str] = None,
+        file_format: Optional[str] = None,
+    ):
+        self.id = str(uuid.uuid4())
+        self.store_id = store_id
+        self.sheet_id = sheet_id
+        self.force = force
+        self.source = source  # manual, scheduled or import
+        self.file_path = file_path
+        self.file_format = file_format
+        self.status = "queued"
+        self.done = asyncio.Event()
+
+    @property
+    def kind(self) -> str:
+        return "import" if self.file_path else "sheet"
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.store_id, self.kind)
+
+
+class SyncJobQueue:
+    """
+    Per-worker background queue for sheet syncs and file imports.
+
+    Workers run at most `concurrency` jobs at once and never two for the same
+    store. A job whose store is busy is parked in that store's pending list
+    instead of holding a worker, and requeued when the running job
+    finishes, so one slow store cannot take every worker. Repeated sync
+    requests for a store that already has a queued sync
+    are coalesced into it; a request that arrives while a sync is running
+    queues exactly one follow-up job so later sheet edits are not missed.
+    File imports are never coalesced: only one may be queued per store.
+    Status and progress are written to the store's sheets_config so any
+    worker can report them.
+    """
+
+    def __init__(self, concurrency: int = 2):
+        self.concurrency = concurrency
+
+        self._db = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+        self._queued: Dict[Tuple[str, str], SyncJob] = {}
+        self._running: Dict[str, SyncJob] = {}
+        # Jobs dequeued while their store was busy, in arrival order
+        self._pending: Dict[str, Deque[SyncJob]] = {}
+
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.jobs_coalesced = 0
+        self.rows_changed = 0
+        self.sync_seconds_total = 0.0
+        self.sync_seconds_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def enqueue(
+        self,
+        store_id: str,
+        sheet_id: str,
+        force: bool = False,
+        source: str = "manual",
+    ) -> Tuple[SyncJob, bool]:
+        """
+        Queue a sync for a store, reusing an already queued job if present.
+
+        Args:
+            store_id: Store ID
+            sheet_id: Google Sheet ID
+            force: Ignore incremental-sync fingerprints
+            source: Who asked for the sync (manual or scheduled)
+
+        Returns:
+            Tuple of (job, created) where created is False when the request
+            was coalesced into an existing job
+        """
+        existing = self._queued.get((store_id, "sheet"))
+        if existing:
+            existing.force = existing.force or force
+            self.jobs_coalesced += 1
+            return existing, False
+
+        job = SyncJob(store_id, sheet_id, force, source)
+        return await self._put(job), True
+
+    async def enqueue_import(self, store_id: str, file_path: str, file_format: str) -> SyncJob:
+        """
+        Queue an import of a spooled product file for a store.
+
+        The job owns the file and deletes it when it finishes.
+
+        Args:
+            store_id: Store ID
+            file_path: Path of the spooled upload
+            file_format: csv or xlsx
+
+        Raises:
+            SyncJobConflictError: If an import is already queued or running
+                for this store
+        """
+        running = self._running.get(store_id)
+        if (store_id, "import") in self._queued or (running and running.kind == "import"):
+            raise SyncJobConflictError("An import is already in progress for this store")
+
+        job = SyncJob(store_id, source="import", file_path=file_path, file_format=file_format)
+        return await self._put(job)
+
+    async def _put(self, job: SyncJob) -> SyncJob:
+        self._queued[job.key] = job
+        await self._set_job_state(
+            job, sync_status="queued", replace=True, source=job.source, queued_at=datetime.utcnow()
+        )
+        self._queue.put_nowait(job)
+        return job
+
+    async def _set_job_state(
+        self,
+        job: SyncJob,
+        sync_status: Optional[str] = None,
+        replace: bool = False,
+        **fields,
+    ) -> None:
+        """
+        Persist job state under sheets_config.sync_job.
+
+        With replace the whole subdocument is overwritten, so a new job does
+        not inherit fields (error, result, progress) from the previous one;
+        later transitions update individual fields.
+        """
+        job_state = {"id": job.id, "status": job.status, **fields}
+        if replace:
+            update: Dict[str, Any] = {"sheets_config.sync_job": job_state}
+        else:
+            update = {f"sheets_config.sync_job.{key}": value for key, value in job_state.items()}
+        if sync_status:
+            update["sheets_config.sync_status"] = sync_status
+
+        await self._db.stores.update_one({"_id": ObjectId(job.store_id)}, {"$set": update})
+
+    async def _run_job(self, job: SyncJob) -> None:
+        # The caller marked the store as running; from here on new requests
+        # queue a follow-up job
+        self._queued.pop(job.key, None)
+        job.status = "running"
+        await self._set_job_state(
+            job, started_at=datetime.utcnow(), processed=0, total=None
+        )
+
+        async def report_progress(processed: int, total: Optional[int]) -> None:
+            await self._set_job_state(job, processed=processed, total=total)
+
+        started = time.monotonic()
+        try:
+            if job.kind == "import":
+                result = await import_products_from_file(
+                    self._db,
+                    job.store_id,
+                    job.file_path,
+                    job.file_format,
+                    progress=report_progress,
+                )
+            else:
+                result = await sync_products_from_sheet(
+                    self._db,
+                    job.store_id,
+                    job.sheet_id,
+                    force=job.force,
+                    progress=report_progress,
+                )
+            job.status = "completed" if result["success"] else "failed"
+            duration = self._record_duration(started)
+            self.rows_changed += result["products_synced"]
+            await self._set_job_state(
+                job,
+                finished_at=datetime.utcnow(),
+                duration_seconds=duration,
+                products_synced=result["products_synced"],
+                products_skipped=result["products_skipped"],
+                products_unchanged=result.get("products_unchanged", 0),
+            )
+            if result["success"]:
+                self.jobs_completed += 1
+            else:
+                self.jobs_failed += 1
+
+        except Exception as e:
+            job.status = "failed"
+            self.jobs_failed += 1
+            await self._set_job_state(
+                job,
+                sync_status="error",
+                finished_at=datetime.utcnow(),
+                duration_seconds=self._record_duration(started),
+            )
+            await self._db.stores.update_one(
+                {"_id": ObjectId(job.store_id)},
+                {"$set": {"sheets_config.sync_error": str(e)}},
+            )
+
+        finally:
+            remove_spooled_file(job.file_path)
+            job.done.set()
+
+    def _record_duration(self, started: float) -> float:
+        duration = time.monotonic() - started
+        self.sync_seconds_total += duration
+        self.sync_seconds_max = max(self.sync_seconds_max, duration)
+        return round(duration, 3)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job.store_id in self._running:
+                # Park it rather than wait here while other stores queue up
+                self._pending.setdefault(job.store_id, deque()).append(job)
+                self._queue.task_done()
+                continue
+
+            self._running[job.store_id] = job
+            try:
+                await self._run_job(job)
+            except Exception as e:
+                print(f"Error running sync job {job.id}: {str(e)}")
+            finally:
+                self._running.pop(job.store_id, None)
+                self._release_pending(job.store_id)
+                self._queue.task_done()
+
+    def _release_pending(self, store_id: str) -> None:
+        """Requeue the next job parked for a store that just became free."""
+        pending = self._pending.get(store_id)
+        if not pending:
+            return
+        self._queue.put_nowait(pending.popleft())
+        if not pending:
+            del self._pending[store_id]
+
+    def start(self, db) -> None:
+        """Start the worker tasks (called from the app lifespan)."""
+        self._db = db
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel workers; interrupted and pending jobs are marked failed."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for job in list(self._running.values()) + list(self._queued.values()):
+            job.status = "failed"
+            try:
+                await self._set_job_state(job, sync_status="error", finished_at=datetime.utcnow())
+                await self._db.stores.update_one(
+                    {"_id": ObjectId(job.store_id)},
+                    {"$set": {"sheets_config.sync_error": "Sync interrupted by server restart"}},
+                )
+            except Exception:
+                pass
+            remove_spooled_file(job.file_path)
+            job.done.set()
+
+        self._running.clear()
+        self._queued.clear()
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue counters and sync duration/row metrics for monitoring."""
+        finished = self.jobs_completed + self.jobs_failed
+        return {
+            "concurrency": self.concurrency,
+            "queued": len(self._queued),
+            "running": len(self._running),
+            "waiting_for_store": sum(len(jobs) for jobs in self._pending.values()),
+            "completed": self.jobs_completed,
+            "failed": self.jobs_failed,
+            "coalesced": self.jobs_coalesced,
+            "rows_changed": self.rows_changed,
+            "sync_seconds_total": round(self.sync_seconds_total, 3),
+            "sync_seconds_avg": round(self.sync_seconds_total / finished, 3) if finished else 0.0,
+            "sync_seconds_max": round(self.sync_seconds_max, 3),
+        }
+
+
+sync_queue = SyncJobQueue(concurrency=settings.SHEETS_SYNC_CONCURRENCY)
@@ -0,0 +1,172 @@
+"""Sync Scheduler Service for periodic sheet syncs across all stores."""
+
+import asyncio
+import random
+from typing import Any, Dict, Optional, Set
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.services.sync_jobs import SyncJob, sync_queue
+
+
+class SheetSyncScheduler:
+    """
+    Periodically queues a sheet sync for every store with a sheet_id.
+
+    Each store carries its own `sheets_config.next_sync_at`. Stores seen for
+    the first time get a random slot within one interval, and every claim
+    pushes the next slot out by the interval plus random jitter, so stores
+    stay spread out instead of all coming due at once. Claims are atomic, so
+    with several uvicorn workers each due store is picked up by exactly one.
+
+    Jobs go through the shared sync queue (which runs sync_products_from_sheet
+    and coalesces with manual syncs); at most `max_in_flight` scheduled jobs
+    per worker are queued or running at a time so merchant-triggered syncs
+    are never stuck behind a backlog. Sheets API calls are paced by the
+    sheets_api rate limit, which is shared by all workers.
+    """
+
+    def __init__(
+        self,
+        interval: float = 3600.0,
+        jitter: float = 300.0,
+        tick: float = 30.0,
+        max_in_flight: int = 2,
+    ):
+        self.interval = interval
+        self.jitter = jitter
+        self.tick = tick
+        self.max_in_flight = max_in_flight
+
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Set[SyncJob] = set()
+
+        self.ticks = 0
+        self.stores_seeded = 0
+        self.jobs_scheduled = 0
+        self.jobs_coalesced = 0
+        self.tick_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def _next_slot(self, now: datetime) -> datetime:
+        return now + timedelta(seconds=self.interval + random.uniform(0, self.jitter))
+
+    async def _seed_new_stores(self, now: datetime) -> int:
+        """Give stores without a schedule a random first slot within one interval."""
+        result = await self._db.stores.update_many(
+            {
+                "sheets_config.sheet_id": {"$nin": [None, ""]},
+                "sheets_config.next_sync_at": None,
+            },
+            [
+                {
+                    "$set": {
+                        "sheets_config.next_sync_at": {
+                            "$add": [
+                                now,
+                                {"$multiply": [{"$rand": {}}, self.interval * 1000]},
+                            ]
+                        }
+                    }
+                }
+            ],
+        )
+        return result.modified_count
+
+    async def _claim_due_store(self, now: datetime) -> Optional[Dict]:
+        """Atomically take the most overdue store and book its next slot."""
+        return await self._db.stores.find_one_and_update(
+            {
+                "sheets_config.sheet_id": {"$nin": [None, ""]},
+                "sheets_config.next_sync_at": {"$lte": now},
+            },
+            {"$set": {"sheets_config.next_sync_at": self._next_slot(now)}},
+            projection={"sheets_config.sheet_id": 1},
+            sort=[("sheets_config.next_sync_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def run_once(self) -> int:
+        """
+        Queue syncs for due stores, up to the free in-flight capacity.
+
+        Returns:
+            Number of stores claimed in this pass
+        """
+        self._in_flight = {job for job in self._in_flight if not job.done.is_set()}
+
+        now = datetime.utcnow()
+        self.stores_seeded += await self._seed_new_stores(now)
+
+        claimed = 0
+        while len(self._in_flight) < self.max_in_flight:
+            store = await self._claim_due_store(now)
+            if not store:
+                break
+
+            claimed += 1
+            job, created = await sync_queue.enqueue(
+                str(store["_id"]),
+                store["sheets_config"]["sheet_id"],
+                source="scheduled",
+            )
+            if created:
+                self.jobs_scheduled += 1
+                self._in_flight.add(job)
+            else:
+                # A manual sync is already queued for this store
+                self.jobs_coalesced += 1
+
+        return claimed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.ticks += 1
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.tick_errors += 1
+                print(f"Error scheduling sheet syncs: {str(e)}")
+            await asyncio.sleep(self.tick)
+
+    def start(self, db) -> None:
+        """Start the scheduler loop (called from the app lifespan)."""
+        self._db = db
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop claiming stores; already queued jobs are left to the sync queue."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._in_flight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Scheduler counters for monitoring."""
+        return {
+            "enabled": self.running,
+            "interval_seconds": self.interval,
+            "in_flight": sum(1 for job in self._in_flight if not job.done.is_set()),
+            "max_in_flight": self.max_in_flight,
+            "ticks": self.ticks,
+            "stores_seeded": self.stores_seeded,
+            "scheduled": self.jobs_scheduled,
+            "coalesced": self.jobs_coalesced,
+            "tick_errors": self.tick_errors,
+        }
+
+
+sync_scheduler = SheetSyncScheduler(
+    interval=settings.SHEETS_SYNC_INTERVAL_MINUTES * 60,
+    jitter=settings.SHEETS_SYNC_JITTER_SECONDS,
+    tick=settings.SHEETS_SCHEDULER_TICK_SECONDS,
+    max_in_flight=settings.SHEETS_SCHEDULER_MAX_IN_FLIGHT,
+)
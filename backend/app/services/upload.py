@@ -1,13 +1,31 @@
 """Image Upload Service using Cloudinary for cloud storage."""
 
+import asyncio
+import hashlib
+import io
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
-from typing import Dict, Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO, Sequence, Tuple
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ReturnDocument
 import os
 import uuid
 
 from app.core.config import settings
+from app.core.database import get_database
+from app.core.executors import run_in_thread_pool
+from app.services.image_processing import is_image_processing_available, preprocess_image
+
+
+# The Cloudinary SDK is blocking; every call runs on this bounded pool
+CLOUDINARY_POOL = "cloudinary"
+
+# Upload result fields kept in the content-hash index
+_RESULT_FIELDS = ("url", "secure_url", "public_id", "format", "width", "height", "bytes")
+
+_dedup_stats = {"uploads": 0, "duplicates": 0, "bytes_skipped": 0}
 
 
 # Initialize Cloudinary
@@ -32,37 +50,14 @@ def is_cloudinary_configured() -> bool:
     ])
 
 
-def upload_image(
+def _upload_image(
     file: BinaryIO,
     folder: str = "mywabiz",
     resource_type: str = "image",
     public_id: Optional[str] = None,
     tags: Optional[list] = None,
 ) -> Dict[str, str]:
-    """
-    Upload image to Cloudinary and return URL.
-
-    Args:
-        file: File object or path to file
-        folder: Cloudinary folder to store image in
-        resource_type: Type of resource (image, video, raw, auto)
-        public_id: Optional custom public ID for the image
-        tags: Optional list of tags for the image
-
-    Returns:
-        Dictionary with:
-        - url: Public URL of uploaded image
-        - secure_url: HTTPS URL of uploaded image
-        - public_id: Cloudinary public ID
-        - format: Image format (jpg, png, etc.)
-        - width: Image width in pixels
-        - height: Image height in pixels
-        - bytes: File size in bytes
-
-    Raises:
-        ValueError: If Cloudinary is not configured
-        Exception: If upload fails
-    """
+    """Blocking Cloudinary upload; runs on the cloudinary thread pool."""
     if not is_cloudinary_configured():
         raise ValueError(
             "Cloudinary is not configured. Please set CLOUDINARY_CLOUD_NAME, "
@@ -101,7 +96,177 @@ def upload_image(
         raise Exception(f"Failed to upload image to Cloudinary: {str(e)}")
 
 
-def upload_logo(
+def _read_and_hash(file: BinaryIO) -> Tuple[bytes, str]:
+    """Blocking read + SHA-256 of an upload; runs on the cloudinary pool."""
+    data = file.read()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def _dedup_key(store_id: str, folder: str, kind: Optional[str], content_hash: str) -> Dict:
+    # Only identical bytes uploaded for the same purpose share an image
+    return {
+        "store_id": ObjectId(store_id),
+        "folder": folder,
+        "kind": kind,
+        "content_hash": content_hash,
+    }
+
+
+async def _find_uploaded_image(db, key: Dict) -> Optional[Dict]:
+    """Look up an earlier upload and take a reference to it."""
+    return await db.uploaded_images.find_one_and_update(key, {"$inc": {"refs": 1}})
+
+
+async def _record_uploaded_image(db, key: Dict, result: Dict) -> Dict:
+    """
+    Add an upload to the content-hash index with one reference.
+
+    Returns the indexed entry, which belongs to another upload if the same
+    bytes were uploaded concurrently; our copy is then deleted again.
+    """
+    entry = await db.uploaded_images.find_one_and_update(
+        key,
+        {
+            "$setOnInsert": {
+                **{field: result.get(field) for field in _RESULT_FIELDS},
+                "created_at": datetime.utcnow(),
+            },
+            "$inc": {"refs": 1},
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    if entry["public_id"] != result.get("public_id"):
+        try:
+            await delete_image(result["public_id"])
+        except Exception:
+            pass  # An orphaned copy only costs storage
+    return entry
+
+
+async def _release_uploaded_image(db, public_id: str) -> bool:
+    """
+    Drop one reference to an indexed upload.
+
+    Returns:
+        True if other uploads still reference the image, so it must be kept
+    """
+    images = db.uploaded_images
+    for _ in range(5):
+        if await images.find_one_and_update(
+            {"public_id": public_id, "refs": {"$gt": 1}}, {"$inc": {"refs": -1}}
+        ):
+            return True
+        # Last reference (entries from before reference counting have none)
+        if await images.find_one_and_delete(
+            {"public_id": public_id, "refs": {"$not": {"$gt": 1}}}
+        ):
+            return False
+        if not await images.find_one({"public_id": public_id}, {"_id": 1}):
+            return False  # Not in the index
+        # A reference was taken between the two updates; try again
+    return True
+
+
+async def upload_image(
+    file: BinaryIO,
+    folder: str = "mywabiz",
+    resource_type: str = "image",
+    public_id: Optional[str] = None,
+    tags: Optional[list] = None,
+    preprocess: bool = True,
+    store_id: Optional[str] = None,
+    kind: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Upload image to Cloudinary and return URL.
+
+    The blocking SDK call runs on a bounded thread pool (CLOUDINARY_MAX_WORKERS)
+    so an upload never stalls the event loop. Image file objects are first
+    downscaled, stripped of EXIF and re-encoded (see preprocess_image).
+
+    With a store_id and no explicit public_id, the original bytes are hashed
+    (SHA-256) and looked up in the uploaded_images index first, keyed by
+    store, folder and kind; a file already uploaded there is not processed
+    or uploaded again and the existing image is returned instead. Each
+    upload holds a reference, and delete_image only destroys an image once
+    its last reference is released.
+
+    Args:
+        file: File object or path to file
+        folder: Cloudinary folder to store image in
+        resource_type: Type of resource (image, video, raw, auto)
+        public_id: Optional custom public ID for the image (never deduplicated)
+        tags: Optional list of tags for the image
+        preprocess: Shrink the image locally before uploading
+        store_id: Optional store ID to deduplicate uploads within
+        kind: Optional image kind (logo, banner, product); prefixes the
+            generated public ID and scopes deduplication
+
+    Returns:
+        Dictionary with:
+        - url: Public URL of uploaded image
+        - secure_url: HTTPS URL of uploaded image
+        - public_id: Cloudinary public ID
+        - format: Image format (jpg, png, etc.)
+        - width: Image width in pixels
+        - height: Image height in pixels
+        - bytes: File size in bytes
+        - duplicate: True if an earlier upload was reused
+
+    Raises:
+        ValueError: If Cloudinary is not configured
+        Exception: If upload fails
+    """
+    dedup_key = None
+    is_image_file = resource_type == "image" and hasattr(file, "read")
+    preprocess = preprocess and is_image_file and is_image_processing_available()
+    dedup = is_image_file and store_id is not None and public_id is None
+
+    if public_id is None and kind:
+        public_id = f"{kind}_{uuid.uuid4()}"
+
+    if dedup or preprocess:
+        data, content_hash = await run_in_thread_pool(
+            CLOUDINARY_POOL, settings.CLOUDINARY_MAX_WORKERS, _read_and_hash, file
+        )
+
+        if dedup:
+            dedup_key = _dedup_key(store_id, folder, kind, content_hash)
+            existing = await _find_uploaded_image(get_database(), dedup_key)
+            if existing:
+                _dedup_stats["duplicates"] += 1
+                _dedup_stats["bytes_skipped"] += len(data)
+                return {
+                    **{field: existing.get(field) for field in _RESULT_FIELDS},
+                    "duplicate": True,
+                }
+
+        if preprocess:
+            data, _ = await preprocess_image(data)
+        file = io.BytesIO(data)
+
+    result = await run_in_thread_pool(
+        CLOUDINARY_POOL,
+        settings.CLOUDINARY_MAX_WORKERS,
+        _upload_image,
+        file,
+        folder=folder,
+        resource_type=resource_type,
+        public_id=public_id,
+        tags=tags,
+    )
+    _dedup_stats["uploads"] += 1
+
+    if dedup_key:
+        entry = await _record_uploaded_image(get_database(), dedup_key, result)
+        if entry["public_id"] != result["public_id"]:
+            return {**{field: entry.get(field) for field in _RESULT_FIELDS}, "duplicate": True}
+
+    return {**result, "duplicate": False}
+
+
+async def upload_logo(
     file: BinaryIO,
     store_id: str,
 ) -> str:
@@ -115,17 +280,18 @@ def upload_logo(
     Returns:
         Secure URL of uploaded logo
     """
-    result = upload_image(
+    result = await upload_image(
         file=file,
         folder=f"mywabiz/stores/{store_id}/branding",
-        public_id=f"logo_{uuid.uuid4()}",
+        kind="logo",
         tags=["logo", store_id],
+        store_id=store_id,
     )
 
     return result["secure_url"]
 
 
-def upload_banner(
+async def upload_banner(
     file: BinaryIO,
     store_id: str,
 ) -> str:
@@ -139,17 +305,30 @@ def upload_banner(
     Returns:
         Secure URL of uploaded banner
     """
-    result = upload_image(
+    result = await upload_image(
         file=file,
         folder=f"mywabiz/stores/{store_id}/branding",
-        public_id=f"banner_{uuid.uuid4()}",
+        kind="banner",
         tags=["banner", store_id],
+        store_id=store_id,
     )
 
     return result["secure_url"]
 
 
-def upload_product_image(
+def _product_upload_options(store_id: str, product_id: Optional[str]) -> Dict:
+    folder = f"mywabiz/stores/{store_id}/products"
+    if product_id:
+        folder = f"{folder}/{product_id}"
+
+    tags = ["product", store_id]
+    if product_id:
+        tags.append(product_id)
+
+    return {"folder": folder, "tags": tags, "store_id": store_id, "kind": "product"}
+
+
+async def upload_product_image(
     file: BinaryIO,
     store_id: str,
     product_id: Optional[str] = None,
@@ -165,28 +344,64 @@ def upload_product_image(
     Returns:
         Secure URL of uploaded product image
     """
-    folder = f"mywabiz/stores/{store_id}/products"
-    if product_id:
-        folder = f"{folder}/{product_id}"
+    result = await upload_image(file=file, **_product_upload_options(store_id, product_id))
 
-    tags = ["product", store_id]
-    if product_id:
-        tags.append(product_id)
+    return result["secure_url"]
 
-    result = upload_image(
-        file=file,
-        folder=folder,
-        public_id=f"product_{uuid.uuid4()}",
-        tags=tags,
+
+async def upload_product_images(
+    files: Sequence[BinaryIO],
+    store_id: str,
+    product_id: Optional[str] = None,
+) -> List[str]:
+    """
+    Upload several product images in parallel.
+
+    At most CLOUDINARY_UPLOAD_CONCURRENCY uploads of the batch run at once
+    (and never more than the pool allows across all batches). The batch is
+    all-or-nothing: if any upload fails, the images that did upload are
+    deleted again and the first error is raised.
+
+    Args:
+        files: File objects, in display order
+        store_id: Store ID for organizing uploads
+        product_id: Optional product ID for organizing uploads
+
+    Returns:
+        Secure URLs, in the same order as `files`
+    """
+    options = _product_upload_options(store_id, product_id)
+    semaphore = asyncio.Semaphore(settings.CLOUDINARY_UPLOAD_CONCURRENCY)
+
+    async def upload_one(file: BinaryIO) -> Dict[str, str]:
+        async with semaphore:
+            return await upload_image(file=file, **options)
+
+    results = await asyncio.gather(
+        *(upload_one(file) for file in files), return_exceptions=True
     )
 
-    return result["secure_url"]
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        # Releases our reference; reused images stay for their other owners
+        uploaded = [result for result in results if not isinstance(result, BaseException)]
+        await asyncio.gather(
+            *(delete_image(result["public_id"]) for result in uploaded),
+            return_exceptions=True,
+        )
+        raise errors[0]
 
+    return [result["secure_url"] for result in results]
 
-def delete_image(public_id: str) -> bool:
+
+async def delete_image(public_id: str) -> bool:
     """
     Delete an image from Cloudinary.
 
+    Images in the upload dedup index are reference counted: this releases
+    one reference and only destroys the image (and its index entry) once no
+    other upload uses it.
+
     Args:
         public_id: Cloudinary public ID of the image
 
@@ -201,14 +416,22 @@ def delete_image(public_id: str) -> bool:
         raise ValueError("Cloudinary is not configured")
 
     try:
-        result = cloudinary.uploader.destroy(public_id)
+        if await _release_uploaded_image(get_database(), public_id):
+            return True
+
+        result = await run_in_thread_pool(
+            CLOUDINARY_POOL,
+            settings.CLOUDINARY_MAX_WORKERS,
+            cloudinary.uploader.destroy,
+            public_id,
+        )
         return result.get("result") == "ok"
 
     except Exception as e:
         raise Exception(f"Failed to delete image from Cloudinary: {str(e)}")
 
 
-def get_image_info(public_id: str) -> Dict:
+async def get_image_info(public_id: str) -> Dict:
     """
     Get information about an uploaded image.
 
@@ -226,7 +449,12 @@ def get_image_info(public_id: str) -> Dict:
         raise ValueError("Cloudinary is not configured")
 
     try:
-        result = cloudinary.api.resource(public_id)
+        result = await run_in_thread_pool(
+            CLOUDINARY_POOL,
+            settings.CLOUDINARY_MAX_WORKERS,
+            cloudinary.api.resource,
+            public_id,
+        )
         return {
             "url": result.get("url"),
             "secure_url": result.get("secure_url"),
@@ -242,6 +470,11 @@ def get_image_info(public_id: str) -> Dict:
         raise Exception(f"Failed to get image info from Cloudinary: {str(e)}")
 
 
+def get_upload_stats() -> Dict[str, int]:
+    """Uploads sent vs. duplicates answered from the content-hash index."""
+    return dict(_dedup_stats)
+
+
 def generate_transformation_url(
     public_id: str,
     width: Optional[int] = None,
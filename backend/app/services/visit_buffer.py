@@ -0,0 +1,235 @@
+"""Visit Buffer Service for write-behind page-visit counting."""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+
+
+class VisitBuffer:
+    """
+    Coalesces page-visit counters in memory and flushes them in bulk.
+
+    Counters are aggregated per (store, day, page_type) and written as one
+    $inc upsert per (store, day) snapshot; visitor logs are batched into a
+    single insert_many. Memory is bounded: once a limit is hit the flusher is
+    woken early and further new entries are dropped (and counted) until it
+    catches up.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 5.0,
+        max_keys: int = 10000,
+        max_logs: int = 50000,
+    ):
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+        self.max_logs = max_logs
+
+        self._db = None
+        self._counters: Dict[Tuple[ObjectId, datetime, str], int] = {}
+        self._logs: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+        self.flushes = 0
+        self.flushed_visits = 0
+        self.flushed_logs = 0
+        self.dropped_visits = 0
+        self.dropped_logs = 0
+        self.flush_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def add(
+        self,
+        store_id: str,
+        page_type: str = "store",
+        visitor_info: Optional[Dict] = None,
+    ) -> bool:
+        """
+        Record a visit in memory.
+
+        Args:
+            store_id: Store ID
+            page_type: Type of page visited (store, product, order_tracking)
+            visitor_info: Optional visitor information (IP, user agent, etc.)
+
+        Returns:
+            False if the visit was dropped because the store ID is malformed
+            or the buffer is full
+        """
+        if not ObjectId.is_valid(store_id):
+            self.dropped_visits += 1
+            return False
+        store_oid = ObjectId(store_id)
+
+        now = datetime.utcnow()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        key = (store_oid, today, page_type)
+
+        if key not in self._counters and len(self._counters) >= self.max_keys:
+            self.dropped_visits += 1
+            self._wakeup.set()
+            return False
+
+        self._counters[key] = self._counters.get(key, 0) + 1
+
+        if visitor_info:
+            if len(self._logs) >= self.max_logs:
+                self.dropped_logs += 1
+            else:
+                self._logs.append({
+                    "store_id": store_oid,
+                    "page_type": page_type,
+                    "visitor_info": visitor_info,
+                    "timestamp": now,
+                })
+
+        if len(self._counters) >= self.max_keys or len(self._logs) >= self.max_logs:
+            self._wakeup.set()
+
+        return True
+
+    async def flush(self) -> int:
+        """
+        Write all buffered counters and visitor logs to the database.
+
+        Returns:
+            Number of visits flushed
+        """
+        if self._db is None or (not self._counters and not self._logs):
+            return 0
+
+        counters, self._counters = self._counters, {}
+        logs, self._logs = self._logs, []
+
+        # Page counts per daily snapshot; each snapshot is one $inc upsert
+        snapshots: Dict[Tuple[ObjectId, datetime], Dict[str, int]] = {}
+        for (store_oid, day, page_type), count in counters.items():
+            pages = snapshots.setdefault((store_oid, day), {})
+            pages[page_type] = pages.get(page_type, 0) + count
+
+        keys: List[Tuple[ObjectId, datetime]] = []
+        failed: List[Tuple[ObjectId, datetime]] = []
+
+        try:
+            operations = []
+            for (store_oid, day), pages in snapshots.items():
+                keys.append((store_oid, day))
+                inc = {f"visits.{page_type}": count for page_type, count in pages.items()}
+                inc["visits.total"] = sum(pages.values())
+                operations.append(UpdateOne(
+                    {"store_id": store_oid, "date": day},
+                    {
+                        "$inc": inc,
+                        "$setOnInsert": {
+                            "store_id": store_oid,
+                            "date": day,
+                            "created_at": datetime.utcnow(),
+                        },
+                        "$set": {"updated_at": datetime.utcnow()},
+                    },
+                    upsert=True,
+                ))
+            if operations:
+                await self._db.analytics_snapshots.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: only the snapshots listed in writeErrors were not written
+            failed = [keys[error["index"]] for error in e.details.get("writeErrors", [])]
+            self.flush_errors += 1
+            print(f"Error flushing page visits: {str(e)}")
+        except Exception as e:
+            failed = list(snapshots)
+            self.flush_errors += 1
+            print(f"Error flushing page visits: {str(e)}")
+
+        # Put failed counts back so the next flush retries them
+        for store_oid, day in failed:
+            for page_type, count in snapshots.pop((store_oid, day)).items():
+                key = (store_oid, day, page_type)
+                self._counters[key] = self._counters.get(key, 0) + count
+        visits = sum(sum(pages.values()) for pages in snapshots.values())
+
+        flushed_logs = 0
+        if logs:
+            try:
+                await self._db.visitor_logs.insert_many(logs, ordered=False)
+                flushed_logs = len(logs)
+            except BulkWriteError as e:
+                # Unordered: retry only the logs that were not inserted
+                failed_logs = [logs[error["index"]] for error in e.details.get("writeErrors", [])]
+                flushed_logs = len(logs) - len(failed_logs)
+                self._logs = (failed_logs + self._logs)[: self.max_logs]
+                self.flush_errors += 1
+                print(f"Error flushing visitor logs: {str(e)}")
+            except Exception as e:
+                self._logs = (logs + self._logs)[: self.max_logs]
+                self.flush_errors += 1
+                print(f"Error flushing visitor logs: {str(e)}")
+
+        self.flushes += 1
+        self.flushed_visits += visits
+        self.flushed_logs += flushed_logs
+        return visits
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep flushing on the next tick rather than losing the task
+                self.flush_errors += 1
+                print(f"Error in page visit flusher: {str(e)}")
+
+    def start(self, db) -> None:
+        """Start the periodic flusher (called from the app lifespan)."""
+        self._db = db
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out anything still buffered."""
+        if self._task:
+            # Let an in-flight flush finish instead of cancelling it
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer counters for monitoring."""
+        return {
+            "pending_keys": len(self._counters),
+            "pending_logs": len(self._logs),
+            "flushes": self.flushes,
+            "flushed_visits": self.flushed_visits,
+            "flushed_logs": self.flushed_logs,
+            "dropped_visits": self.dropped_visits,
+            "dropped_logs": self.dropped_logs,
+            "flush_errors": self.flush_errors,
+        }
+
+
+visit_buffer = VisitBuffer(
+    flush_interval=settings.VISIT_FLUSH_INTERVAL_SECONDS,
+    max_keys=settings.VISIT_BUFFER_MAX_KEYS,
+    max_logs=settings.VISIT_BUFFER_MAX_LOGS,
+)
@@ -0,0 +1,115 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from bson import ObjectId, json_util
+
+
+# Sort specs as used by pymongo: [(field, direction), ...]
+SortSpec = Sequence[Tuple[str, int]]
+
+
+def encode_cursor(document: Dict, sort: SortSpec) -> str:
+    """
+    Build an opaque cursor token pointing just after a document.
+
+    Args:
+        document: Last document of the current page
+        sort: Sort spec the page was read with (must end with _id)
+
+    Returns:
+        URL-safe cursor string
+    """
+    values = [document.get(field) for field, _ in sort]
+    raw = json_util.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _expected_types(field: str) -> Tuple[type, ...]:
+    """Value types a cursor may carry for a sort field."""
+    if field == "_id":
+        return (ObjectId,)
+    if field.endswith("_at"):
+        return (datetime,)
+    return (int, float, str)
+
+
+def _is_valid_cursor_value(field: str, value: Any) -> bool:
+    # Missing sort fields encode as null; bools are ints in Python
+    if value is None:
+        return field != "_id"
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, _expected_types(field))
+
+
+def decode_cursor(token: str, sort: SortSpec) -> List[Any]:
+    """
+    Decode a cursor token produced by encode_cursor.
+
+    Args:
+        token: Cursor string from the client
+        sort: Sort spec the cursor is used with
+
+    Returns:
+        List of sort key values
+
+    Raises:
+        ValueError: If the token is malformed or a value is not the type its
+            sort field expects (so a crafted cursor cannot smuggle operators
+            like {"$ne": ...} into keyset_filter)
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("Invalid cursor")
+
+    for (field, _), value in zip(sort, values):
+        if not _is_valid_cursor_value(field, value):
+            raise ValueError("Invalid cursor")
+
+    return values
+
+
+def keyset_filter(sort: SortSpec, values: Sequence[Any]) -> Dict:
+    """
+    Build a query that seeks past the given sort key values.
+
+    For sort [(a, -1), (_id, -1)] and values [x, y] this produces
+    {"$or": [{a: {"$lt": x}}, {a: x, _id: {"$lt": y}}]}, which an index on
+    the same keys answers with a seek instead of a skip.
+
+    Args:
+        sort: Sort spec of the listing
+        values: Sort key values decoded from the cursor
+
+    Returns:
+        MongoDB filter to merge into the listing query
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        op = "$gt" if direction == 1 else "$lt"
+        clause = {f: values[j] for j, (f, _) in enumerate(sort[:i])}
+        clause[field] = {op: values[i]}
+        clauses.append(clause)
+
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def next_cursor(documents: List[Dict], limit: int, sort: SortSpec) -> Optional[str]:
+    """
+    Cursor for the page after `documents`, or None on the last page.
+
+    Args:
+        documents: Documents of the current page
+        limit: Requested page size
+        sort: Sort spec the page was read with
+    """
+    if len(documents) < limit:
+        return None
+    return encode_cursor(documents[-1], sort)
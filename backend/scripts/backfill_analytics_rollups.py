@@ -0,0 +1,34 @@
+"""
+Backfill daily order rollups in analytics_snapshots from raw orders.
+
+Run once before setting ANALYTICS_SOURCE=rollups, or to repair a store's
+dashboard numbers.
+
+Usage (from backend/):
+    python -m scripts.backfill_analytics_rollups            # all stores
+    python -m scripts.backfill_analytics_rollups STORE_ID   # one store
+"""
+
+import asyncio
+import sys
+
+from app.core.database import connect_to_mongo, close_mongo_connection, get_database
+from app.services.analytics import rebuild_order_rollups
+
+
+async def run(store_ids: list) -> None:
+    await connect_to_mongo()
+    db = get_database()
+
+    if not store_ids:
+        store_ids = [str(store["_id"]) async for store in db.stores.find({}, {"_id": 1})]
+
+    for store_id in store_ids:
+        days = await rebuild_order_rollups(db, store_id)
+        print(f"{store_id}: {days} daily rollups")
+
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(sys.argv[1:]))
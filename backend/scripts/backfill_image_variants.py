@@ -0,0 +1,33 @@
+"""
+Backfill precomputed responsive image variants on products.
+
+Run once after deploying image variants, or after changing IMAGE_VARIANTS.
+
+Usage (from backend/):
+    python -m scripts.backfill_image_variants            # all stores
+    python -m scripts.backfill_image_variants STORE_ID   # one store
+"""
+
+import asyncio
+import sys
+
+from app.core.database import connect_to_mongo, close_mongo_connection, get_database
+from app.services.image_variants import backfill_image_variants
+
+
+async def run(store_ids: list) -> None:
+    await connect_to_mongo()
+    db = get_database()
+
+    if not store_ids:
+        store_ids = [str(store["_id"]) async for store in db.stores.find({}, {"_id": 1})]
+
+    for store_id in store_ids:
+        updated = await backfill_image_variants(db, store_id)
+        print(f"{store_id}: {updated} products updated")
+
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(sys.argv[1:]))
@@ -0,0 +1,113 @@
+"""
+Benchmark image pre-processing on phone-sized photos.
+
+Runs process_image_bytes (downscale, strip EXIF, re-encode) over either the
+images in --dir or N generated 12 MP JPEGs with EXIF, and reports bytes
+before/after, bytes saved and time per image. Needs Pillow; no Cloudinary
+or database access.
+
+Usage (from backend/):
+    python -m scripts.benchmark_image_preprocess --images 10
+    python -m scripts.benchmark_image_preprocess --dir ~/Pictures --format jpeg
+"""
+
+import argparse
+import io
+import os
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from app.services.image_processing import process_image_bytes
+
+
+def generate_photo(width: int, height: int) -> bytes:
+    """A photo-like JPEG: gradients, shapes and sensor noise, plus EXIF."""
+    base = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge("RGB", (
+        base,
+        base.rotate(90).resize((width, height)),
+        Image.new("L", (width, height), random.randint(40, 200)),
+    ))
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = random.randint(0, width), random.randint(0, height)
+        r = random.randint(50, width // 4)
+        color = tuple(random.randint(0, 255) for _ in range(3))
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+    image = image.filter(ImageFilter.GaussianBlur(3))
+    # Texture at several scales so it survives downscaling, like real detail
+    for divisor, weight in ((1, 0.10), (4, 0.15), (16, 0.15)):
+        noise = Image.effect_noise((width // divisor, height // divisor), 64)
+        image = Image.blend(image, noise.resize((width, height)).convert("RGB"), weight)
+
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotated 90 CW, as phones save portrait shots
+    exif[0x010F] = "Benchmark Phone"
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=95, exif=exif)
+    return output.getvalue()
+
+
+def load_images(directory: str) -> List[Tuple[str, bytes]]:
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith((".jpg", ".jpeg", ".png", ".webp", ".heic")):
+            with open(os.path.join(directory, name), "rb") as handle:
+                images.append((name, handle.read()))
+    return images
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", help="Directory of real photos to use instead")
+    parser.add_argument("--images", type=int, default=10)
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--max-dimension", type=int, default=2048)
+    parser.add_argument("--quality", type=int, default=82)
+    parser.add_argument("--format", choices=["webp", "jpeg"], default="webp")
+    args = parser.parse_args()
+
+    if args.dir:
+        images = load_images(os.path.expanduser(args.dir))
+    else:
+        random.seed(42)
+        images = [
+            (f"generated-{i}.jpg", generate_photo(args.width, args.height))
+            for i in range(args.images)
+        ]
+
+    bytes_in = bytes_out = 0
+    samples = []
+    for name, data in images:
+        started = time.perf_counter()
+        processed, info = process_image_bytes(
+            data, args.max_dimension, args.quality, args.format
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        samples.append(elapsed)
+        bytes_in += len(data)
+        bytes_out += len(processed)
+        print(
+            f"{name:<24} {len(data) / 1e6:7.2f} MB -> {len(processed) / 1e6:6.2f} MB   "
+            f"{info['width']}x{info['height']} {info['format']:<5} {elapsed:7.1f} ms"
+        )
+
+    if not samples:
+        print("No images found")
+        return
+
+    saved = bytes_in - bytes_out
+    print(
+        f"\n{len(samples)} images   in {bytes_in / 1e6:.1f} MB   out {bytes_out / 1e6:.1f} MB   "
+        f"saved {saved / 1e6:.1f} MB ({saved * 100 / bytes_in:.0f}%)\n"
+        f"per image   median {statistics.median(samples):.1f} ms   max {max(samples):.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark sheet row parsing on a large sheet.
+
+Generates a sheet of N rows (about 2% of them invalid), then times:
+  - legacy:   the pre-parser fixed-column validate_product_row, row by row
+  - columnar: build_column_map + parse_product_rows over the whole sheet
+
+No database or Google access is needed.
+
+Usage (from backend/):
+    python -m scripts.benchmark_sheet_parser --rows 50000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.services.product_rows import build_column_map, parse_product_rows
+
+
+HEADER = [
+    "Name", "Price", "Category", "Description", "Sizes",
+    "Colors", "Tags", "Brand", "Stock", "Thumbnail URL",
+]
+
+
+def legacy_validate_product_row(
+    row: List[str], row_index: int
+) -> Tuple[bool, Optional[str], Optional[Dict]]:
+    """The pre-parser implementation: fixed column order, one row at a time."""
+    if not row or all(cell.strip() == "" for cell in row):
+        return False, "Empty row", None
+    if len(row) < 2:
+        return False, "Row must have at least Name and Price columns", None
+    name = row[0].strip() if len(row) > 0 else ""
+    price_str = row[1].strip() if len(row) > 1 else ""
+    if not name:
+        return False, "Name is required", None
+    if not price_str:
+        return False, "Price is required", None
+    try:
+        price = float(price_str)
+        if price < 0:
+            return False, "Price must be non-negative", None
+    except ValueError:
+        return False, f"Invalid price format: {price_str}", None
+    category = row[2].strip() if len(row) > 2 and row[2].strip() else None
+    description = row[3].strip() if len(row) > 3 and row[3].strip() else None
+    sizes = [s.strip() for s in row[4].split(",")] if len(row) > 4 and row[4].strip() else []
+    colors = [c.strip() for c in row[5].split(",")] if len(row) > 5 and row[5].strip() else []
+    tags = [t.strip() for t in row[6].split(",")] if len(row) > 6 and row[6].strip() else []
+    brand = row[7].strip() if len(row) > 7 and row[7].strip() else None
+    stock = -1
+    if len(row) > 8 and row[8].strip():
+        try:
+            stock = int(row[8].strip())
+        except ValueError:
+            stock = -1
+    thumbnail_url = row[9].strip() if len(row) > 9 and row[9].strip() else None
+    return True, None, {
+        "name": name,
+        "price": price,
+        "category": category,
+        "description": description,
+        "sizes": sizes,
+        "colors": colors,
+        "tags": tags,
+        "brand": brand,
+        "stock": stock,
+        "thumbnail_url": thumbnail_url,
+        "image_urls": [thumbnail_url] if thumbnail_url else [],
+        "sheet_row_index": row_index,
+        "availability": "show",
+        "last_updated_source": "sheet",
+    }
+
+
+def generate_rows(count: int) -> List[List[str]]:
+    rows = []
+    for i in range(count):
+        price = f"{random.uniform(10, 5000):.2f}"
+        if random.random() < 0.02:
+            price = random.choice(["", "abc", "-5"])
+        row = [
+            f"Product {i}",
+            price,
+            random.choice(["Shirts", "Pants", "Shoes", ""]),
+            "A fine product " * random.randint(0, 3),
+            random.choice(["S, M, L", "", "XL"]),
+            random.choice(["Red, Blue", "", "Black"]),
+            random.choice(["new, sale", ""]),
+            random.choice(["Acme", ""]),
+            random.choice(["", "10", "0", "n/a"]),
+            random.choice(["", f"https://example.com/{i}.jpg"]),
+        ]
+        # Sheets API drops trailing empty cells
+        while row and not row[-1]:
+            row.pop()
+        rows.append(row)
+    return rows
+
+
+def legacy_parse(rows: List[List[str]]) -> int:
+    products = []
+    errors = []
+    for idx, row in enumerate(rows, start=2):
+        is_valid, error_msg, product_data = legacy_validate_product_row(row, idx)
+        if is_valid and product_data:
+            products.append(product_data)
+        elif error_msg and error_msg != "Empty row":
+            errors.append(f"Row {idx}: {error_msg}")
+    return len(products)
+
+
+def columnar_parse(rows: List[List[str]]) -> int:
+    column_map = build_column_map(HEADER)
+    products, _ = parse_product_rows(rows, range(2, len(rows) + 2), column_map)
+    return len(products)
+
+
+def timed(label: str, fn, rows: List[List[str]], runs: int) -> int:
+    samples = []
+    result = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn(rows)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{label:<10} median {statistics.median(samples):8.1f} ms   "
+        f"min {min(samples):8.1f} ms   products {result}"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(42)
+    rows = generate_rows(args.rows)
+
+    legacy = timed("legacy", legacy_parse, rows, args.runs)
+    columnar = timed("columnar", columnar_parse, rows, args.runs)
+    assert legacy == columnar, "parsers disagree on valid rows"
+
+
+if __name__ == "__main__":
+    main()
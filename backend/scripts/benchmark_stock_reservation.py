@@ -0,0 +1,110 @@
+"""
+Concurrency benchmark for checkout stock reservation.
+
+Fires many parallel reservations at a single low-stock product and asserts
+that exactly `stock` of them succeed and stock never goes negative.
+
+Usage (from backend/, against a disposable MongoDB):
+    python -m scripts.benchmark_stock_reservation --orders 5000 --stock 25
+    python -m scripts.benchmark_stock_reservation --transactions  # replica set
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.core import database
+from app.services.inventory import InsufficientStockError, reserve_stock
+
+
+async def run(orders: int, stock: int, quantity: int, use_transaction: bool) -> None:
+    client = AsyncIOMotorClient(settings.MONGODB_URI, maxPoolSize=200)
+    database.client = client
+    db = client[f"{settings.MONGODB_DB_NAME}_bench"]
+
+    product_id = ObjectId()
+    await db.products.insert_one({
+        "_id": product_id,
+        "store_id": ObjectId(),
+        "name": "Flash sale item",
+        "price": 99.0,
+        "stock": stock,
+        "availability": "show",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    })
+
+    # A second, unlimited product on every cart exercises the multi-line path
+    unlimited_id = ObjectId()
+    await db.products.insert_one({
+        "_id": unlimited_id,
+        "name": "Unlimited add-on",
+        "price": 1.0,
+        "stock": -1,
+    })
+
+    order_items = [
+        {"product_id": product_id, "name": "Flash sale item", "quantity": quantity},
+        {"product_id": unlimited_id, "name": "Unlimited add-on", "quantity": 1},
+    ]
+
+    conflicts = 0
+
+    async def checkout() -> bool:
+        nonlocal conflicts
+        try:
+            await reserve_stock(db, order_items, use_transaction=use_transaction)
+            return True
+        except InsufficientStockError:
+            return False
+        except PyMongoError as e:
+            # Write conflicts count as a rejected checkout; anything else is a bug
+            if not e.has_error_label("TransientTransactionError"):
+                raise
+            conflicts += 1
+            return False
+
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(*[checkout() for _ in range(orders)])
+        elapsed = time.perf_counter() - started
+
+        product = await db.products.find_one({"_id": product_id})
+        unlimited = await db.products.find_one({"_id": unlimited_id})
+    finally:
+        await db.products.delete_many({"_id": {"$in": [product_id, unlimited_id]}})
+        client.close()
+
+    succeeded = sum(results)
+
+    print(f"orders fired:     {orders}")
+    print(f"initial stock:    {stock} (qty {quantity} per order)")
+    print(f"succeeded:        {succeeded}")
+    print(f"conflicts:        {conflicts} (transient transaction errors)")
+    print(f"final stock:      {product['stock']}")
+    print(f"elapsed:          {elapsed:.2f}s ({orders / elapsed:.0f} reservations/s)")
+
+    assert product["stock"] >= 0, "stock went negative"
+    assert succeeded * quantity + product["stock"] == stock, "oversold or lost stock"
+    assert unlimited["stock"] == -1, "unlimited stock was modified"
+    print("OK: zero oversell")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--stock", type=int, default=25)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--transactions", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.orders, args.stock, args.quantity, args.transactions))
+
+
+if __name__ == "__main__":
+    main()
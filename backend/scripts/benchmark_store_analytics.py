@@ -0,0 +1,124 @@
+"""
+Benchmark dashboard analytics latency on a large store.
+
+Seeds a store with N orders spread over the last 120 days, then times:
+  - legacy:   count_documents + aggregate per timeframe, run sequentially
+  - pipeline: one conditional-bucket aggregation (ANALYTICS_SOURCE=orders)
+  - rollups:  daily rollup documents (ANALYTICS_SOURCE=rollups)
+
+Usage (from backend/, against a disposable MongoDB):
+    python -m scripts.benchmark_store_analytics --orders 100000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.services.analytics import (
+    TIMEFRAME_DAYS,
+    get_store_analytics,
+    rebuild_order_rollups,
+)
+
+
+TIMEFRAMES = ["1d", "7d", "30d", "90d"]
+
+
+async def legacy_store_analytics(db, store_id: str) -> dict:
+    """The pre-engine implementation: 8 sequential queries plus 2 counts."""
+    analytics = {}
+    for timeframe in TIMEFRAMES:
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=TIMEFRAME_DAYS[timeframe])
+        query = {
+            "store_id": ObjectId(store_id),
+            "created_at": {"$gte": start_date, "$lte": end_date},
+        }
+        orders_count = await db.orders.count_documents(query)
+        result = await db.orders.aggregate([
+            {"$match": query},
+            {"$group": {"_id": None, "total_sales": {"$sum": "$total"}}},
+        ]).to_list(length=1)
+        analytics[timeframe] = {
+            "orders_count": orders_count,
+            "sales_total": result[0]["total_sales"] if result else 0.0,
+        }
+    analytics["total_products"] = await db.products.count_documents({
+        "store_id": ObjectId(store_id), "availability": "show",
+    })
+    analytics["total_orders"] = await db.orders.count_documents({
+        "store_id": ObjectId(store_id),
+    })
+    return analytics
+
+
+async def seed(db, store_id: ObjectId, orders: int) -> None:
+    now = datetime.utcnow()
+    batch = []
+    for i in range(orders):
+        quantity = random.randint(1, 5)
+        batch.append({
+            "store_id": store_id,
+            "order_number": str(10001 + i),
+            "items": [{"quantity": quantity, "line_total": 100.0 * quantity}],
+            "total": 100.0 * quantity,
+            "status": random.choice(["sent_to_whatsapp", "confirmed", "delivered"]),
+            "created_at": now - timedelta(seconds=random.randint(0, 120 * 86400)),
+        })
+        if len(batch) == 5000:
+            await db.orders.insert_many(batch)
+            batch = []
+    if batch:
+        await db.orders.insert_many(batch)
+
+
+async def timed(label: str, fn, runs: int) -> None:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{label:<10} median {statistics.median(samples):8.1f} ms   "
+        f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.1f} ms"
+    )
+
+
+async def run(orders: int, runs: int) -> None:
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[f"{settings.MONGODB_DB_NAME}_bench"]
+    await db.orders.create_index([("store_id", 1), ("created_at", -1)])
+    await db.analytics_snapshots.create_index([("store_id", 1), ("date", -1)])
+
+    store_id = ObjectId()
+    print(f"seeding {orders} orders...")
+    await seed(db, store_id, orders)
+    await rebuild_order_rollups(db, str(store_id))
+
+    sid = str(store_id)
+    await timed("legacy", lambda: legacy_store_analytics(db, sid), runs)
+    await timed("pipeline", lambda: get_store_analytics(db, sid, source="orders"), runs)
+    await timed("rollups", lambda: get_store_analytics(db, sid, source="rollups"), runs)
+
+    await db.orders.delete_many({"store_id": store_id})
+    await db.analytics_snapshots.delete_many({"store_id": store_id})
+    client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.orders, args.runs))
+
+
+if __name__ == "__main__":
+    main()
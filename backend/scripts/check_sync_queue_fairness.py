@@ -0,0 +1,85 @@
+"""
+Check that one slow store cannot hold up other stores' sync jobs.
+
+Starts a long sheet sync for store A, then queues a follow-up sync for A
+and a sync for store B on a queue with two workers. B must run (and finish)
+while A's first sync is still running, instead of waiting behind A's
+follow-up job. Sheet syncs are replaced by timed sleeps; no database or
+Google access is needed.
+
+Usage (from backend/):
+    python -m scripts.check_sync_queue_fairness
+    python -m scripts.check_sync_queue_fairness --slow 3 --fast 0.1
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+from bson import ObjectId
+
+from app.services import sync_jobs
+from app.services.sync_jobs import SyncJobQueue
+
+
+class _Stores:
+    async def update_one(self, *args, **kwargs) -> None:
+        pass
+
+
+class _Database:
+    stores = _Stores()
+
+
+async def run(slow: float, fast: float) -> None:
+    store_a, store_b = str(ObjectId()), str(ObjectId())
+    durations = {store_a: slow, store_b: fast}
+    events: List[str] = []
+    started_at: Dict[str, float] = {}
+
+    async def fake_sync(db, store_id, sheet_id, force=False, progress=None) -> Dict:
+        started_at.setdefault(sheet_id, time.perf_counter())
+        events.append(f"start {sheet_id}")
+        await asyncio.sleep(durations[store_id])
+        events.append(f"end {sheet_id}")
+        return {"success": True, "products_synced": 0, "products_skipped": 0}
+
+    sync_jobs.sync_products_from_sheet = fake_sync
+
+    queue = SyncJobQueue(concurrency=2)
+    queue.start(_Database())
+    began = time.perf_counter()
+
+    first_a, _ = await queue.enqueue(store_a, "A-1")
+    await asyncio.sleep(0.01)  # Let a worker pick up A's first sync
+    second_a, created = await queue.enqueue(store_a, "A-2")
+    job_b, _ = await queue.enqueue(store_b, "B-1")
+    assert created, "follow-up sync for A was coalesced into the running one"
+
+    await job_b.done.wait()
+    b_finished = time.perf_counter() - began
+    a_running = not first_a.done.is_set()
+
+    await asyncio.wait_for(second_a.done.wait(), timeout=slow * 3)
+    await queue.stop()
+
+    print("order:           " + ", ".join(events))
+    print(f"B finished after {b_finished:.2f}s (A's syncs take {slow:.2f}s each)")
+
+    assert a_running, "B waited for A's first sync to finish"
+    assert events.index("end B-1") < events.index("end A-1"), "B was blocked by store A"
+    assert started_at["A-2"] >= began + slow, "A's follow-up overlapped its first sync"
+    print("OK: no head-of-line blocking")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slow", type=float, default=1.0, help="Seconds per sync of store A")
+    parser.add_argument("--fast", type=float, default=0.05, help="Seconds per sync of store B")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.slow, args.fast))
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,16 @@ export const ordersApi = {
     return response.data
   },
 
+  /**
+   * Download URL for a streamed CSV/NDJSON export of orders (merchant only)
+   */
+  exportUrl(
+    storeId: string,
+    params?: { format?: 'csv' | 'ndjson'; status?: string; start_date?: string; end_date?: string }
+  ): string {
+    return apiClient.getUri({ url: `/stores/${storeId}/orders/export`, params })
+  },
+
   /**
    * Track order (public)
    */
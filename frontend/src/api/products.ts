@@ -1,5 +1,11 @@
 import apiClient from './client'
-import { Product, ProductCreate, ProductUpdate, SyncResponse } from '@/types/product'
+import {
+  Product,
+  ProductCreate,
+  ProductUpdate,
+  SyncJobResponse,
+  SyncStatusResponse,
+} from '@/types/product'
 
 export const productsApi = {
   /**
@@ -45,10 +51,40 @@ export const productsApi = {
   },
 
   /**
-   * Sync products from Google Sheet
+   * Queue a background sync of products from Google Sheet
    */
-  async sync(storeId: string): Promise<SyncResponse> {
+  async sync(storeId: string): Promise<SyncJobResponse> {
     const response = await apiClient.post(`/stores/${storeId}/products/sync`)
     return response.data
   },
+
+  /**
+   * Download URL for a streamed CSV/NDJSON export of products
+   */
+  exportUrl(
+    storeId: string,
+    params?: { format?: 'csv' | 'ndjson'; category?: string; availability?: string }
+  ): string {
+    return apiClient.getUri({ url: `/stores/${storeId}/products/export`, params })
+  },
+
+  /**
+   * Queue a background import of products from a CSV/XLSX file
+   */
+  async importFile(storeId: string, file: File): Promise<SyncJobResponse> {
+    const formData = new FormData()
+    formData.append('file', file)
+    const response = await apiClient.post(`/stores/${storeId}/products/import`, formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    })
+    return response.data
+  },
+
+  /**
+   * Get the status and progress of the latest sheet sync
+   */
+  async syncStatus(storeId: string): Promise<SyncStatusResponse> {
+    const response = await apiClient.get(`/stores/${storeId}/products/sync/status`)
+    return response.data
+  },
 }
@@ -15,7 +15,13 @@ export const publicApi = {
    */
   async getProducts(
     slug: string,
-    params?: { category?: string; page?: number; limit?: number }
+    params?: {
+      category?: string
+      page?: number
+      limit?: number
+      include_meta?: boolean
+      cursor?: string
+    }
   ): Promise<PublicProductsResponse> {
     const response = await apiClient.get(`/public/stores/${slug}/products`, { params })
     return response.data
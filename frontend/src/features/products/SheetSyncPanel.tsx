@@ -70,6 +70,13 @@ export default function SheetSyncPanel({ store, onSync, onStoreUpdate }: SheetSy
           </p>
         </div>
 
+        {syncStatus === 'queued' && (
+          <div className="flex items-center gap-2 text-blue-600">
+            <ArrowPathIcon className="h-5 w-5" />
+            <span className="text-sm font-medium">Queued...</span>
+          </div>
+        )}
+
         {syncStatus === 'syncing' && (
           <div className="flex items-center gap-2 text-blue-600">
             <ArrowPathIcon className="h-5 w-5 animate-spin" />
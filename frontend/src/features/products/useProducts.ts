@@ -3,6 +3,8 @@ import { productsApi } from '@/api/products'
 import { Product, ProductCreate, ProductUpdate } from '@/types/product'
 import toast from 'react-hot-toast'
 
+const SYNC_POLL_INTERVAL_MS = 2000
+
 export function useProducts(storeId: string | undefined) {
   const [products, setProducts] = useState<Product[]>([])
   const [isLoading, setIsLoading] = useState(true)
@@ -71,20 +73,49 @@ export function useProducts(storeId: string | undefined) {
     }
   }
 
+  // Syncs and imports run in the background; poll until the job finishes
+  const waitForSyncJob = async (id: string, failureMessage: string) => {
+    let status = await productsApi.syncStatus(id)
+    while (status.sync_status === 'queued' || status.sync_status === 'syncing') {
+      await new Promise((resolve) => setTimeout(resolve, SYNC_POLL_INTERVAL_MS))
+      status = await productsApi.syncStatus(id)
+    }
+
+    if (status.sync_status === 'error') {
+      toast.error(status.sync_error || failureMessage)
+    } else {
+      toast.success(`Synced ${status.job?.products_synced ?? 0} products`)
+    }
+    await fetchProducts()
+    return status
+  }
+
   const syncProducts = async () => {
     if (!storeId) return
 
     try {
-      const result = await productsApi.sync(storeId)
-      toast.success(`Synced ${result.products_synced} products`)
-      await fetchProducts()
-      return result
+      await productsApi.sync(storeId)
+      toast.success('Sync started')
+      return await waitForSyncJob(storeId, 'Failed to sync products')
     } catch (err) {
       toast.error('Failed to sync products')
       throw err
     }
   }
 
+  const importProducts = async (file: File) => {
+    if (!storeId) return
+
+    try {
+      await productsApi.importFile(storeId, file)
+      toast.success('Import started')
+      return await waitForSyncJob(storeId, 'Failed to import products')
+    } catch (err) {
+      toast.error('Failed to import products')
+      throw err
+    }
+  }
+
   return {
     products,
     isLoading,
@@ -93,6 +124,7 @@ export function useProducts(storeId: string | undefined) {
     updateProduct,
     deleteProduct,
     syncProducts,
+    importProducts,
     refetch: fetchProducts,
   }
 }
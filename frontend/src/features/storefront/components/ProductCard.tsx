@@ -28,11 +28,20 @@ export default function ProductCard({ product, storeSlug, brandColor }: ProductC
     >
       <div className="relative aspect-square bg-gray-100 overflow-hidden">
         {product.thumbnail_url || product.image_urls[0] ? (
-          <img
-            src={product.thumbnail_url || product.image_urls[0]}
-            alt={product.name}
-            className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-200"
-          />
+          <picture className="block w-full h-full">
+            {product.image_variants?.card?.avif && (
+              <source srcSet={product.image_variants.card.avif} type="image/avif" />
+            )}
+            {product.image_variants?.card?.webp && (
+              <source srcSet={product.image_variants.card.webp} type="image/webp" />
+            )}
+            <img
+              src={product.thumbnail_url || product.image_urls[0]}
+              alt={product.name}
+              loading="lazy"
+              className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-200"
+            />
+          </picture>
         ) : (
           <div className="w-full h-full flex items-center justify-center text-gray-400">
             <svg
@@ -29,7 +29,7 @@ export default function StorefrontPage() {
           category: selectedCategory || undefined,
         })
         setProducts(data.products)
-        setCategories(data.categories)
+        setCategories(data.categories ?? [])
       } catch (error) {
         console.error('Failed to fetch products:', error)
       } finally {
@@ -1,5 +1,13 @@
+import { SyncStatus } from './store'
+
 export type Availability = 'show' | 'hide'
-export type UpdateSource = 'sheet' | 'dashboard'
+export type UpdateSource = 'sheet' | 'import' | 'dashboard'
+
+// Precomputed responsive URLs for the primary image: variant -> format -> url
+export type ImageVariantName = 'thumbnail' | 'card' | 'full'
+export type ImageVariants = Partial<
+  Record<ImageVariantName, Partial<Record<'webp' | 'avif', string>>>
+>
 
 export interface Product {
   id: string
@@ -16,6 +24,7 @@ export interface Product {
   availability: Availability
   thumbnail_url?: string
   image_urls: string[]
+  image_variants?: ImageVariants
   last_updated_source: UpdateSource
   created_at: string
   updated_at: string
@@ -55,5 +64,34 @@ export interface SyncResponse {
   success: boolean
   products_synced: number
   products_skipped: number
+  products_unchanged: number
   errors: string[]
 }
+
+export interface SyncJobResponse {
+  job_id: string
+  status: string
+  coalesced: boolean
+}
+
+export interface SyncJob {
+  id: string
+  status: 'queued' | 'running' | 'completed' | 'failed'
+  source: 'manual' | 'scheduled' | 'import'
+  processed: number
+  total?: number
+  products_synced?: number
+  products_skipped?: number
+  products_unchanged?: number
+  queued_at?: string
+  started_at?: string
+  finished_at?: string
+  duration_seconds?: number
+}
+
+export interface SyncStatusResponse {
+  sync_status: SyncStatus
+  sync_error?: string
+  last_synced_at?: string
+  job?: SyncJob
+}
@@ -1,4 +1,5 @@
 import { StoreBranding, StoreSections, Theme, Language } from './store'
+import { ImageVariants } from './product'
 
 export interface PublicStore {
   id: string
@@ -31,10 +32,15 @@ export interface PublicProduct {
   stock: number
   thumbnail_url?: string
   image_urls: string[]
+  image_variants?: ImageVariants
 }
 
 export interface PublicProductsResponse {
   products: PublicProduct[]
-  categories: string[]
-  total: number
+  // null when requested with include_meta=false
+  categories: string[] | null
+  category_counts: Record<string, number> | null
+  total: number | null
+  // Pass back as `cursor` to fetch the next page; null on the last page
+  next_cursor: string | null
 }
@@ -2,7 +2,7 @@ export type Language = 'en' | 'hi' | 'pa' | 'hr' | 'gu'
 export type Template = 'multi-purpose' | 'quick-order' | 'wholesale' | 'digital-download' | 'service-booking' | 'links-list' | 'blank'
 export type Theme = 'minimal' | 'bold' | 'dark'
 export type Plan = 'starter' | 'growth' | 'pro'
-export type SyncStatus = 'idle' | 'syncing' | 'error'
+export type SyncStatus = 'idle' | 'queued' | 'syncing' | 'error'
 
 export interface StoreBranding {
   logo_url?: string
@@ -32,6 +32,7 @@ export interface SheetsConfig {
   last_synced_at?: string
   sync_status: SyncStatus
   sync_error?: string
+  next_sync_at?: string
 }
 
 export interface ShippingConfig {